@@ -0,0 +1 @@
+"""Sorting visualizer: headless sort engine plus Tk front ends."""
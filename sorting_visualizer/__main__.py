@@ -0,0 +1,64 @@
+"""Command-line entry point: ``python -m sorting_visualizer [command] [options]``.
+
+Each command's module is imported only when that command runs, so the
+headless ones (everything but ``gui``) never load Tk and start quickly.
+"""
+
+import importlib
+import sys
+
+COMMANDS = {
+    "gui": ("sorting_visualizer.app", "open the visualizer window (default)"),
+    "bench": ("sorting_visualizer.bench", "benchmark algorithms over sizes and distributions"),
+    "instrument": ("sorting_visualizer.instrument", "count and time the operations of single runs"),
+    "auto": ("sorting_visualizer.auto", "pick an algorithm for an input from its presortedness"),
+    "complexity": ("sorting_visualizer.complexity", "fit measured operation counts and times against n, n log n, n²"),
+    "stability": ("sorting_visualizer.stability", "check the stability each algorithm declares"),
+    "race": ("sorting_visualizer.race", "race algorithms on separate cores"),
+    "serve": ("sorting_visualizer.server", "broadcast a sort to browsers over HTTP/WebSocket"),
+    "watch": ("sorting_visualizer.watch", "follow a broadcast sort in the terminal"),
+    "parallel": ("sorting_visualizer.parallel", "time parallel merge and sample sort over shared memory"),
+    "batch": ("sorting_visualizer.batch", "sort many array files with a process pool"),
+    "external": ("sorting_visualizer.external", "sort a file larger than memory"),
+    "export": ("sorting_visualizer.export", "render a sort to an animated PNG, GIF or PNG sequence"),
+    "list": (None, "list the registered algorithms"),
+}
+
+
+def list_algorithms():
+    from sorting_visualizer import engine
+
+    for info in engine.INFO.values():
+        stable = "stable" if info.stable else "unstable"
+        print(f"{info.name:<20} {stable:<9} best {info.best:<15} average {info.average:<15} "
+              f"worst {info.worst:<15} memory {info.memory}")
+
+
+def usage():
+    lines = ["usage: python -m sorting_visualizer [command] [options]", "", "commands:"]
+    lines += [f"  {name:<11} {text}" for name, (_, text) in COMMANDS.items()]
+    lines += ["", "Run a command with --help for its options."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    command = "gui"
+    if argv and not argv[0].startswith("-"):
+        command = argv.pop(0)
+    if command not in COMMANDS:
+        sys.exit(f"unknown command: {command}\n\n{usage()}")
+    module = COMMANDS[command][0]
+    if module is None:
+        list_algorithms()
+    else:
+        # argparse names the program after argv[0]; make --help show the command.
+        sys.argv[0] = f"python -m sorting_visualizer {command}"
+        importlib.import_module(module).main(argv)
+
+
+if __name__ == "__main__":
+    main()
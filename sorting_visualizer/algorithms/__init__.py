@@ -0,0 +1 @@
+"""Built-in algorithm plugins; ``engine`` imports each module on first use."""
@@ -0,0 +1,49 @@
+"""Counting sort for integer keys."""
+
+from sorting_visualizer.engine import DONE, POLL_INTERVAL, WRITE, poll, register
+
+# Counting sort refuses inputs whose value range would need a larger table.
+MAX_COUNTING_RANGE = 1 << 24
+
+
+@register("Counting Sort", stable=True, memory="O(n + k)", best="O(n + k)", average="O(n + k)", worst="O(n + k)",
+          integers=True)
+def counting_sort(a):
+    # Integer keys only; k is the value range.  Elements are placed stably into
+    # a buffer and then written back left to right, skipping the ones that
+    # did not move.
+    n = len(a)
+    if not n:
+        return
+    low = min(a)
+    size = max(a) - low + 1
+    if size > MAX_COUNTING_RANGE:
+        raise ValueError(f"counting sort needs a value range of at most {MAX_COUNTING_RANGE}, got {size}")
+    # The counting passes yield no events, so they poll between slices.
+    counts = [0] * size
+    for start in range(0, n, POLL_INTERVAL):
+        poll()
+        for value in a[start:start + POLL_INTERVAL]:
+            counts[value - low] += 1
+    total = 0
+    for start in range(0, size, POLL_INTERVAL):
+        poll()
+        for key in range(start, min(start + POLL_INTERVAL, size)):
+            count = counts[key]
+            counts[key] = total
+            total += count
+    out = [0] * n
+    sources = [0] * n
+    for start in range(0, n, POLL_INTERVAL):
+        poll()
+        for i, value in enumerate(a[start:start + POLL_INTERVAL], start):
+            key = value - low
+            k = counts[key]
+            out[k] = value
+            sources[k] = i
+            counts[key] = k + 1
+    for k, value in enumerate(out):
+        if sources[k] != k:
+            a[k] = value
+            yield WRITE, k, value
+    yield DONE, 0, n - 1
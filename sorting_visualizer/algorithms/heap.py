@@ -0,0 +1,38 @@
+"""Heap sort."""
+
+from sorting_visualizer.engine import COMPARE, DONE, SWAP, register
+
+
+def heap_sort_range(a, low, high):
+    n = high - low + 1
+
+    def sift_down(root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end:
+                yield COMPARE, low + child, low + child + 1
+                if a[low + child] < a[low + child + 1]:
+                    child += 1
+            yield COMPARE, low + root, low + child
+            if not a[low + root] < a[low + child]:
+                return
+            a[low + root], a[low + child] = a[low + child], a[low + root]
+            yield SWAP, low + root, low + child
+            root = child
+
+    for root in range(n // 2 - 1, -1, -1):
+        yield from sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        a[low], a[low + end] = a[low + end], a[low]
+        yield SWAP, low, low + end
+        yield DONE, low + end, low + end
+        yield from sift_down(0, end)
+    if n > 0:
+        yield DONE, low, low
+
+
+@register("Heap Sort", stable=False, memory="O(1)", best="O(n log n)", average="O(n log n)", worst="O(n log n)")
+def heap_sort(a):
+    yield from heap_sort_range(a, 0, len(a) - 1)
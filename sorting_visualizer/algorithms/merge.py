@@ -0,0 +1,57 @@
+"""Bottom-up merge sort."""
+
+from sorting_visualizer.algorithms.simple import insertion_sort_range
+from sorting_visualizer.engine import COMPARE, DONE, WRITE, copy_range, register
+
+# Runs this short are insertion-sorted before merge sort starts merging.
+MERGE_RUN = 16
+
+
+@register("Merge Sort", stable=True, memory="O(n)", best="O(n)", average="O(n log n)", worst="O(n log n)")
+def merge_sort(a):
+    # Bottom-up merge sort: short runs are insertion-sorted in place, then runs
+    # are merged back and forth between ``a`` and one preallocated buffer.
+    # WRITE events always describe the logical array, so replaying them on
+    # the input tracks the merge even while the data lives in the buffer.
+    n = len(a)
+    for low in range(0, n, MERGE_RUN):
+        yield from insertion_sort_range(a, low, min(low + MERGE_RUN, n) - 1)
+
+    src, dst = a, [0] * n
+    width = MERGE_RUN
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid = min(low + width, n)
+            high = min(low + 2 * width, n)
+            if mid < high:
+                yield COMPARE, mid - 1, mid
+            if mid >= high or src[mid - 1] <= src[mid]:
+                # Already in order: carry the run over without merging.
+                copy_range(dst, src, low, high)
+                continue
+            i, j, k = low, mid, low
+            while i < mid and j < high:
+                yield COMPARE, i, j
+                if src[j] < src[i]:
+                    value = src[j]
+                    j += 1
+                else:
+                    value = src[i]
+                    i += 1
+                dst[k] = value
+                yield WRITE, k, value
+                k += 1
+            while i < mid:
+                value = src[i]
+                dst[k] = value
+                yield WRITE, k, value
+                i += 1
+                k += 1
+            # Whatever is left of the right run is already in place.
+            copy_range(dst, src, j, high)
+        src, dst = dst, src
+        width *= 2
+    if src is not a:
+        copy_range(a, src, 0, n)
+    if n:
+        yield DONE, 0, n - 1
@@ -0,0 +1,241 @@
+"""Parallel merge sort and sample sort, as step events.
+
+These follow the schedule of ``sorting_visualizer.parallel``, which runs the
+same sorts on separate processes over shared memory, for WORKERS workers:
+the events of the workers are interleaved one by one, so the animation shows
+them all making progress at once, and SEGMENT events tell the display which
+worker owns which part of the array in each phase.
+"""
+
+from collections import deque
+
+from sorting_visualizer.algorithms.merge import merge_sort
+from sorting_visualizer.engine import COMPARE, DONE, PIVOT, SEGMENT, WRITE, register
+
+# Workers shown by the animated versions.  The number is fixed rather than
+# taken from the machine so that a run's steps depend on its input only.
+WORKERS = 4
+
+
+def segments(n, workers):
+    """Split ``range(n)`` into ``workers`` contiguous ``(low, high)`` ranges."""
+    return [(n * w // workers, n * (w + 1) // workers) for w in range(workers)]
+
+
+def co_rank(src, a_low, a_high, b_low, b_high, k):
+    """Return how many of the first ``k`` outputs of merging two sorted runs come from the first.
+
+    Ties go to the first run, which keeps the merge stable; cutting a merge at
+    several ranks lets each piece be merged independently (the merge path).
+    """
+    low = max(0, k - (b_high - b_low))
+    high = min(k, a_high - a_low)
+    while low < high:
+        i = (low + high) // 2
+        if src[a_low + i] <= src[b_low + k - i - 1]:
+            low = i + 1
+        else:
+            high = i
+    return low
+
+
+def merge_pieces(src, runs, total, workers):
+    """Cut the pairwise merges of ``runs`` into about ``workers`` pieces of equal size.
+
+    Returns ``(a_low, a_high, b_low, b_high, out)`` per piece, reading sorted
+    runs from ``src``; an unpaired last run is one piece with an empty second run.
+    """
+    pieces = []
+    for t in range(0, len(runs), 2):
+        low, mid = runs[t]
+        if t + 1 == len(runs):
+            pieces.append((low, mid, mid, mid, low))
+            continue
+        high = runs[t + 1][1]
+        count = max(1, round(workers * (high - low) / total))
+        cuts = [(high - low) * q // count for q in range(count + 1)]
+        ranks = [co_rank(src, low, mid, mid, high, k) for k in cuts]
+        for q in range(count):
+            pieces.append((low + ranks[q], low + ranks[q + 1], mid + cuts[q] - ranks[q],
+                           mid + cuts[q + 1] - ranks[q + 1], low + cuts[q]))
+    return pieces
+
+
+class _Segment:
+    """Window onto ``a[low:high]`` that a sequential algorithm can sort in place."""
+
+    __slots__ = ("a", "low", "n")
+
+    def __init__(self, a, low, high):
+        self.a = a
+        self.low = low
+        self.n = high - low
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i.__class__ is slice:
+            start, stop, _ = i.indices(self.n)
+            return self.a[self.low + start:self.low + stop]
+        return self.a[self.low + i]
+
+    def __setitem__(self, i, value):
+        if i.__class__ is slice:
+            start, stop, _ = i.indices(self.n)
+            self.a[self.low + start:self.low + stop] = value
+        else:
+            self.a[self.low + i] = value
+
+
+def _sort_segment(a, low, high):
+    # A segment in final position is not final in the whole array, so its
+    # DONE events are dropped.
+    for op, i, j in merge_sort(_Segment(a, low, high)):
+        if op == WRITE:
+            yield op, low + i, j
+        elif op != DONE:
+            yield op, low + i, low + j
+
+
+def _merge(a, src, base, a_low, a_high, b_low, b_high, out):
+    # ``src`` is a copy of ``a`` from index ``base`` on, taken before the
+    # phase started, so workers can overwrite ``a`` while others still read.
+    i, j = a_low, b_low
+    while i < a_high and j < b_high:
+        yield COMPARE, i, j
+        if src[j - base] < src[i - base]:
+            value = src[j - base]
+            j += 1
+        else:
+            value = src[i - base]
+            i += 1
+        a[out] = value
+        yield WRITE, out, value
+        out += 1
+    for k in (*range(i, a_high), *range(j, b_high)):
+        value = src[k - base]
+        a[out] = value
+        yield WRITE, out, value
+        out += 1
+
+
+def _interleave(streams):
+    """Yield one event from each stream in turn until all are exhausted."""
+    streams = deque(streams)
+    while streams:
+        stream = streams.popleft()
+        for event in stream:
+            yield event
+            streams.append(stream)
+            break
+
+
+def _layout(ranges):
+    for worker, (low, high) in enumerate(ranges):
+        if high > low:
+            yield SEGMENT, low, worker
+
+
+@register("Parallel Merge Sort", stable=True, memory="O(n)", best="O(n log n / p)", average="O(n log n / p)",
+          worst="O(n log n / p)")
+def parallel_merge_sort(a):
+    # Every worker merge-sorts one segment; then pairs of runs are merged in
+    # rounds, each round cut into WORKERS pieces along the merge path.
+    n = len(a)
+    if n < 2:
+        if n:
+            yield DONE, 0, 0
+        return
+    runs = [run for run in segments(n, min(WORKERS, n)) if run[1] > run[0]]
+    yield from _layout(runs)
+    yield from _interleave(_sort_segment(a, low, high) for low, high in runs)
+    while len(runs) > 1:
+        src = a[0:n]
+        pieces = merge_pieces(src, runs, n, WORKERS)
+        yield from _layout((out, out + a_high - a_low + b_high - b_low)
+                           for a_low, a_high, b_low, b_high, out in pieces)
+        # A piece whose output is its own first run, unchanged, needs no work.
+        yield from _interleave(_merge(a, src, 0, *piece)
+                               for piece in pieces if piece[2] < piece[3] or piece[0] != piece[4])
+        runs = [(runs[t][0], runs[min(t + 1, len(runs) - 1)][1]) for t in range(0, len(runs), 2)]
+    yield DONE, 0, n - 1
+
+
+def _cut(a, low, high, splitter, where):
+    # bisect_right over a sorted segment, comparing against the splitter at index ``where``.
+    while low < high:
+        mid = (low + high) // 2
+        yield COMPARE, mid, where
+        if splitter < a[mid]:
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+def _gather(a, src, pieces, out):
+    # Copy this bucket's slice of every segment next to each other, then
+    # merge the sorted slices pairwise until one run is left.
+    runs = []
+    for low, high in pieces:
+        if high > low:
+            runs.append((out, out + high - low))
+        for k in range(low, high):
+            a[out] = src[k]
+            yield WRITE, out, src[k]
+            out += 1
+    while len(runs) > 1:
+        base = runs[0][0]
+        local = a[base:runs[-1][1]]
+        merged = []
+        for t in range(0, len(runs) - 1, 2):
+            (a_low, a_high), (b_low, b_high) = runs[t], runs[t + 1]
+            yield from _merge(a, local, base, a_low, a_high, b_low, b_high, a_low)
+            merged.append((a_low, b_high))
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+
+
+@register("Sample Sort", stable=True, memory="O(n)", best="O(n log n / p)", average="O(n log n / p)",
+          worst="O(n log n)")
+def sample_sort(a):
+    # Sorting by regular sampling: every worker sorts one segment and offers
+    # WORKERS evenly spaced samples; the sorted samples give WORKERS - 1
+    # splitters, and worker b gathers and merges the values between splitters
+    # b - 1 and b from every segment.  Bucket b lands in final position, and
+    # equal values share a bucket and keep their segment order, so it is stable.
+    n = len(a)
+    if n < 2:
+        if n:
+            yield DONE, 0, 0
+        return
+    workers = min(WORKERS, n)
+    ranges = segments(n, workers)
+    yield from _layout(ranges)
+    yield from _interleave(_sort_segment(a, low, high) for low, high in ranges)
+
+    samples = sorted((a[low + (high - low) * t // workers], low + (high - low) * t // workers)
+                     for low, high in ranges for t in range(workers))
+    splitters = [samples[len(samples) * t // workers] for t in range(1, workers)]
+    for value, where in splitters:
+        yield PIVOT, where, n - 1
+    cuts = []
+    for low, high in ranges:
+        row = [low]
+        for value, where in splitters:
+            row.append((yield from _cut(a, row[-1], high, value, where)))
+        row.append(high)
+        cuts.append(row)
+
+    src = a[0:n]
+    sizes = [sum(row[b + 1] - row[b] for row in cuts) for b in range(workers)]
+    starts = [sum(sizes[:b]) for b in range(workers)]
+    buckets = [(start, start + size) for start, size in zip(starts, sizes)]
+    yield from _layout(buckets)
+    yield from _interleave(_gather(a, src, [(row[b], row[b + 1]) for row in cuts], starts[b])
+                           for b in range(workers))
+    for low, high in buckets:
+        if high > low:
+            yield DONE, low, high - 1
@@ -0,0 +1,120 @@
+"""Quick sort (introsort with a three-way partition)."""
+
+import random
+
+from sorting_visualizer.algorithms.heap import heap_sort_range
+from sorting_visualizer.algorithms.simple import insertion_sort_range
+from sorting_visualizer.engine import COMPARE, DONE, PIVOT, SWAP, register
+
+# Quick sort hands ranges this short to insertion sort, and picks the pivot
+# of ranges longer than NINTHER_CUTOFF as a ninther of sampled positions.
+QUICK_INSERTION_CUTOFF = 16
+NINTHER_CUTOFF = 128
+
+
+def _median_of_three(a, i, j, k):
+    yield COMPARE, i, j
+    if a[j] < a[i]:
+        i, j = j, i
+    yield COMPARE, j, k
+    if not a[k] < a[j]:
+        return j
+    yield COMPARE, i, k
+    return k if a[i] < a[k] else i
+
+
+@register("Quick Sort", stable=False, memory="O(log n)", best="O(n)", average="O(n log n)", worst="O(n log n)")
+def quick_sort(a):
+    # Introsort: median-of-three pivots and a three-way partition, so runs of
+    # equal keys are finished in one pass.  Long ranges use a ninther over
+    # positions drawn from a generator seeded with n, which keeps runs
+    # reproducible while periodic inputs (sawtooth) cannot alias the samples.
+    # The smaller side is sorted first and the larger one waits on an explicit
+    # stack, which therefore never holds more than log n ranges.  Short ranges
+    # go to insertion sort and ranges nested deeper than 2 log n to heap sort.
+    n = len(a)
+    limit = 2 * n.bit_length()
+    sample = random.Random(n).sample
+    stack = [(0, n - 1, 0)]
+    while stack:
+        low, high, depth = stack.pop()
+        while True:
+            size = high - low + 1
+            if size <= QUICK_INSERTION_CUTOFF:
+                if size > 0:
+                    yield from insertion_sort_range(a, low, high)
+                    yield DONE, low, high
+                break
+            if depth > limit:
+                yield from heap_sort_range(a, low, high)
+                break
+            depth += 1
+
+            if size > NINTHER_CUTOFF:
+                third = size // 3
+                medians = []
+                for start in (low, low + third, low + 2 * third):
+                    i, j, k = sample(range(start, start + third), 3)
+                    medians.append((yield from _median_of_three(a, i, j, k)))
+                p = yield from _median_of_three(a, *medians)
+            else:
+                p = yield from _median_of_three(a, low, (low + high) // 2, high)
+            pivot = a[p]
+            yield PIVOT, p, high
+
+            # Bentley-McIlroy three-way partition: keys equal to the pivot are
+            # parked at both ends while a Hoare-style scan swaps out-of-place
+            # pairs, then swapped into the middle.  Distinct keys cost about
+            # n/6 swaps per pass, equal keys are never visited again.
+            if p != low:
+                a[low], a[p] = a[p], a[low]
+                yield SWAP, low, p
+            pa = pb = low + 1
+            pc = pd = high
+            while True:
+                while pb <= pc:
+                    x = a[pb]
+                    yield COMPARE, pb, low
+                    if pivot < x:
+                        break
+                    if not x < pivot:
+                        if pa != pb:
+                            a[pa], a[pb] = x, a[pa]
+                            yield SWAP, pa, pb
+                        pa += 1
+                    pb += 1
+                while pc >= pb:
+                    x = a[pc]
+                    yield COMPARE, pc, low
+                    if x < pivot:
+                        break
+                    if not pivot < x:
+                        if pc != pd:
+                            a[pc], a[pd] = a[pd], x
+                            yield SWAP, pc, pd
+                        pd -= 1
+                    pc -= 1
+                if pb > pc:
+                    break
+                a[pb], a[pc] = a[pc], a[pb]
+                yield SWAP, pb, pc
+                pb += 1
+                pc -= 1
+            count = min(pa - low, pb - pa)
+            for k in range(count):
+                a[low + k], a[pb - count + k] = a[pb - count + k], a[low + k]
+                yield SWAP, low + k, pb - count + k
+            count = min(pd - pc, high - pd)
+            for k in range(count):
+                a[pb + k], a[high - count + 1 + k] = a[high - count + 1 + k], a[pb + k]
+                yield SWAP, pb + k, high - count + 1 + k
+            lt = low + (pb - pa)
+            gt = high - (pd - pc)
+            yield DONE, lt, gt
+
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
@@ -0,0 +1,37 @@
+"""LSD radix sort for integer keys."""
+
+from sorting_visualizer.engine import DONE, POLL_INTERVAL, WRITE, copy_range, poll, register
+
+
+@register("Radix Sort", stable=True, memory="O(n)", best="O(w·n)", average="O(w·n)", worst="O(w·n)", integers=True)
+def radix_sort(a):
+    # LSD radix sort on integer keys, one byte per pass (w = key bytes).  Each
+    # pass scatters from one list into the other; as in merge sort the WRITE
+    # events describe the logical array.
+    n = len(a)
+    if not n:
+        return
+    low = min(a)
+    span = max(a) - low
+    src, dst = a, [0] * n
+    shift = 0
+    while span >> shift:
+        counts = [0] * 257
+        # The digit count yields no events, so it polls between slices.
+        for start in range(0, n, POLL_INTERVAL):
+            poll()
+            for value in src[start:start + POLL_INTERVAL]:
+                counts[((value - low) >> shift & 0xFF) + 1] += 1
+        for digit in range(256):
+            counts[digit + 1] += counts[digit]
+        for value in src:
+            digit = (value - low) >> shift & 0xFF
+            k = counts[digit]
+            counts[digit] = k + 1
+            dst[k] = value
+            yield WRITE, k, value
+        src, dst = dst, src
+        shift += 8
+    if src is not a:
+        copy_range(a, src, 0, n)
+    yield DONE, 0, n - 1
@@ -0,0 +1,30 @@
+"""Shell sort with Ciura's gap sequence."""
+
+from sorting_visualizer.engine import COMPARE, DONE, WRITE, register
+
+# Ciura's experimentally tuned shell sort gaps, extended by a factor of 2.25.
+CIURA_GAPS = (1, 4, 10, 23, 57, 132, 301, 701)
+
+
+@register("Shell Sort", stable=False, memory="O(1)", best="O(n log n)", average="~O(n^1.3)", worst="unknown")
+def shell_sort(a):
+    n = len(a)
+    gaps = list(CIURA_GAPS)
+    while gaps[-1] * 2.25 < n:
+        gaps.append(int(gaps[-1] * 2.25))
+    for gap in reversed(gaps):
+        for i in range(gap, n):
+            key = a[i]
+            j = i
+            while j >= gap:
+                yield COMPARE, j - gap, i
+                if a[j - gap] <= key:
+                    break
+                a[j] = a[j - gap]
+                yield WRITE, j, a[j]
+                j -= gap
+            if j != i:
+                a[j] = key
+                yield WRITE, j, key
+    if n:
+        yield DONE, 0, n - 1
@@ -0,0 +1,68 @@
+"""Quadratic comparison sorts: bubble, selection and insertion sort."""
+
+from sorting_visualizer.engine import COMPARE, DONE, SWAP, WRITE, register
+
+
+@register("Bubble Sort", stable=True, memory="O(1)", best="O(n²)", average="O(n²)", worst="O(n²)")
+def bubble_sort(a):
+    n = len(a)
+    for i in range(n - 1):
+        for j in range(n - i - 1):
+            yield COMPARE, j, j + 1
+            if a[j] > a[j + 1]:
+                a[j], a[j + 1] = a[j + 1], a[j]
+                yield SWAP, j, j + 1
+        yield DONE, n - i - 1, n - i - 1
+    if n:
+        yield DONE, 0, 0
+
+
+@register("Selection Sort", stable=False, memory="O(1)", best="O(n²)", average="O(n²)", worst="O(n²)")
+def selection_sort(a):
+    n = len(a)
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            yield COMPARE, j, min_idx
+            if a[j] < a[min_idx]:
+                min_idx = j
+        if min_idx != i:
+            a[i], a[min_idx] = a[min_idx], a[i]
+            yield SWAP, i, min_idx
+        yield DONE, i, i
+
+
+@register("Insertion Sort", stable=True, memory="O(1)", best="O(n)", average="O(n²)", worst="O(n²)")
+def insertion_sort(a):
+    n = len(a)
+    for i in range(1, n):
+        key = a[i]
+        j = i - 1
+        while j >= 0:
+            yield COMPARE, j, i
+            if a[j] <= key:
+                break
+            a[j + 1] = a[j]
+            yield WRITE, j + 1, a[j]
+            j -= 1
+        if j + 1 != i:
+            a[j + 1] = key
+            yield WRITE, j + 1, key
+    if n:
+        yield DONE, 0, n - 1
+
+
+def insertion_sort_range(a, low, high):
+    for i in range(low + 1, high + 1):
+        key = a[i]
+        j = i - 1
+        while j >= low:
+            yield COMPARE, j, i
+            if a[j] <= key:
+                break
+            a[j + 1] = a[j]
+            yield WRITE, j + 1, a[j]
+            j -= 1
+        if j + 1 != i:
+            a[j + 1] = key
+            yield WRITE, j + 1, key
@@ -0,0 +1,191 @@
+"""TimSort: natural runs, binary insertion and galloping merges."""
+
+from sorting_visualizer.engine import COMPARE, COPY_CHUNK, DONE, SWAP, WRITE, register
+
+# TimSort switches a merge into galloping mode after this many straight wins.
+MIN_GALLOP = 7
+
+
+def _min_run(n):
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _gallop(src, key, start, end, right, key_index, offset=0):
+    """Count the items of sorted ``src[start:end]`` that go before ``key``.
+
+    Items equal to ``key`` count when ``right`` is true.  Probes 1, 3, 7, ...
+    items in, then binary-searches the last gap.  COMPARE events pair the
+    probed item, mapped onto the array by ``offset``, with ``key_index``,
+    where ``key`` is shown.
+    """
+    n = end - start
+    low, high = 0, 1
+    while high <= n:
+        x = src[start + high - 1]
+        yield COMPARE, offset + start + high - 1, key_index
+        if not (x <= key if right else x < key):
+            break
+        low = high
+        high = high * 2 + 1
+    high = min(high, n)
+    while low < high:
+        mid = (low + high) // 2
+        x = src[start + mid]
+        yield COMPARE, offset + start + mid, key_index
+        if x <= key if right else x < key:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def _merge_runs(a, tmp, low, mid, high):
+    # Elements of the left run that are <= the first right element, and of the
+    # right run that are >= the last left element, are already in place.
+    low += yield from _gallop(a, a[mid], low, mid, True, mid)
+    if low == mid:
+        return
+    high = mid + (yield from _gallop(a, a[mid - 1], mid, high, False, mid - 1))
+
+    n1 = mid - low
+    if len(tmp) < n1:
+        tmp.extend([0] * (n1 - len(tmp)))
+    for t in range(0, n1, COPY_CHUNK):
+        tmp[t:min(t + COPY_CHUNK, n1)] = a[low + t:low + min(t + COPY_CHUNK, n1)]
+
+    i, j, k = 0, mid, low
+    min_gallop = MIN_GALLOP
+    while i < n1 and j < high:
+        # One element at a time until one side keeps winning.
+        left_wins = right_wins = 0
+        while i < n1 and j < high:
+            yield COMPARE, k, j
+            if a[j] < tmp[i]:
+                a[k] = a[j]
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                a[k] = tmp[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            yield WRITE, k, a[k]
+            k += 1
+            if left_wins >= min_gallop or right_wins >= min_gallop:
+                break
+
+        # Galloping: copy whole stretches found by exponential search.
+        while i < n1 and j < high:
+            # As in the loop above, tmp[i] is shown at k, where it would go next.
+            count = yield from _gallop(tmp, a[j], i, n1, True, j, k - i)
+            for _ in range(count):
+                a[k] = tmp[i]
+                yield WRITE, k, a[k]
+                i += 1
+                k += 1
+            if i >= n1:
+                break
+            count2 = yield from _gallop(a, tmp[i], j, high, False, k)
+            for _ in range(count2):
+                a[k] = a[j]
+                yield WRITE, k, a[k]
+                j += 1
+                k += 1
+            if count < MIN_GALLOP and count2 < MIN_GALLOP:
+                min_gallop += 1
+                break
+            min_gallop = max(1, min_gallop - 1)
+
+    while i < n1:
+        a[k] = tmp[i]
+        yield WRITE, k, a[k]
+        i += 1
+        k += 1
+
+
+@register("Tim Sort", stable=True, memory="O(n)", best="O(n)", average="O(n log n)", worst="O(n log n)")
+def tim_sort(a):
+    # Natural runs (strictly descending ones are reversed in place) are
+    # extended to a minimum length by binary insertion and merged under the
+    # TimSort stack invariants, with galloping merges.
+    n = len(a)
+    min_run = _min_run(n)
+    runs = []
+    tmp = []
+
+    def merge_at(i):
+        base1, len1 = runs[i]
+        base2, len2 = runs[i + 1]
+        runs[i] = (base1, len1 + len2)
+        del runs[i + 1]
+        yield from _merge_runs(a, tmp, base1, base2, base2 + len2)
+
+    low = 0
+    while low < n:
+        high = low + 1
+        if high < n:
+            yield COMPARE, low, high
+            if a[high] < a[low]:
+                while high + 1 < n:
+                    yield COMPARE, high, high + 1
+                    if not a[high + 1] < a[high]:
+                        break
+                    high += 1
+                i, j = low, high
+                while i < j:
+                    a[i], a[j] = a[j], a[i]
+                    yield SWAP, i, j
+                    i += 1
+                    j -= 1
+            else:
+                while high + 1 < n:
+                    yield COMPARE, high, high + 1
+                    if a[high + 1] < a[high]:
+                        break
+                    high += 1
+            high += 1
+
+        # Binary insertion sort up to the minimum run length.
+        end = min(low + min_run, n)
+        for i in range(high, end):
+            key = a[i]
+            left, right = low, i
+            while left < right:
+                m = (left + right) // 2
+                yield COMPARE, m, i
+                if key < a[m]:
+                    right = m
+                else:
+                    left = m + 1
+            for j in range(i, left, -1):
+                a[j] = a[j - 1]
+                yield WRITE, j, a[j]
+            if left != i:
+                a[left] = key
+                yield WRITE, left, key
+        high = max(high, end)
+
+        runs.append((low, high - low))
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i + 1][1]:
+                break
+            yield from merge_at(i)
+        low = high
+
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+            i -= 1
+        yield from merge_at(i)
+    if n:
+        yield DONE, 0, n - 1
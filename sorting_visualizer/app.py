@@ -0,0 +1,533 @@
+"""The Tk sorting visualizer.
+
+One window with every front-end feature: algorithm and speed controls,
+custom or generated input, live operation counters, step descriptions,
+complexity notes, a replay slider over the recorded trace of the last sort
+and the race window.  This is the only module that builds the main window;
+``main.py`` and ``python -m sorting_visualizer`` both start it from here.
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import queue
+import tempfile
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from sorting_visualizer import engine
+from sorting_visualizer.auto import AUTO, choose
+from sorting_visualizer.cache import TraceCache, cache_key
+from sorting_visualizer.external_window import ExternalWindow
+from sorting_visualizer.generators import DISTRIBUTIONS, generate
+from sorting_visualizer.loaders import LoadError, load
+from sorting_visualizer.race_window import RaceWindow
+from sorting_visualizer.render import CanvasRenderer
+from sorting_visualizer.scheduler import Failure, FrameScheduler
+from sorting_visualizer.trace import Trace, TraceCursor, value_typecode
+
+# How often the window checks for a finished complexity measurement, and how
+# long one size of that measurement may take before the ladder stops.
+MEASURE_POLL_MS = 100
+# How often the window checks whether Auto has picked an algorithm.
+AUTO_POLL_MS = 20
+MEASURE_BUDGET = 0.5
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 400
+BACKGROUND = "#f5f5f5"
+
+DESCRIPTIONS = {
+    "Bubble Sort": "Bubble Sort repeatedly compares adjacent elements and swaps them if they are in the wrong order. "
+                   "This process is repeated until the array is sorted. It is simple but inefficient for large datasets.",
+    "Selection Sort": "Selection Sort divides the array into a sorted and unsorted part. It repeatedly finds the minimum "
+                      "element in the unsorted part and places it at the beginning of the sorted part.",
+    "Insertion Sort": "Insertion Sort builds the sorted array one element at a time by taking an element from the unsorted "
+                      "part and placing it in its correct position in the sorted part.",
+    "Quick Sort": "Quick Sort is a divide-and-conquer algorithm. It picks a pivot element, partitions the array around the pivot, "
+                  "and recursively sorts the left and right partitions.",
+    "Merge Sort": "Merge Sort sorts short runs, then repeatedly merges neighbouring sorted runs into runs twice as "
+                  "long, using one extra buffer, until a single run remains.",
+    "Heap Sort": "Heap Sort arranges the array into a max-heap, then repeatedly swaps the largest element to the end "
+                 "and restores the heap on the remaining part.",
+    "Shell Sort": "Shell Sort runs insertion sort on elements a gap apart, shrinking the gap (Ciura's sequence) "
+                  "until the final pass with gap 1 finds the array almost sorted.",
+    "Counting Sort": "Counting Sort counts how often each integer value occurs and writes the values back in order. "
+                     "It never compares elements, but needs memory proportional to the value range.",
+    "Radix Sort": "Radix Sort distributes the integers by one byte at a time, starting with the least significant, "
+                  "keeping the order of equal bytes from the previous pass.",
+    "Tim Sort": "Tim Sort finds runs that are already sorted, extends short ones with insertion sort and merges them, "
+                "switching to galloping when one run keeps winning. It is very fast on partially sorted data.",
+    "Parallel Merge Sort": "Parallel Merge Sort gives each of four workers (one color each) a segment to sort, then merges "
+                           "pairs of runs in rounds, cutting every merge into equal pieces so all workers stay busy.",
+    "Sample Sort": "Sample Sort has four workers (one color each) sort their segments, picks splitters from evenly spaced "
+                   "samples, then lets each worker gather and merge the values between two splitters from every segment.",
+}
+
+
+class SortingVisualizer:
+    def __init__(self, root, algorithm=AUTO, size=30, distribution="uniform"):
+        self.root = root
+        self.root.title("Sorting Visualizer")
+        self.root.geometry("900x950")
+        self.root.config(bg=BACKGROUND)
+
+        self.algorithms = engine.ALGORITHMS
+
+        self.selected_algorithm = tk.StringVar(value=algorithm)
+        self.speed = tk.DoubleVar(value=100)
+        self.bar_color = "#3498db"
+        self.sorted_color = "#2ecc71"
+        self.bar_data = []
+        self.array_size = tk.IntVar(value=size)
+        self.distribution = tk.StringVar(value=distribution)
+        self.trace_path = None
+        self.trace = None
+        self.trace_cursor = None
+        self.trace_cache = TraceCache()
+        # Trace files still being copied into the cache, mapped to whether
+        # the window has let go of them and the copy should delete them.
+        self.storing = {}
+        self.storing_lock = threading.Lock()
+        self.trace_key = None
+        self.run_input = []
+        self.run_algorithm = None
+        self.measured = {}
+        self.measurement = None
+        # The queue Auto's pick for the latest Start arrives on, if one is pending.
+        self.choosing = None
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        # Algorithm selection
+        tk.Label(self.root, text="Sorting Algorithm", bg=BACKGROUND, font=("Arial", 14)).pack(pady=(10, 0))
+        ttk.Combobox(
+            self.root, textvariable=self.selected_algorithm, values=[AUTO] + list(self.algorithms), state="readonly"
+        ).pack(pady=5)
+
+        # Speed control
+        tk.Label(self.root, text="Visualization Speed (steps per second)", bg=BACKGROUND, font=("Arial", 14)).pack(pady=(10, 0))
+        ttk.Scale(self.root, from_=1, to=2000, variable=self.speed, orient="horizontal").pack(pady=5)
+
+        # Array input options
+        input_frame = tk.Frame(self.root, bg=BACKGROUND)
+        input_frame.pack(pady=10)
+        tk.Label(input_frame, text="Input Array (comma-separated)", bg=BACKGROUND, font=("Arial", 12)).pack(side="left")
+        self.input_array_entry = ttk.Entry(input_frame, width=40)
+        self.input_array_entry.pack(side="left", padx=10)
+        tk.Button(input_frame, text="Set Array", command=self.set_array, bg="#3498db", fg="black").pack(side="left")
+        tk.Button(input_frame, text="Load File...", command=self.load_file, bg="#3498db", fg="black").pack(side="left", padx=10)
+
+        # Random array options
+        random_frame = tk.Frame(self.root, bg=BACKGROUND)
+        random_frame.pack(pady=10)
+        tk.Label(random_frame, text="Size", bg=BACKGROUND, font=("Arial", 12)).pack(side="left")
+        ttk.Spinbox(random_frame, from_=2, to=10 ** 7, textvariable=self.array_size, width=10).pack(side="left", padx=10)
+        ttk.Combobox(
+            random_frame, textvariable=self.distribution, values=list(DISTRIBUTIONS), state="readonly", width=16
+        ).pack(side="left", padx=10)
+        tk.Button(random_frame, text="Randomize Array", command=self.generate_array, bg="#ff5733", fg="black").pack(side="left")
+
+        # Canvas for visualizing sorting
+        self.canvas = tk.Canvas(self.root, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="white")
+        self.canvas.pack(pady=(10, 0))
+        self.renderer = CanvasRenderer(self.canvas, CANVAS_WIDTH, CANVAS_HEIGHT, self.bar_color, self.sorted_color)
+        self.scheduler = FrameScheduler(self.root, self.renderer, self.speed.get)
+
+        # Replay of the last finished sort
+        self.replay_slider = ttk.Scale(
+            self.root, from_=0, to=0, orient="horizontal", length=CANVAS_WIDTH, command=self.scrub, state="disabled"
+        )
+        self.replay_slider.pack()
+
+        # Buttons for sorting
+        button_frame = tk.Frame(self.root, bg=BACKGROUND)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Start Sort", command=self.start_sort, bg="#2ecc71", fg="black").pack(side="left", padx=10)
+        self.pause_button = tk.Button(button_frame, text="Pause", command=self.toggle_pause, bg="#3498db", fg="black")
+        self.pause_button.pack(side="left", padx=10)
+        tk.Button(button_frame, text="Finish", command=self.finish_sort, bg="#3498db", fg="black").pack(side="left", padx=10)
+        tk.Button(button_frame, text="Race...", command=self.open_race, bg="#f39c12", fg="black").pack(side="left", padx=10)
+        tk.Button(button_frame, text="External Sort...", command=self.open_external, bg="#8e44ad", fg="black").pack(side="left", padx=10)
+        tk.Button(button_frame, text="Measure", command=self.measure_complexity, bg="#16a085", fg="black").pack(side="left", padx=10)
+        tk.Button(button_frame, text="Reset", command=self.reset, bg="#c0392b", fg="black").pack(side="left", padx=10)
+
+        # Information display
+        self.info_label = tk.Label(self.root, text="", bg=BACKGROUND, font=("Arial", 12), fg="black")
+        self.info_label.pack(pady=5)
+
+        # Live operation counters of the running sort
+        self.counters_label = tk.Label(self.root, text="", bg=BACKGROUND, font=("Arial", 11), fg="black")
+        self.counters_label.pack()
+
+        # Declared or measured complexity of the selected algorithm
+        self.complexity_label = tk.Label(self.root, text="", bg=BACKGROUND, font=("Arial", 11), fg="black")
+        self.complexity_label.pack()
+
+        # Sorting algorithm description
+        self.description_label = tk.Label(
+            self.root, text="", wraplength=CANVAS_WIDTH, bg=BACKGROUND, font=("Arial", 11), fg="black", justify="left")
+        self.description_label.pack(pady=5)
+
+        # Detailed explanation of each step
+        self.step_label = tk.Label(
+            self.root, text="", wraplength=CANVAS_WIDTH, bg=BACKGROUND, font=("Arial", 11), fg="black", justify="left")
+        self.step_label.pack(pady=5)
+
+    def set_array(self):
+        try:
+            array_input = self.input_array_entry.get()
+            self.bar_data = list(map(int, array_input.split(",")))
+            self.display_array()
+            self.info_label.config(text="Custom array set. Choose an algorithm and click 'Start Sort'.")
+        except ValueError:
+            self.info_label.config(text="Invalid input! Please enter integers separated by commas.")
+
+    def load_file(self, path=None):
+        if path is None:
+            from tkinter import filedialog
+
+            path = filedialog.askopenfilename(
+                parent=self.root, title="Load array",
+                filetypes=[("Arrays", "*.csv *.txt *.npy *.i32 *.i64 *.f64"), ("All files", "*")])
+            if not path:
+                return
+        try:
+            loaded = load(path)
+        except (OSError, LoadError) as exc:
+            # Only the first line or two of a long error report fit in the label.
+            self.info_label.config(text="\n".join(str(exc).splitlines()[:2]))
+            return
+        if len(loaded.values) < 2:
+            self.info_label.config(text=f"{os.path.basename(path)} holds fewer than two values.")
+            return
+        self.bar_data = loaded.values.tolist()
+        self.display_array()
+        self.info_label.config(
+            text=f"Loaded {len(self.bar_data)} values from {os.path.basename(path)}. Choose an algorithm and click 'Start Sort'.")
+
+    def generate_array(self):
+        try:
+            size = max(2, self.array_size.get())
+        except tk.TclError:
+            self.info_label.config(text="Invalid size! Please enter a whole number.")
+            return
+        self.bar_data = generate(size, self.distribution.get(), low=10, high=max(100, size))
+        self.display_array()
+        self.info_label.config(text="Random array generated. Choose an algorithm and click 'Start Sort'.")
+
+    def display_array(self, highlight=()):
+        self.scheduler.stop()
+        self.pause_button.config(text="Pause")
+        self.close_trace()
+        self.renderer.reset(self.bar_data)
+        self.renderer.highlight(highlight)
+        self.root.update_idletasks()
+
+    def start_sort(self):
+        if not self.bar_data:
+            self.info_label.config(text="No array to sort! Generate or input an array first.")
+            return
+
+        if self.scheduler.running:
+            # Preempt the running sort and start again from its input.
+            self.scheduler.stop()
+            self.bar_data[:] = self.run_input
+            self.display_array()
+        self.choosing = None
+        selected_algo = self.selected_algorithm.get()
+        if selected_algo == AUTO:
+            self.choose_algorithm()
+            return
+        self.run_sort(selected_algo)
+
+    def choose_algorithm(self):
+        """Let Auto look at the input on a background thread, then sort with its pick."""
+        values = list(self.bar_data)
+        results = queue.Queue()
+
+        def work():
+            try:
+                results.put(choose(values))
+            except Exception as exc:
+                results.put(Failure(exc))
+
+        self.choosing = results
+        threading.Thread(target=work, daemon=True).start()
+        self.info_label.config(text="Auto is looking at the input...")
+        self.root.after(AUTO_POLL_MS, self.algorithm_chosen, values, results)
+
+    def algorithm_chosen(self, values, results):
+        try:
+            choice = results.get_nowait()
+        except queue.Empty:
+            self.root.after(AUTO_POLL_MS, self.algorithm_chosen, values, results)
+            return
+        if self.choosing is not results or self.bar_data != values:
+            # Start was pressed again, or the input changed, in the meantime.
+            return
+        self.choosing = None
+        if isinstance(choice, Failure):
+            self.info_label.config(text=f"Auto could not pick an algorithm: {choice.error}")
+            return
+        self.run_sort(choice.name, f"Auto picked {choice.name}: {choice.reason}. ")
+
+    def run_sort(self, selected_algo, description=""):
+        """Sort the array with ``selected_algo``, replaying a cached trace when there is one."""
+        self.run_algorithm = selected_algo
+        self.info_label.config(text=f"Sorting using {selected_algo}...")
+        self.show_complexity(selected_algo)
+        self.description_label.config(text=description + DESCRIPTIONS.get(selected_algo, ""))
+        self.step_label.config(text="")
+        try:
+            value_typecode(self.bar_data)
+            key = cache_key(selected_algo, self.bar_data, compares=False)
+        except (OverflowError, TypeError, ValueError):
+            # Values a trace cannot hold are sorted without recording or caching.
+            key = None
+        cached = self.trace_cache.get(key) if key is not None else None
+        if cached is not None:
+            self.show_cached(selected_algo, cached)
+            return
+        self.close_trace()
+        self.trace_key = key
+        self.run_input = list(self.bar_data)
+        if key is not None:
+            fd, self.trace_path = tempfile.mkstemp(prefix="sorting-visualizer-", suffix=".svtr")
+            os.close(fd)
+        self.scheduler.start(
+            selected_algo, self.bar_data,
+            on_frame=self.show_progress,
+            on_done=lambda: self.sorting_done(selected_algo),
+            on_error=lambda exc: self.sorting_failed(selected_algo, exc),
+            trace_path=self.trace_path,
+            instrument=True,
+        )
+        self.pause_button.config(text="Pause")
+
+    def toggle_pause(self):
+        if self.scheduler.paused:
+            self.scheduler.resume()
+            self.pause_button.config(text="Pause")
+            self.info_label.config(text=f"Sorting using {self.run_algorithm}...")
+        elif self.scheduler.running:
+            self.scheduler.pause()
+            self.pause_button.config(text="Resume")
+            self.info_label.config(text="Paused. Click 'Resume' to continue or 'Finish' to skip to the result.")
+
+    def finish_sort(self):
+        if self.scheduler.running:
+            self.scheduler.finish()
+            self.pause_button.config(text="Pause")
+            self.info_label.config(text=f"Finishing {self.run_algorithm} without animation...")
+
+    def open_race(self):
+        if not self.bar_data:
+            self.info_label.config(text="No array to race! Generate or input an array first.")
+            return
+        RaceWindow(self.root, self.bar_data, self.bar_color, self.sorted_color)
+
+    def open_external(self):
+        ExternalWindow(self.root, self.bar_color, self.sorted_color)
+
+    def show_complexity(self, name):
+        """Show the measured complexity of ``name`` on the selected distribution, or the declared one."""
+        measured = self.measured.get((name, self.distribution.get()))
+        if measured is not None:
+            self.complexity_label.config(text=measured)
+            return
+        info = engine.INFO[name]
+        self.complexity_label.config(
+            text=f"Time Complexity: {info.average} (best {info.best}, worst {info.worst}), "
+                 f"Space Complexity: {info.memory}")
+
+    def measure_complexity(self):
+        """Fit the complexity of the selected algorithm on the selected distribution in the background."""
+        if self.measurement is not None and self.measurement.is_alive():
+            return
+        from sorting_visualizer.complexity import analyze, measure
+
+        name = self.selected_algorithm.get()
+        if name == AUTO and not self.bar_data:
+            self.complexity_label.config(text="Generate or input an array for Auto to pick an algorithm to measure.")
+            return
+        values = list(self.bar_data) if name == AUTO else None
+        distribution = self.distribution.get()
+        results = queue.Queue()
+
+        def work():
+            try:
+                measured = choose(values).name if values is not None else name
+                samples = measure(measured, distribution, repeats=1, budget=MEASURE_BUDGET)
+                results.put((measured, samples, analyze(samples)))
+            except Exception as exc:
+                results.put(Failure(exc))
+
+        self.measurement = threading.Thread(target=work, daemon=True)
+        self.measurement.start()
+        self.complexity_label.config(text=f"Measuring {name} on {distribution} inputs...")
+        self.root.after(MEASURE_POLL_MS, self.measurement_done, name, distribution, results)
+
+    def measurement_done(self, name, distribution, results):
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.root.after(MEASURE_POLL_MS, self.measurement_done, name, distribution, results)
+            return
+        if isinstance(result, Failure):
+            self.complexity_label.config(text=f"Could not measure {name} on {distribution} inputs: {result.error}")
+            return
+        name, samples, analyses = result
+        fits = {analysis.metric: analysis for analysis in analyses}
+        labels = (("comparisons", "comparisons"), ("estimated_accesses", "estimated accesses"), ("seconds", "time"))
+        parts = [f"{label} {fits[metric].best.model} ({fits[metric].confidence:.0%} confidence)"
+                 for metric, label in labels]
+        self.measured[(name, distribution)] = (
+            f"Measured on {distribution} inputs, n = {samples[0].n:,} to {samples[-1].n:,}: " + ", ".join(parts))
+        if name in (self.selected_algorithm.get(), self.run_algorithm):
+            self.show_complexity(name)
+
+    def sorting_failed(self, name, exc):
+        """Put the input back after ``name`` raised ``exc``, and say why it stopped."""
+        self.bar_data[:] = self.run_input
+        self.display_array()
+        self.counters_label.config(text="")
+        self.info_label.config(text=f"{name} failed: {exc}")
+
+    def sorting_done(self, name):
+        self.show_counters()
+        counters = self.scheduler.counters
+        if self.trace_path is None:
+            self.info_label.config(text=f"{name} completed!")
+            return
+        self.info_label.config(text=f"{name} completed! Drag the slider below the bars to replay it.")
+        self.store_trace(self.trace_key, self.trace_path, {"counters": list(counters) if counters else None})
+        self.open_trace(Trace(self.trace_path))
+
+    def store_trace(self, key, path, meta):
+        """Copy the trace file at ``path`` into the cache on a background thread.
+
+        Large traces take a while to copy, which must not freeze the window.
+        """
+        with self.storing_lock:
+            self.storing[path] = False
+
+        def work():
+            with contextlib.suppress(OSError):
+                self.trace_cache.put(key, path, meta)
+            with self.storing_lock:
+                released = self.storing.pop(path)
+            if released:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def show_cached(self, name, cached):
+        """Jump to the final state of a run replayed from the trace cache."""
+        self.bar_data = cached.trace.state(len(cached.trace)).tolist()
+        self.display_array()
+        self.open_trace(cached.trace)
+        self.counters_label.config(text="")
+        if cached.meta.get("counters"):
+            self.show_counters(cached.meta["counters"])
+        self.info_label.config(text=f"{name} result loaded from the trace cache. Drag the slider below the bars to replay it.")
+
+    def open_trace(self, trace):
+        self.trace = trace
+        self.trace_cursor = TraceCursor(trace)
+        self.trace_cursor.seek(len(trace))
+        self.replay_slider.config(to=len(trace), state="normal")
+        self.replay_slider.set(len(trace))
+
+    def show_progress(self, event):
+        self.show_counters()
+        self.describe_step(event)
+
+    def show_counters(self, counters=None):
+        if counters is None:
+            counters = self.scheduler.counters
+        if counters is not None:
+            self.counters_label.config(
+                text="Reads: ~{:,}   Writes: ~{:,}   Comparisons: {:,}   Swaps: {:,}".format(*counters))
+
+    def describe_step(self, event):
+        op, i, j = event
+        if op == engine.COMPARE:
+            self.step_label.config(text=f"Compared elements at indices {i} and {j}.")
+        elif op == engine.SWAP:
+            self.step_label.config(text=f"Swapped elements at indices {i} and {j}.")
+        elif op == engine.WRITE:
+            self.step_label.config(text=f"Wrote {j} to index {i}.")
+        elif op == engine.PIVOT:
+            self.step_label.config(text=f"Chose the element at index {i} as pivot.")
+
+    def scrub(self, value):
+        if self.trace_cursor is None or self.scheduler.running:
+            return
+        dirty = self.trace_cursor.seek(int(float(value)))
+        replayed = self.trace_cursor.data
+        if dirty is None:
+            dirty = range(len(replayed))
+        for i in dirty:
+            self.bar_data[i] = replayed[i]
+        self.renderer.update(dirty)
+        self.renderer.highlight(dirty if len(dirty) <= 2 else ())
+
+    def close_trace(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+            self.trace_cursor = None
+        if self.trace_path is not None:
+            with self.storing_lock:
+                # A file still being stored is removed by the store instead.
+                storing = self.trace_path in self.storing
+                if storing:
+                    self.storing[self.trace_path] = True
+            if not storing:
+                with contextlib.suppress(OSError):
+                    os.remove(self.trace_path)
+            self.trace_path = None
+        self.replay_slider.config(to=0, state="disabled")
+
+    def reset(self):
+        self.scheduler.stop()
+        self.pause_button.config(text="Pause")
+        self.close_trace()
+        self.bar_data = []
+        self.array_size.set(30)
+        self.distribution.set("uniform")
+        self.renderer.clear()
+        self.info_label.config(text="Array reset. Generate or input a new array to start.")
+        self.counters_label.config(text="")
+        self.complexity_label.config(text="")
+        self.description_label.config(text="")
+        self.step_label.config(text="")
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+
+    parser = argparse.ArgumentParser(description="Open the sorting visualizer window.")
+    parser.add_argument("--algorithm", default="auto", help="algorithm selected at start (default: auto)")
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--input", help="start with the array in this CSV, text, .npy or raw binary file")
+    args = parser.parse_args(argv)
+    algorithm = AUTO if args.algorithm.lower() == "auto" else resolve_algorithms([args.algorithm])[0]
+    # Auto mode logs each decision and the profile behind it.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    root = tk.Tk()
+    visualizer = SortingVisualizer(root, algorithm, args.size, args.distribution)
+    if args.input:
+        visualizer.load_file(args.input)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
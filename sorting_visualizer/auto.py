@@ -0,0 +1,220 @@
+"""Pick an algorithm for an input from a quick look at it.
+
+``profile`` looks over the values in linear passes: it counts the natural runs
+the way tim sort finds them (non-decreasing or strictly decreasing), the
+descents between neighbours, the distinct values and the value range.  The
+one step that is not linear is the inversion count, a merge sort in
+O(m log m): it counts exactly for at most EXACT values; for longer inputs it
+counts exactly inside WINDOWS evenly spaced windows of WINDOW consecutive
+values and scales that local disorder up to n.  ``choose`` then takes the
+first rule that applies:
+
+- at most TINY values: insertion sort;
+- one natural run (sorted or reversed): tim sort, which finds it in one pass;
+- integers spanning at most COUNTING_SPAN times as many values as there are:
+  counting sort;
+- natural runs of LONG_RUN values or more on average (sawtooth, organ pipe, a
+  few swaps apart): tim sort, which merges the runs it finds;
+- an exact count of NEAR_SORTED inversions per value or fewer: insertion sort,
+  whose work is the number of inversions.  An estimate cannot tell a few
+  inversions per value from a few hundred, so longer inputs never get it;
+- a MANY_DUPLICATES share of repeated values: quick sort, whose three-way
+  partition finishes each group of equal values at once;
+- integers narrow enough for radix sort to need at most
+  log2(n) / RADIX_PASS_COST: radix sort;
+- anything else: quick sort, an introsort.
+
+Every decision is logged with the profile it was based on:
+
+    python -m sorting_visualizer auto --distribution k_sorted --size 100000 --compare quick tim
+"""
+
+import argparse
+import logging
+import math
+import sys
+from collections import namedtuple
+from time import perf_counter
+
+from sorting_visualizer import engine
+from sorting_visualizer.algorithms.counting import MAX_COUNTING_RANGE
+from sorting_visualizer.generators import DISTRIBUTIONS
+
+logger = logging.getLogger(__name__)
+
+# The name the window and ``batch`` use for automatic selection.
+AUTO = "Auto"
+
+Profile = namedtuple("Profile", "n runs longest_run descents inversions exact duplicates low high integers")
+Choice = namedtuple("Choice", "name reason profile")
+
+TINY = 32
+EXACT = 4096
+WINDOWS = 64
+WINDOW = 256
+NEAR_SORTED = 8
+LONG_RUN = 32
+COUNTING_SPAN = 4
+RADIX_PASS_COST = 2
+MANY_DUPLICATES = 0.9
+
+
+def count_inversions(values):
+    """Count the pairs of ``values`` that are out of order, by merge sort in O(n log n) time.
+
+    When a value of a right run is merged ahead of the rest of the left run,
+    it is inverted with every one of them.
+    """
+    run = list(values)
+    n = len(run)
+    inversions = 0
+    width = 1
+    while width < n:
+        merged = []
+        append = merged.append
+        for low in range(0, n, 2 * width):
+            left = run[low:low + width]
+            right = run[low + width:low + 2 * width]
+            i = j = 0
+            while i < len(left) and j < len(right):
+                if right[j] < left[i]:
+                    append(right[j])
+                    j += 1
+                    inversions += len(left) - i
+                else:
+                    append(left[i])
+                    i += 1
+            merged += left[i:]
+            merged += right[j:]
+        run = merged
+        width *= 2
+    return inversions
+
+
+def profile(values):
+    """Measure the presortedness of ``values``; return a ``Profile``.
+
+    Every pass is linear except the inversion count, which is O(m log m) for
+    at most EXACT values, or for each of the WINDOWS windows.
+
+    ``inversions`` is exact when ``exact`` is set.  Otherwise it is the
+    inversion rate inside the sampled windows times n, which only sees values
+    fewer than WINDOW places from home, but never below the number of
+    descents, each of which is an inversion.
+    """
+    n = len(values)
+    if not n:
+        return Profile(0, 0, 0, 0, 0, True, 0.0, None, None, True)
+    runs = longest = descents = 0
+    i = 0
+    while i < n:
+        j = i + 1
+        if j < n and values[j] < values[i]:
+            while j < n and values[j] < values[j - 1]:
+                j += 1
+            # A strictly decreasing run of length m has m - 1 descents.
+            descents += j - i - 1
+        else:
+            while j < n and not values[j] < values[j - 1]:
+                j += 1
+        if i and values[i] < values[i - 1]:
+            descents += 1
+        runs += 1
+        longest = max(longest, j - i)
+        i = j
+
+    exact = n <= EXACT
+    if exact:
+        inversions = count_inversions(values)
+    else:
+        step = (n - WINDOW) / (WINDOWS - 1)
+        starts = [round(t * step) for t in range(WINDOWS)]
+        found = sum(count_inversions(values[start:start + WINDOW]) for start in starts)
+        inversions = round(found / (WINDOWS * WINDOW) * n)
+    return Profile(
+        n=n,
+        runs=runs,
+        longest_run=longest,
+        descents=descents,
+        inversions=max(inversions, descents),
+        exact=exact,
+        duplicates=1 - len(set(values)) / n,
+        low=min(values),
+        high=max(values),
+        integers=all(value.__class__ is int for value in values),
+    )
+
+
+def choose(values):
+    """Pick the algorithm for ``values``; return a ``Choice`` and log it."""
+    p = profile(values)
+    n = p.n
+    log_n = math.log2(max(n, 2))
+    span = p.high - p.low + 1 if n and p.integers else None
+    if n <= TINY:
+        name, reason = "Insertion Sort", f"only {n} values"
+    elif p.runs == 1:
+        name, reason = "Tim Sort", "already sorted" if p.descents == 0 else "one descending run"
+    elif span is not None and span <= min(COUNTING_SPAN * n, MAX_COUNTING_RANGE):
+        name, reason = "Counting Sort", f"integers spanning {span:,} values"
+    elif n / p.runs >= LONG_RUN:
+        name, reason = "Tim Sort", f"{p.runs:,} natural runs, the longest {p.longest_run:,} values"
+    elif p.exact and p.inversions <= NEAR_SORTED * n:
+        name, reason = "Insertion Sort", f"nearly sorted, {p.inversions / n:.1f} inversions per value"
+    elif p.duplicates >= MANY_DUPLICATES:
+        name, reason = "Quick Sort", f"{p.duplicates:.0%} duplicates, for the three-way partition"
+    elif span is not None and (span.bit_length() + 7) // 8 * RADIX_PASS_COST <= log_n:
+        name, reason = "Radix Sort", f"integers of {span.bit_length()} bits"
+    else:
+        name, reason = "Quick Sort", "unordered"
+    logger.info("auto: %s (%s) for n=%d, %d runs (longest %d), %d descents, %s%d inversions, "
+                "%.0f%% duplicates, range %s..%s%s", name, reason, n, p.runs, p.longest_run, p.descents,
+                "" if p.exact else "~", p.inversions, p.duplicates * 100, p.low, p.high,
+                "" if p.integers else ", not all integers")
+    return Choice(name, reason, p)
+
+
+def run(data):
+    """Sort ``data`` in place with the algorithm ``choose`` picks; return the ``Choice``."""
+    choice = choose(data)
+    engine.run(choice.name, data)
+    return choice
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+
+    parser = argparse.ArgumentParser(description="Pick an algorithm for an input from its presortedness.")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="nearly_sorted")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--input", help="analyze the array in this CSV, text, .npy or raw binary file instead")
+    parser.add_argument("--compare", nargs="*", default=(), help="algorithms to time against the chosen one")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+
+    if args.input:
+        from sorting_visualizer.loaders import LoadError, load
+
+        try:
+            values = load(args.input).values.tolist()
+        except (OSError, LoadError) as exc:
+            raise SystemExit(str(exc))
+    else:
+        from sorting_visualizer.generators import generate
+
+        values = generate(args.size, args.distribution, args.seed)
+
+    start = perf_counter()
+    choice = choose(values)
+    print(f"{len(values):,} values: {choice.name} ({choice.reason}), "
+          f"picked in {(perf_counter() - start) * 1000:.1f} ms")
+    for name in [choice.name] + [name for name in resolve_algorithms(args.compare) if name != choice.name]:
+        data = list(values)
+        start = perf_counter()
+        engine.run(name, data)
+        print(f"  {name:<15} {perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Sort many array files non-interactively.
+
+Every input (a file, a directory of array files or a glob) is loaded with
+``loaders.load``, sorted with one of the registered algorithms and, with
+``--output``, written to that directory under the same name and format.
+Files are spread over a process pool in chunks of several files per task, so
+thousands of small files do not cost a round trip each.  At the end the
+batch reports files and values per second and percentiles of the per-file
+latency (load, sort and write), and exits non-zero if any file failed:
+
+    python -m sorting_visualizer batch 'data/*.csv' --algorithm tim --output sorted/
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from sorting_visualizer import auto, engine
+from sorting_visualizer.loaders import RAW_DTYPES, RAW_EXTENSIONS, LoadError, load
+
+# Extensions picked up when a directory is given.
+EXTENSIONS = (".csv", ".txt", ".npy") + tuple(RAW_EXTENSIONS)
+
+# Values per buffered write of a sorted output.
+WRITE_CHUNK = 1 << 16
+
+# Latency percentiles in the report.
+PERCENTILES = (50, 90, 99)
+
+
+def find_inputs(inputs, recursive=False):
+    """Expand files, directories and globs into ``(path, name)`` pairs.
+
+    ``name`` is where the sorted copy goes under the output directory: the
+    path relative to a given directory, or the file name otherwise.
+    """
+    found = []
+    for spec in inputs:
+        if os.path.isdir(spec):
+            for root, dirs, files in os.walk(spec):
+                dirs.sort()
+                for file in sorted(files):
+                    if file.lower().endswith(EXTENSIONS):
+                        path = os.path.join(root, file)
+                        found.append((path, os.path.relpath(path, spec)))
+                if not recursive:
+                    break
+        elif glob.has_magic(spec):
+            found += [(path, os.path.basename(path))
+                      for path in sorted(glob.glob(spec, recursive=True)) if os.path.isfile(path)]
+        else:
+            found.append((spec, os.path.basename(spec)))
+    return found
+
+
+def write_sorted(path, values):
+    """Write ``values`` to ``path`` in the format its extension calls for, in buffered chunks."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        import numpy as np
+
+        np.save(path, np.asarray(values, dtype=np.int64))
+        return
+    dtype = RAW_EXTENSIONS.get(extension)
+    with open(path, "wb", buffering=1 << 20) as f:
+        for start in range(0, len(values), WRITE_CHUNK):
+            chunk = values[start:start + WRITE_CHUNK]
+            if dtype is None:
+                f.write("".join(f"{v}\n" for v in chunk).encode())
+            else:
+                out = array(RAW_DTYPES[dtype][0], chunk)
+                if sys.byteorder != "little":
+                    out.byteswap()
+                out.tofile(f)
+
+
+def sort_file(task):
+    """Load, sort and (optionally) write one file; return its report row."""
+    path, output, name, column, skip_invalid = task
+    row = {"path": path, "output": output, "algorithm": name, "n": 0, "error": None}
+    start = perf_counter()
+    try:
+        loaded = load(path, column=column, skip_invalid=skip_invalid)
+        values = loaded.values.tolist()
+        row["n"] = len(values)
+        row["skipped"] = loaded.skipped
+        row["load_seconds"] = perf_counter() - start
+        begin = perf_counter()
+        if name == auto.AUTO:
+            choice = auto.choose(values)
+            row["algorithm"] = choice.name
+            row["reason"] = choice.reason
+            row["profile"] = choice.profile._asdict()
+        engine.run(row["algorithm"], values)
+        row["sort_seconds"] = perf_counter() - begin
+        if output is not None:
+            begin = perf_counter()
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            write_sorted(output, values)
+            row["write_seconds"] = perf_counter() - begin
+    except (OSError, LoadError) as exc:
+        row["error"] = str(exc)
+    except Exception as exc:
+        # An input that trips a bug in an algorithm must not stop the rest of the batch.
+        row["error"] = f"{path}: {row['algorithm']} failed: {exc!r}"
+    row["seconds"] = perf_counter() - start
+    return row
+
+
+def run_batch(tasks, workers=None, chunksize=None, progress=None):
+    """Sort every task with ``sort_file`` on ``workers`` processes; return the rows in task order."""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    if chunksize is None:
+        # A few chunks per worker balance uneven files without a round trip per file.
+        chunksize = max(1, len(tasks) // (workers * 4))
+    rows = []
+    if workers == 1:
+        results = map(sort_file, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(workers)
+        results = pool.map(sort_file, tasks, chunksize=chunksize)
+    try:
+        for row in results:
+            rows.append(row)
+            if progress is not None:
+                progress(row)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return rows
+
+
+def summarize(rows, seconds, workers):
+    """Throughput and latency figures of a finished batch."""
+    done = [row for row in rows if row["error"] is None]
+    values = sum(row["n"] for row in done)
+    latencies = sorted(row["seconds"] for row in done)
+    summary = {
+        "files": len(done),
+        "failed": len(rows) - len(done),
+        "values": values,
+        "seconds": seconds,
+        "workers": workers,
+        "files_per_second": len(done) / seconds if seconds else 0.0,
+        "values_per_second": values / seconds if seconds else 0.0,
+    }
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        summary.update({f"latency_p{p}": cuts[p - 1] for p in PERCENTILES})
+    elif latencies:
+        summary.update({f"latency_p{p}": latencies[0] for p in PERCENTILES})
+    if latencies:
+        summary["latency_max"] = latencies[-1]
+    return summary
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+
+    parser = argparse.ArgumentParser(description="Sort many array files with a process pool.")
+    parser.add_argument("inputs", nargs="+", help="files, directories or quoted globs of CSV, text, .npy or raw arrays")
+    parser.add_argument("--algorithm", default="tim",
+                        help="algorithm to sort with, or auto to pick one per file (default: tim)")
+    parser.add_argument("--output", help="write the sorted arrays to this directory, in the input format")
+    parser.add_argument("--recursive", action="store_true", help="descend into subdirectories of given directories")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--chunksize", type=int, help="files handed to a worker per task (default: automatic)")
+    parser.add_argument("--column", help="CSV column to sort, by name or index")
+    parser.add_argument("--skip-invalid", action="store_true", help="skip malformed text values instead of failing")
+    parser.add_argument("--report", help="write the summary and one row per file to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+    name = auto.AUTO if args.algorithm.lower() == "auto" else resolve_algorithms([args.algorithm])[0]
+    column = int(args.column) if args.column is not None and args.column.isdigit() else args.column
+
+    tasks = []
+    targets = {}
+    for path, relative in find_inputs(args.inputs, args.recursive):
+        output = None
+        if args.output:
+            output = os.path.join(args.output, relative)
+            if os.path.abspath(output) == os.path.abspath(path):
+                raise SystemExit(f"{path}: the output would overwrite the input; choose another --output")
+            if output in targets:
+                raise SystemExit(f"{path} and {targets[output]} would both be written to {output}")
+            targets[output] = path
+        tasks.append((path, output, name, column, args.skip_invalid))
+    if not tasks:
+        raise SystemExit("no input files found")
+
+    def progress(row):
+        if row["error"] is not None:
+            print(f"FAILED {row['error']}", file=sys.stderr)
+        elif not args.quiet:
+            chosen = f" with {row['algorithm']} ({row['reason']})" if "reason" in row else ""
+            print(f"{row['path']}: {row['n']:,} values{chosen} in {row['seconds'] * 1000:.1f} ms", file=sys.stderr)
+
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(tasks)))
+    start = perf_counter()
+    rows = run_batch(tasks, workers, args.chunksize, progress)
+    summary = summarize(rows, perf_counter() - start, workers)
+    summary["algorithm"] = name
+    if name == auto.AUTO:
+        summary["chosen"] = dict(Counter(row["algorithm"] for row in rows if row["error"] is None))
+
+    print(f"{name}: {summary['files']:,} files ({summary['failed']} failed), {summary['values']:,} values "
+          f"in {summary['seconds']:.2f}s on {workers} workers")
+    if "chosen" in summary:
+        print("  picked " + ", ".join(f"{algorithm} for {count}" for algorithm, count in summary["chosen"].items()))
+    print(f"  {summary['files_per_second']:,.1f} files/s, {summary['values_per_second']:,.0f} values/s")
+    if "latency_max" in summary:
+        print("  latency " + "  ".join(f"p{p} {summary[f'latency_p{p}'] * 1000:.1f} ms" for p in PERCENTILES)
+              + f"  max {summary['latency_max'] * 1000:.1f} ms")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"summary": summary, "files": rows}, f, indent=2)
+            f.write("\n")
+    if summary["failed"]:
+        raise SystemExit(f"{summary['failed']} of {len(rows)} files failed")
+
+
+if __name__ == "__main__":
+    main()
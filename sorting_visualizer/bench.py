@@ -0,0 +1,172 @@
+"""Headless benchmark suite.
+
+Runs every registered algorithm over a size sweep and a set of input
+distributions from ``generators`` and reports wall time (median and IQR over
+repeated runs after a warmup), operation counts from an instrumented run and
+peak memory as JSON or CSV:
+
+    python -m sorting_visualizer.bench --sizes 100 1000 10000 --format csv
+
+``--input`` benchmarks arrays loaded from files (see ``loaders``) instead.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from time import perf_counter
+
+from sorting_visualizer import engine
+from sorting_visualizer.generators import DISTRIBUTIONS, generate
+from sorting_visualizer.instrument import Probe
+
+DEFAULT_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+DEFAULT_DISTRIBUTIONS = ("uniform", "sorted", "reversed", "nearly_sorted", "few_unique")
+
+# Largest input each algorithm is run on; quadratic sorts stop early so the
+# sweep finishes in minutes rather than days.
+SIZE_CAPS = {
+    "Bubble Sort": 3000,
+    "Selection Sort": 3000,
+    "Insertion Sort": 3000,
+}
+
+FIELDS = (
+    "algorithm", "distribution", "n", "repeats", "time_median", "time_iqr", "time_min",
+    "comparisons", "swaps", "estimated_reads", "estimated_writes", "peak_bytes",
+)
+
+
+def resolve_algorithms(names):
+    """Map CLI names (``quick`` or ``"Quick Sort"``) to registry names."""
+    if not names:
+        return list(engine.ALGORITHMS)
+    lookup = {}
+    for name in engine.ALGORITHMS:
+        lookup[name.lower()] = name
+        lookup[name.split()[0].lower()] = name
+    try:
+        return [lookup[name.lower()] for name in names]
+    except KeyError as exc:
+        raise SystemExit(f"unknown algorithm: {exc.args[0]}")
+
+
+def peak_memory(name, data):
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        deque(engine.steps(name, data), maxlen=0)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_one(name, values, repeats=5, warmup=1):
+    """Benchmark algorithm ``name`` on ``values`` and return a result row."""
+    import statistics
+
+    for _ in range(warmup):
+        deque(engine.steps(name, list(values)), maxlen=0)
+    times = []
+    for _ in range(repeats):
+        data = list(values)
+        start = perf_counter()
+        deque(engine.steps(name, data), maxlen=0)
+        times.append(perf_counter() - start)
+    if len(times) > 1:
+        q1, _, q3 = statistics.quantiles(times, n=4)
+    else:
+        q1 = q3 = times[0]
+    counters = Probe(name, values).run()
+    return {
+        "algorithm": name,
+        "n": len(values),
+        "repeats": repeats,
+        "time_median": statistics.median(times),
+        "time_iqr": q3 - q1,
+        "time_min": min(times),
+        "comparisons": counters.comparisons,
+        "swaps": counters.swaps,
+        "estimated_reads": counters.reads,
+        "estimated_writes": counters.writes,
+        "peak_bytes": peak_memory(name, list(values)),
+    }
+
+
+def run_input(algorithms, values, distribution, repeats=5, warmup=1, progress=None):
+    """Benchmark ``algorithms`` on one input, labelling the rows with ``distribution``."""
+    results = []
+    for name in algorithms:
+        if len(values) > SIZE_CAPS.get(name, len(values)):
+            continue
+        row = bench_one(name, values, repeats, warmup)
+        row["distribution"] = distribution
+        results.append(row)
+        if progress is not None:
+            progress(row)
+    return results
+
+
+def run_suite(algorithms, distributions, sizes, repeats=5, warmup=1, seed=0, progress=None):
+    results = []
+    for distribution in distributions:
+        for n in sizes:
+            results += run_input(algorithms, generate(n, distribution, seed), distribution, repeats, warmup, progress)
+    return results
+
+
+def write_results(results, fmt, out):
+    if fmt == "json":
+        json.dump(results, out, indent=2)
+        out.write("\n")
+    else:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms headlessly.")
+    parser.add_argument("--algorithms", nargs="*", help="algorithms to run (default: all)")
+    parser.add_argument("--distributions", nargs="*", choices=list(DISTRIBUTIONS),
+                        default=list(DEFAULT_DISTRIBUTIONS))
+    parser.add_argument("--sizes", nargs="*", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--input", nargs="+", metavar="FILE",
+                        help="benchmark these CSV, text, .npy or raw binary arrays instead of generated ones")
+    args = parser.parse_args(argv)
+
+    def progress(row):
+        print(f"{row['algorithm']:>15} {row['distribution']:>13} n={row['n']:<8} "
+              f"{row['time_median']:.4f}s", file=sys.stderr)
+
+    algorithms = resolve_algorithms(args.algorithms)
+    if args.input:
+        from sorting_visualizer.loaders import LoadError, load
+
+        results = []
+        for path in args.input:
+            try:
+                values = load(path).values.tolist()
+            except (OSError, LoadError) as exc:
+                raise SystemExit(str(exc))
+            results += run_input(algorithms, values, os.path.basename(path), args.repeats, args.warmup, progress)
+    else:
+        results = run_suite(algorithms, args.distributions, args.sizes, args.repeats, args.warmup, args.seed,
+                            progress)
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            write_results(results, args.format, out)
+    else:
+        write_results(results, args.format, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
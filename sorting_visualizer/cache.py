@@ -0,0 +1,190 @@
+"""Content-addressed cache of recorded sort traces.
+
+A trace is stored under a key built from the algorithm name, the algorithm's
+version and a hash of the input array, so sorting the same input with the same
+algorithm again can replay the recorded trace (or jump to its final state)
+instead of recomputing every step.  The version is a digest of the source of
+the engine, the bundled algorithms and the module that registered the
+algorithm, so editing any of them invalidates the entries they produced.
+
+Two tiers are kept: an in-memory LRU bounded by total bytes, and a directory
+of trace files bounded by total size, evicted oldest-used first.  A disk hit
+is memory-mapped, and copied into the memory tier when it fits.  Each entry
+can carry a small JSON ``meta`` dict, such as the counters of the run that
+recorded it.  Traces larger than a tier's limit are not stored in it.  A
+cache may be shared by threads, e.g. one storing a trace in the background
+while another looks one up.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+
+from sorting_visualizer import engine, trace
+
+Entry = namedtuple("Entry", "trace meta")
+
+MEMORY_LIMIT = 64 << 20
+DISK_LIMIT = 1 << 30
+
+# Values hashed per chunk when they do not fit an int64 array.
+KEY_CHUNK = 1 << 16
+
+_versions = {}
+
+
+def default_directory():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sorting-visualizer", "traces")
+
+
+def algorithm_version(name):
+    """Return a digest of the code that produces ``name``'s steps and traces."""
+    if name not in _versions:
+        module = sys.modules[engine.ALGORITHMS[name].__module__]
+        package = os.path.dirname(engine.__file__)
+        algorithms = os.path.join(package, "algorithms")
+        paths = {engine.__file__, trace.__file__, module.__file__}
+        paths.update(os.path.join(algorithms, f) for f in os.listdir(algorithms) if f.endswith(".py"))
+        digest = hashlib.blake2b(digest_size=16)
+        for path in sorted(paths):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        _versions[name] = digest.hexdigest()
+    return _versions[name]
+
+
+def cache_key(name, values, compares=True):
+    """Return the cache key of sorting ``values`` with ``name``.
+
+    Integers that fit in 64 bits are hashed as an int64 array; anything else
+    (big integers, floats) is hashed through its ``repr``, a chunk at a time.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{name}\0{algorithm_version(name)}\0{int(compares)}\0{len(values)}\0".encode())
+    try:
+        digest.update(array("q", values).tobytes())
+    except (OverflowError, TypeError):
+        digest.update(b"repr\0")
+        for start in range(0, len(values), KEY_CHUNK):
+            digest.update(repr(list(values[start:start + KEY_CHUNK])).encode())
+    return digest.hexdigest()
+
+
+class TraceCache:
+    """Two-tier LRU of trace files; ``disk_limit=0`` keeps it in memory only."""
+
+    def __init__(self, directory=None, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT):
+        self.directory = directory or default_directory()
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, extension=".svtr"):
+        return os.path.join(self.directory, key + extension)
+
+    def get(self, key):
+        """Return the ``Entry`` for ``key`` with its trace opened, or None."""
+        entry = self._open(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _open(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                data, meta = self.memory[key]
+                return Entry(trace.Trace.from_bytes(data), meta)
+        if not self.disk_limit:
+            return None
+        try:
+            opened = trace.Trace(self._path(key))
+            # The modification time is the disk tier's recency.
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            return None
+        meta = self._read_meta(key)
+        if len(opened.mm) <= self.memory_limit:
+            self._remember(key, bytes(opened.mm), meta)
+        return Entry(opened, meta)
+
+    def put(self, key, path, meta=None):
+        """Store the finished trace file at ``path`` under ``key``."""
+        meta = meta or {}
+        size = os.path.getsize(path)
+        if size <= self.memory_limit:
+            with open(path, "rb") as f:
+                self._remember(key, f.read(), meta)
+        if size <= self.disk_limit:
+            os.makedirs(self.directory, exist_ok=True)
+            # Copy under a temporary name first so readers never see half a file.
+            partial = self._path(key, f".{os.getpid()}.part")
+            shutil.copyfile(path, partial)
+            with open(self._path(key, ".json"), "w") as f:
+                json.dump(meta, f)
+            os.replace(partial, self._path(key))
+            self._evict_disk()
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                self._remove(os.path.join(self.directory, name))
+
+    def _remember(self, key, data, meta):
+        if len(data) > self.memory_limit:
+            return
+        with self.lock:
+            if key in self.memory:
+                self.memory_bytes -= len(self.memory.pop(key)[0])
+            self.memory[key] = (data, meta)
+            self.memory_bytes += len(data)
+            while self.memory_bytes > self.memory_limit:
+                _, (evicted, _) = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+
+    def _read_meta(self, key):
+        try:
+            with open(self._path(key, ".json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".svtr"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name[:-len(".svtr")]))
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            self._remove(self._path(key))
+            self._remove(self._path(key, ".json"))
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
@@ -0,0 +1,229 @@
+"""Empirical complexity fitting.
+
+``measure`` runs an algorithm over a geometric ladder of input sizes drawn
+from one distribution and records comparisons, swaps, estimated element
+accesses (see ``instrument``) and
+time at each size; ``fit`` fits one such series against the classes n,
+n log n and n² (``y = a·f(n) + b`` by least squares weighted by 1/y², so
+every size counts alike) and against a power law ``c·n^k`` fitted in log-log
+space.  The best fit is the class with the smallest relative error; the power
+law only wins when it is clearly better than every named class.  Confidence
+is how far the runner-up's error is behind the winner's, from 0 (a tie) to 1.
+
+This shows what an input does to an algorithm rather than what its
+textbook class says, e.g. insertion sort turning linear on sorted input:
+
+    python -m sorting_visualizer complexity insertion --distribution sorted
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import deque, namedtuple
+from time import perf_counter
+
+from sorting_visualizer import engine
+from sorting_visualizer.generators import DISTRIBUTIONS, generate
+from sorting_visualizer.instrument import Probe
+
+Sample = namedtuple("Sample", "n comparisons swaps estimated_accesses seconds")
+Fit = namedtuple("Fit", "model coefficient intercept exponent error")
+Analysis = namedtuple("Analysis", "metric best confidence fits")
+
+METRICS = ("comparisons", "swaps", "estimated_accesses", "seconds")
+
+# Classes a series is fitted against: label, exponent of n and f(n).
+MODELS = (
+    ("O(n)", 1, lambda n: n),
+    ("O(n log n)", 1, lambda n: n * math.log2(n)),
+    ("O(n²)", 2, lambda n: n * n),
+)
+
+# The power law is only reported as the best fit when its relative error is
+# below this fraction of the best named class's.
+POWER_MARGIN = 0.5
+
+# Sizes below the insertion sort cutoffs of quick and tim sort say more about
+# the cutoffs than about the algorithm.
+DEFAULT_START = 256
+DEFAULT_STOP = 1 << 17
+MIN_POINTS = 4
+
+
+def ladder(start=DEFAULT_START, stop=DEFAULT_STOP, factor=2.0):
+    """Return the sizes ``start, start·factor, ...`` up to ``stop``."""
+    if start < 2 or factor <= 1:
+        raise ValueError("a size ladder needs start >= 2 and factor > 1")
+    sizes = []
+    n = float(start)
+    while round(n) <= stop:
+        if not sizes or round(n) > sizes[-1]:
+            sizes.append(round(n))
+        n *= factor
+    return sizes
+
+
+def measure(name, distribution="uniform", sizes=None, seed=0, repeats=3, budget=2.0, progress=None):
+    """Measure ``name`` at each size; return a list of ``Sample``.
+
+    The ladder stops early once one instrumented run takes longer than
+    ``budget`` seconds, as the next size would take at least twice as long.
+    Times are the fastest of ``repeats`` runs on a plain list.
+    """
+    samples = []
+    for n in sizes or ladder():
+        values = generate(n, distribution, seed)
+        start = perf_counter()
+        counters = Probe(name, values).run()
+        elapsed = perf_counter() - start
+        times = []
+        for _ in range(repeats):
+            data = list(values)
+            begin = perf_counter()
+            deque(engine.steps(name, data), maxlen=0)
+            times.append(perf_counter() - begin)
+        sample = Sample(n, counters.comparisons, counters.swaps, counters.reads + counters.writes, min(times))
+        samples.append(sample)
+        if progress is not None:
+            progress(sample)
+        if elapsed > budget:
+            break
+    return samples
+
+
+def _relative_error(points, predict):
+    return math.sqrt(sum(((y - predict(n)) / y) ** 2 for n, y in points) / len(points))
+
+
+def _fit_model(points, label, exponent, f):
+    # Weighted normal equations of y = a·f(n) + b with weights 1/y².
+    sw = sf = sff = sy = sfy = 0.0
+    for n, y in points:
+        w = 1.0 / (y * y)
+        x = f(n)
+        sw += w
+        sf += w * x
+        sff += w * x * x
+        sy += w * y
+        sfy += w * x * y
+    det = sw * sff - sf * sf
+    a = (sw * sfy - sf * sy) / det if det else 0.0
+    b = (sff * sy - sf * sfy) / det if det else 0.0
+    if a <= 0:
+        # The intercept absorbed the growth; fit through the origin instead.
+        a, b = sfy / sff, 0.0
+    if a <= 0:
+        return None
+    return Fit(label, a, b, exponent, _relative_error(points, lambda n: a * f(n) + b))
+
+
+def _fit_power(points):
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(y) for _, y in points]
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    k = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+    c = math.exp(my - k * mx)
+    return Fit(f"O(n^{k:.2f})", c, 0.0, k, _relative_error(points, lambda n: c * n ** k))
+
+
+def fit(sizes, values, metric=""):
+    """Fit ``values`` measured at ``sizes``; return an ``Analysis``.
+
+    A series that is zero throughout (no swaps on sorted input) is O(1).
+    Otherwise the zero points are left out, and fewer than MIN_POINTS
+    positive ones, or a series no class fits with a positive coefficient,
+    raise ValueError.
+    """
+    if not any(values):
+        return Analysis(metric, Fit("O(1)", 0.0, 0.0, 0, 0.0), 1.0, [])
+    points = [(n, float(y)) for n, y in zip(sizes, values) if y > 0]
+    if len({n for n, _ in points}) < MIN_POINTS:
+        raise ValueError(f"fitting {metric or 'a series'} needs {MIN_POINTS} sizes with non-zero values")
+    fits = [fitted for fitted in (_fit_model(points, *model) for model in MODELS) if fitted is not None]
+    if not fits:
+        raise ValueError(f"{metric or 'the series'} does not grow with n over these sizes")
+    fits.sort(key=lambda fitted: fitted.error)
+    power = _fit_power(points)
+    if power.error < POWER_MARGIN * fits[0].error:
+        best, runner_up = power, fits[0]
+    else:
+        best, runner_up = fits[0], fits[1] if len(fits) > 1 else power
+    confidence = 1.0 - best.error / runner_up.error if runner_up.error else 0.0
+    return Analysis(metric, best, max(confidence, 0.0), fits + [power])
+
+
+def analyze(samples):
+    """Fit every metric of ``samples``; return one ``Analysis`` per metric."""
+    sizes = [sample.n for sample in samples]
+    return [fit(sizes, [getattr(sample, metric) for sample in samples], metric) for metric in METRICS]
+
+
+def describe(analysis):
+    """One-line summary of an ``Analysis``."""
+    best = analysis.best
+    if best.model == "O(1)":
+        return f"{analysis.metric}: none"
+    intercept = f" {'+' if best.intercept >= 0 else '-'} {abs(best.intercept):.3g}" if best.intercept else ""
+    term = {"O(n)": "n", "O(n log n)": "n log n", "O(n²)": "n²"}.get(best.model, f"n^{best.exponent:.2f}")
+    return (f"{analysis.metric}: {best.model} ≈ {best.coefficient:.3g}·{term}{intercept} "
+            f"(error {best.error:.1%}, confidence {analysis.confidence:.0%})")
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+
+    parser = argparse.ArgumentParser(description="Fit the measured complexity of algorithms on one input distribution.")
+    parser.add_argument("algorithms", nargs="*", help="algorithms to analyze (default: all)")
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--start", type=int, default=DEFAULT_START, help="smallest size of the ladder")
+    parser.add_argument("--stop", type=int, default=DEFAULT_STOP, help="largest size of the ladder")
+    parser.add_argument("--factor", type=float, default=2.0, help="ratio between consecutive sizes")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="stop climbing once one run takes longer than this many seconds")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args(argv)
+    try:
+        sizes = ladder(args.start, args.stop, args.factor)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    def progress(sample):
+        print(f"{name:>15} n={sample.n:<8} {sample.comparisons:>12,} comparisons {sample.seconds:.4f}s",
+              file=sys.stderr)
+
+    results = []
+    for name in resolve_algorithms(args.algorithms):
+        samples = measure(name, args.distribution, sizes, args.seed, args.repeats, args.budget, progress)
+        try:
+            analyses = analyze(samples)
+        except ValueError as exc:
+            print(f"{name}: {exc}; raise --budget or --stop", file=sys.stderr)
+            continue
+        results.append((name, samples, analyses))
+        if args.format == "text":
+            declared = engine.INFO[name]
+            print(f"{name} on {args.distribution} (declared: best {declared.best}, average {declared.average}, "
+                  f"worst {declared.worst})")
+            for analysis in analyses:
+                print(f"  {describe(analysis)}")
+    if args.format == "json":
+        json.dump([{
+            "algorithm": name,
+            "distribution": args.distribution,
+            "samples": [sample._asdict() for sample in samples],
+            "fits": {analysis.metric: {
+                "best": analysis.best._asdict(),
+                "confidence": analysis.confidence,
+                "candidates": [candidate._asdict() for candidate in analysis.fits],
+            } for analysis in analyses},
+        } for name, samples, analyses in results], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
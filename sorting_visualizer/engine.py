@@ -0,0 +1,266 @@
+"""Headless step-event engine.
+
+Every algorithm is a generator that sorts a mutable sequence in place and
+yields one step event per primitive operation.  An event is a plain
+``(op, a, b)`` tuple so that the Tk front end, benchmarks and exporters can
+all consume the same stream without importing anything from Tk:
+
+    COMPARE  a, b   indices that were compared
+    SWAP     a, b   indices that were swapped
+    WRITE    a, b   index ``a`` was overwritten with value ``b``
+    PIVOT    a, b   index ``a`` holds the pivot of the range ending at ``b``
+    DONE     a, b   every index in ``a..b`` (inclusive) is in final position
+    SEGMENT  a, b   indices from ``a`` up to the next SEGMENT's are worked on by
+                    worker ``b`` (parallel sorts); an ``a`` not past the
+                    previous one starts a new layout
+
+Applying the SWAP and WRITE events of a run to a copy of the original input
+reproduces the sorted output exactly.
+
+``run`` also sorts arbitrary records by a ``key`` and in ``reverse``,
+computing every key once and handing the algorithm decorated keys instead of
+the records.  Algorithms registered with ``integers=True`` do arithmetic on
+the values and accept integer keys only.
+"""
+
+import importlib
+import threading
+from collections import deque, namedtuple
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+COMPARE = 0
+SWAP = 1
+WRITE = 2
+PIVOT = 3
+DONE = 4
+SEGMENT = 5
+
+OP_NAMES = ("compare", "swap", "write", "pivot", "done", "segment")
+
+# Bulk copies between lists go through slices of at most this many items, so
+# they never allocate a temporary the size of the array.
+COPY_CHUNK = 4096
+
+# Loops that run long without yielding an event call ``poll`` at least every
+# POLL_INTERVAL items, so the thread running them can still be cancelled.
+POLL_INTERVAL = 1 << 15
+
+AlgorithmInfo = namedtuple("AlgorithmInfo", "name stable memory best average worst integers", defaults=(False,))
+
+# Every known algorithm and the module that registers it.  A module is only
+# imported the first time one of its algorithms is looked up, so listing the
+# names costs nothing and a headless run loads just the sorts it uses.
+PLUGINS = {
+    "Bubble Sort": "sorting_visualizer.algorithms.simple",
+    "Selection Sort": "sorting_visualizer.algorithms.simple",
+    "Insertion Sort": "sorting_visualizer.algorithms.simple",
+    "Quick Sort": "sorting_visualizer.algorithms.quick",
+    "Merge Sort": "sorting_visualizer.algorithms.merge",
+    "Heap Sort": "sorting_visualizer.algorithms.heap",
+    "Shell Sort": "sorting_visualizer.algorithms.shell",
+    "Counting Sort": "sorting_visualizer.algorithms.counting",
+    "Radix Sort": "sorting_visualizer.algorithms.radix",
+    "Tim Sort": "sorting_visualizer.algorithms.tim",
+    "Parallel Merge Sort": "sorting_visualizer.algorithms.parallel",
+    "Sample Sort": "sorting_visualizer.algorithms.parallel",
+}
+
+
+class _Registry(Mapping):
+    """Read-only view of registered entries that imports plugins on demand."""
+
+    def __init__(self, entries):
+        self._entries = entries
+
+    def __getitem__(self, name):
+        if name not in self._entries and name in PLUGINS:
+            importlib.import_module(PLUGINS[name])
+        return self._entries[name]
+
+    def __contains__(self, name):
+        return name in PLUGINS
+
+    def __iter__(self):
+        return iter(PLUGINS)
+
+    def __len__(self):
+        return len(PLUGINS)
+
+
+_functions = {}
+_info = {}
+ALGORITHMS = _Registry(_functions)
+INFO = _Registry(_info)
+
+
+def register(name, stable, memory, best, average, worst, integers=False):
+    """Add a step generator to the registry under ``name`` with its metadata.
+
+    ``integers`` marks an algorithm that only sorts integers.
+    """
+    def decorator(function):
+        PLUGINS.setdefault(name, function.__module__)
+        _functions[name] = function
+        _info[name] = AlgorithmInfo(name, stable, memory, best, average, worst, integers)
+        return function
+    return decorator
+
+
+def add_plugin(module, *names):
+    """Declare that importing ``module`` registers the algorithms ``names``."""
+    for name in names:
+        PLUGINS[name] = module
+
+
+def copy_range(dst, src, low, high):
+    """Copy ``src[low:high]`` into ``dst`` in slices of at most COPY_CHUNK items."""
+    for i in range(low, high, COPY_CHUNK):
+        j = min(i + COPY_CHUNK, high)
+        dst[i:j] = src[i:j]
+
+
+class Cancelled(Exception):
+    """Raised inside an algorithm by ``poll`` once its run was cancelled."""
+
+
+_polling = threading.local()
+
+
+def poll():
+    """Call the hook this thread installed with ``polling``, if any."""
+    hook = getattr(_polling, "hook", None)
+    if hook is not None:
+        hook()
+
+
+@contextmanager
+def polling(hook):
+    """Call ``hook`` whenever an algorithm stepped on this thread polls.
+
+    The hook raises ``Cancelled`` to stop the run between two events.
+    """
+    previous = getattr(_polling, "hook", None)
+    _polling.hook = hook
+    try:
+        yield
+    finally:
+        _polling.hook = previous
+
+
+def steps(name, data):
+    """Return the step generator of algorithm ``name`` sorting ``data``."""
+    return ALGORITHMS[name](data)
+
+
+class _IndexedInt(int):
+    """An integer key that remembers its record's position; compares as the key."""
+
+    def __new__(cls, key, index):
+        self = super().__new__(cls, key)
+        self.index = index
+        return self
+
+
+class _Indexed:
+    """Any key with its record's position; compares as the key."""
+
+    __slots__ = ("key", "index")
+
+    def __init__(self, key, index):
+        self.key = key
+        self.index = index
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+
+def decorate(records, key=None, reverse=False, stable=False, integers=False):
+    """Return ``(decorated, undecorate)`` for sorting ``records`` by ``key``.
+
+    Each key is computed once, and ``undecorate(decorated)`` returns the
+    records in the order of ``decorated`` once it is sorted.  For a
+    ``stable`` algorithm each key carries its record's position but compares
+    as the bare key, so the order the records come back in is the one the
+    algorithm produced, and counting and radix sort see the keys' own value
+    range.  Otherwise ``decorated[i]`` orders like the pair
+    ``(key(records[i]), i)``: integer keys are packed with the position into
+    one int so comparisons stay in C, and the position breaks ties.
+    ``reverse`` sorts by descending key and keeps equal keys in input order.
+    With ``integers`` any key that is not an integer raises ValueError.
+    """
+    n = len(records)
+    originals = list(records)
+    keys = list(originals) if key is None else [key(record) for record in originals]
+    if integers:
+        for k in keys:
+            if not isinstance(k, int):
+                raise ValueError(f"integer keys only, got {type(k).__name__}")
+
+    if stable:
+        # Reversed, a stable ascending sort read back to front keeps equal
+        # keys in input order, as list.sort does.
+        positions = range(n - 1, -1, -1) if reverse else range(n)
+        if integers or all(k.__class__ is int for k in keys):
+            decorated = [_IndexedInt(keys[i], i) for i in positions]
+        else:
+            decorated = [_Indexed(keys[i], i) for i in positions]
+
+        def undecorate(decorated):
+            return [originals[d.index] for d in (reversed(decorated) if reverse else decorated)]
+        return decorated, undecorate
+
+    ranks = range(n - 1, -1, -1) if reverse else range(n)
+    if all(k.__class__ is int for k in keys):
+        shift = max(n - 1, 1).bit_length()
+        mask = (1 << shift) - 1
+        low = min(keys, default=0)
+        decorated = [(k - low) << shift | r for k, r in zip(keys, ranks)]
+
+        def rank(d):
+            return d & mask
+    else:
+        decorated = list(zip(keys, ranks))
+
+        def rank(d):
+            return d[1]
+
+    def undecorate(decorated):
+        if reverse:
+            return [originals[n - 1 - rank(d)] for d in reversed(decorated)]
+        return [originals[rank(d)] for d in decorated]
+    return decorated, undecorate
+
+
+def run(name, data, key=None, reverse=False):
+    """Sort ``data`` in place at full speed, discarding the events.
+
+    With ``key`` or ``reverse`` the elements may be any records, sorted like
+    ``list.sort`` would: by cached keys, stably (see ``decorate``).  An
+    algorithm that only sorts integers raises ValueError for other keys.
+    """
+    if key is None and not reverse:
+        deque(ALGORITHMS[name](data), maxlen=0)
+        return data
+    info = INFO[name]
+    decorated, undecorate = decorate(data, key, reverse, info.stable, info.integers)
+    deque(ALGORITHMS[name](decorated), maxlen=0)
+    data[:] = undecorate(decorated)
+    return data
+
+
+def apply_step(a, op, i, j):
+    """Replay a single event onto ``a``; non-mutating events are ignored."""
+    if op == SWAP:
+        a[i], a[j] = a[j], a[i]
+    elif op == WRITE:
+        a[i] = j
@@ -0,0 +1,241 @@
+"""Headless animation export.
+
+A sort is recorded to a trace file first; worker processes then memory-map
+that trace, each rendering a contiguous range of frames into NumPy image
+buffers (no Tk involved) and compressing them as PNG image data.  The parent
+writes the frames as an animated PNG, a numbered PNG sequence or, when Pillow
+is installed, a GIF:
+
+    python -m sorting_visualizer export quick --size 10000 --output quick.png
+
+Long traces are sampled: frame k shows the array after step k * steps /
+(frames - 1), so the clip length is set by ``--fps`` and ``--duration``
+rather than by the number of steps.  Compare events are not recorded, since
+they never change the picture.
+"""
+
+import argparse
+import contextlib
+import os
+import struct
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from sorting_visualizer import trace
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Palette indices: background, bar, and bars touched since the previous frame.
+PALETTE = ((255, 255, 255), (0x34, 0x98, 0xDB), (0x2E, 0xCC, 0x71))
+BACKGROUND, BAR, HIGHLIGHT = range(3)
+
+# Seconds the last frame stays on screen before an animation loops.
+FINAL_HOLD = 2
+
+# Frame ranges handed to each worker process per task.
+TASKS_PER_WORKER = 4
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise SystemExit("exporting animations needs NumPy: pip install numpy")
+    return numpy
+
+
+def frame_steps(steps, frames):
+    """Return the trace position shown by each of ``frames`` frames."""
+    if frames <= 1 or steps == 0:
+        return [steps]
+    frames = min(frames, steps + 1)
+    return [k * steps // (frames - 1) for k in range(frames)]
+
+
+class FrameRenderer:
+    """Rasterizes array states into palette-indexed images."""
+
+    def __init__(self, n, max_value, width, height):
+        np = _numpy()
+        self.np = np
+        self.n = n
+        self.width = min(width, n) if n else width
+        self.height = height
+        self.max_value = max(max_value, 1)
+        if n > self.width:
+            # Several elements per column: draw the tallest of each bucket.
+            self.starts = np.arange(self.width) * n // self.width
+            self.column_of = None
+        else:
+            self.starts = None
+            self.column_of = np.arange(self.width) * n // self.width
+        self.rows = np.arange(height)[:, None]
+
+    def render(self, values, touched=None, highlight_all=False):
+        """Return a ``height x width`` uint8 image of ``values``."""
+        np = self.np
+        values = np.asarray(values, dtype=np.int64)
+        if self.starts is not None:
+            heights = np.maximum.reduceat(values, self.starts)
+        else:
+            heights = values[self.column_of]
+        tops = self.height - heights * self.height // self.max_value
+        colors = np.full(self.width, BAR, dtype=np.uint8)
+        if highlight_all:
+            colors[:] = HIGHLIGHT
+        elif touched:
+            indices = np.fromiter(touched, dtype=np.int64, count=len(touched))
+            if self.starts is not None:
+                colors[indices * self.width // self.n] = HIGHLIGHT
+            else:
+                colors[np.isin(self.column_of, indices)] = HIGHLIGHT
+        return np.where(self.rows >= tops[None, :], colors[None, :], np.uint8(BACKGROUND))
+
+    def encode(self, image):
+        """Compress ``image`` as PNG image data, using the Up filter on every row."""
+        np = self.np
+        filtered = np.empty((self.height, self.width + 1), dtype=np.uint8)
+        filtered[:, 0] = 2
+        filtered[0, 1:] = image[0]
+        filtered[1:, 1:] = image[1:] - image[:-1]
+        return zlib.compress(filtered.tobytes(), 6)
+
+    def decode(self, data):
+        """Undo ``encode``, returning the image."""
+        np = self.np
+        rows = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(self.height, self.width + 1)
+        return np.cumsum(rows[:, 1:], axis=0, dtype=np.uint8)
+
+
+def _render_frames(path, positions, width, height, max_value, last):
+    """Render the frames at trace ``positions``; run in a worker process."""
+    with trace.Trace(path) as recorded:
+        renderer = FrameRenderer(recorded.n, max_value, width, height)
+        cursor = trace.TraceCursor(recorded)
+        frames = []
+        for position in positions:
+            touched = cursor.seek(position)
+            final = last and position == positions[-1]
+            image = renderer.render(cursor.data, touched, highlight_all=final)
+            frames.append(renderer.encode(image))
+        return frames
+
+
+def render(name, values, frames, width=800, height=400, workers=None):
+    """Sort ``values`` with ``name`` and return ``(renderer, frame data)``."""
+    fd, path = tempfile.mkstemp(prefix="sorting-visualizer-", suffix=".svtr")
+    os.close(fd)
+    try:
+        trace.record(name, list(values), path, compares=False)
+        with trace.Trace(path) as recorded:
+            steps = len(recorded)
+        positions = frame_steps(steps, frames)
+        workers = workers or os.cpu_count() or 1
+        size = max(1, -(-len(positions) // (workers * TASKS_PER_WORKER)))
+        chunks = [positions[i:i + size] for i in range(0, len(positions), size)]
+        max_value = max(values, default=1)
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_render_frames, path, chunk, width, height, max_value, i == len(chunks) - 1)
+                       for i, chunk in enumerate(chunks)]
+            data = [frame for future in futures for frame in future.result()]
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+    return FrameRenderer(len(values), max_value, width, height), data
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _png_header(width, height):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+    palette = bytes(channel for color in PALETTE for channel in color)
+    return PNG_SIGNATURE + _chunk(b"IHDR", ihdr) + _chunk(b"PLTE", palette)
+
+
+def write_apng(path, renderer, frames, fps):
+    """Write ``frames`` as an endlessly looping animated PNG."""
+    with open(path, "wb") as out:
+        out.write(_png_header(renderer.width, renderer.height))
+        out.write(_chunk(b"acTL", struct.pack(">II", len(frames), 0)))
+        sequence = 0
+        for i, data in enumerate(frames):
+            delay = (FINAL_HOLD, 1) if i == len(frames) - 1 else (1, fps)
+            out.write(_chunk(b"fcTL", struct.pack(
+                ">IIIIIHHBB", sequence, renderer.width, renderer.height, 0, 0, delay[0], delay[1], 0, 0)))
+            sequence += 1
+            if i == 0:
+                out.write(_chunk(b"IDAT", data))
+            else:
+                out.write(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+        out.write(_chunk(b"IEND", b""))
+
+
+def write_png_sequence(directory, renderer, frames):
+    """Write each frame to ``directory/frame_00000.png`` onwards."""
+    os.makedirs(directory, exist_ok=True)
+    header = _png_header(renderer.width, renderer.height)
+    digits = max(5, len(str(len(frames) - 1)))
+    for i, data in enumerate(frames):
+        with open(os.path.join(directory, f"frame_{i:0{digits}d}.png"), "wb") as out:
+            out.write(header + _chunk(b"IDAT", data) + _chunk(b"IEND", b""))
+
+
+def write_gif(path, renderer, frames, fps):
+    """Write ``frames`` as a looping GIF; needs Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise SystemExit("GIF export needs Pillow (pip install pillow); APNG and PNG sequences do not")
+    palette = [channel for color in PALETTE for channel in color]
+    images = []
+    for data in frames:
+        image = Image.fromarray(renderer.decode(data), "P")
+        image.putpalette(palette)
+        images.append(image)
+    durations = [round(1000 / fps)] * (len(images) - 1) + [FINAL_HOLD * 1000]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=durations, loop=0, optimize=False)
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+    from sorting_visualizer.generators import DISTRIBUTIONS, generate
+
+    parser = argparse.ArgumentParser(description="Export a sort as an animation without opening a window.")
+    parser.add_argument("algorithm")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--distribution", choices=sorted(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True,
+                        help="file.png / file.apng (animated PNG), file.gif, or a directory for a PNG sequence")
+    parser.add_argument("--format", choices=("apng", "gif", "png"),
+                        help="default: from the output name; png means a numbered PNG sequence")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--duration", type=float, default=30, help="clip length in seconds")
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=400)
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.output)[1].lower()
+        fmt = {".png": "apng", ".apng": "apng", ".gif": "gif"}.get(extension, "png")
+    name = resolve_algorithms([args.algorithm])[0]
+    values = generate(args.size, args.distribution, seed=args.seed)
+    frames = max(1, round(args.fps * args.duration))
+    renderer, data = render(name, values, frames, args.width, args.height, args.workers)
+    if fmt == "apng":
+        write_apng(args.output, renderer, data, args.fps)
+    elif fmt == "gif":
+        write_gif(args.output, renderer, data, args.fps)
+    else:
+        write_png_sequence(args.output, renderer, data)
+    print(f"wrote {len(data)} frames of {name} on {len(values)} elements to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""External merge sort for inputs larger than memory.
+
+The input file is read in chunks that fit the memory budget; each chunk is
+sorted in memory and written to a temporary run file of little-endian int64
+values.  The runs are then merged ``fan_in`` at a time with ``heapq.merge``
+over block-buffered readers, pass after pass, until one merge writes the
+output.  Only one chunk, or ``fan_in + 1`` blocks, is ever held in memory:
+
+    python -m sorting_visualizer external dump.i64 sorted.i64 --memory 256M --fan-in 32
+
+``external_sort_steps`` yields an ``ExternalEvent`` whenever a run is formed,
+a merge starts or a block of a merge is written, which is what the external
+sort window draws.  The output is raw int64 unless its name ends in ``.txt``
+or ``.csv``, in which case it is written one value per line.
+"""
+
+import argparse
+import heapq
+import os
+import re
+import sys
+import tempfile
+from array import array
+from collections import namedtuple
+from itertools import islice
+from time import perf_counter
+
+from sorting_visualizer.loaders import LoadError, iter_chunks
+
+# ``kind`` is "run" (run ``run`` was formed from the input), "merge" (the
+# ``sources`` runs start merging into ``run``), "block" (``count`` values of
+# ``run`` are written so far) or "done".  ``level`` is 0 for run formation and
+# the merge pass number after that.
+ExternalEvent = namedtuple("ExternalEvent", "kind level run sources count")
+
+DEFAULT_MEMORY = 64 << 20
+DEFAULT_FAN_IN = 16
+
+# Estimated bytes per value while a chunk is sorted as a list of Python ints.
+SORT_BYTES_PER_VALUE = 64
+
+# Bytes per value in run files and merge buffers.
+VALUE_BYTES = 8
+
+# Values per merge buffer at most, so block events keep coming on large budgets.
+MAX_BLOCK = 1 << 17
+
+TEXT_OUTPUTS = (".txt", ".csv")
+
+
+def parse_size(text):
+    """Parse a byte count such as ``4096``, ``512K``, ``64M`` or ``2G``."""
+    match = re.fullmatch(r"\s*(\d+)\s*([KMG]?)i?B?\s*", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"invalid size: {text!r}")
+    return int(match.group(1)) << {"": 0, "K": 10, "M": 20, "G": 30}[match.group(2).upper()]
+
+
+def _read_blocks(path, block):
+    """Yield the values of run file ``path``, reading ``block`` values at a time."""
+    with open(path, "rb") as f:
+        while True:
+            values = array("q")
+            try:
+                values.fromfile(f, block)
+            except EOFError:  # the last block is short; what was read is kept
+                pass
+            if not values:
+                return
+            if sys.byteorder != "little":
+                values.byteswap()
+            yield from values
+
+
+def _write_block(f, values, text):
+    if text:
+        f.write("".join(f"{v}\n" for v in values).encode())
+        return
+    if sys.byteorder != "little":
+        values.byteswap()
+    values.tofile(f)
+
+
+def external_sort_steps(source, output, memory=DEFAULT_MEMORY, fan_in=DEFAULT_FAN_IN, dtype=None, column=None,
+                        tmpdir=None):
+    """Sort the integers in file ``source`` into ``output``, yielding progress events.
+
+    ``source`` is any file ``loaders.load`` reads; ``memory`` is the budget in
+    bytes and ``fan_in`` the number of runs merged at once.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    chunk = max(1, memory // SORT_BYTES_PER_VALUE)
+    block = max(1, min(MAX_BLOCK, memory // ((fan_in + 1) * VALUE_BYTES)))
+    text = os.path.splitext(output)[1].lower() in TEXT_OUTPUTS
+    with tempfile.TemporaryDirectory(prefix="sorting-visualizer-", dir=tmpdir) as scratch:
+        sizes = []
+
+        def run_path(run):
+            return os.path.join(scratch, f"run-{run}.i64")
+
+        runs = []
+        for values in iter_chunks(source, chunk, dtype, column):
+            run = len(sizes)
+            with open(run_path(run), "wb") as f:
+                _write_block(f, array("q", sorted(values)), False)
+            sizes.append(len(values))
+            runs.append(run)
+            yield ExternalEvent("run", 0, run, (), len(values))
+        if not runs:
+            open(output, "wb").close()
+            yield ExternalEvent("done", 0, None, (), 0)
+            return
+
+        level = 0
+        while True:
+            level += 1
+            final = len(runs) <= fan_in
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                sources = tuple(runs[start:start + fan_in])
+                run = len(sizes)
+                sizes.append(sum(sizes[r] for r in sources))
+                merged.append(run)
+                yield ExternalEvent("merge", level, run, sources, sizes[run])
+                values = heapq.merge(*(_read_blocks(run_path(r), block) for r in sources))
+                written = 0
+                with open(output if final else run_path(run), "wb") as f:
+                    while True:
+                        out = array("q", islice(values, block))
+                        if not out:
+                            break
+                        _write_block(f, out, final and text)
+                        written += len(out)
+                        yield ExternalEvent("block", level, run, sources, written)
+                for r in sources:
+                    os.remove(run_path(r))
+            runs = merged
+            if final:
+                break
+        yield ExternalEvent("done", level, runs[0], (), sizes[runs[0]])
+
+
+def external_sort(source, output, memory=DEFAULT_MEMORY, fan_in=DEFAULT_FAN_IN, dtype=None, column=None,
+                  tmpdir=None, progress=None):
+    """Run ``external_sort_steps`` to completion and return a summary dict.
+
+    ``progress`` is called with every event that is not a block write.
+    """
+    start = perf_counter()
+    runs = passes = values = 0
+    for event in external_sort_steps(source, output, memory, fan_in, dtype, column, tmpdir):
+        if event.kind == "block":
+            continue
+        if event.kind == "run":
+            runs += 1
+            values += event.count
+        elif event.kind == "merge":
+            passes = event.level
+        if progress is not None:
+            progress(event)
+    return {"values": values, "runs": runs, "passes": passes, "seconds": perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sort an integer file larger than memory.")
+    parser.add_argument("input", help="CSV, text, .npy or raw binary file (see the loaders)")
+    parser.add_argument("output", help="raw int64 output, or one value per line for .txt/.csv")
+    parser.add_argument("--memory", type=parse_size, default=DEFAULT_MEMORY,
+                        help="memory budget, e.g. 64M (default: 64M)")
+    parser.add_argument("--fan-in", type=int, default=DEFAULT_FAN_IN, help="runs merged at once")
+    parser.add_argument("--dtype", choices=("int32", "int64", "float64"), help="read the input as a raw buffer")
+    parser.add_argument("--column", help="CSV column to sort, by name or index")
+    parser.add_argument("--tmpdir", help="directory for the run files (default: the system temp directory)")
+    args = parser.parse_args(argv)
+
+    column = int(args.column) if args.column is not None and args.column.isdigit() else args.column
+
+    def progress(event):
+        if event.kind == "run":
+            print(f"run {event.run}: {event.count} values", file=sys.stderr)
+        elif event.kind == "merge":
+            print(f"pass {event.level}: merging runs {', '.join(map(str, event.sources))} into run {event.run}",
+                  file=sys.stderr)
+
+    try:
+        summary = external_sort(args.input, args.output, args.memory, args.fan_in, args.dtype, column,
+                                args.tmpdir, progress)
+    except (OSError, LoadError, ValueError) as exc:
+        raise SystemExit(str(exc))
+    print(f"sorted {summary['values']} values in {summary['seconds']:.2f} s: "
+          f"{summary['runs']} runs, {summary['passes']} merge passes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Tk window that shows an external merge sort at the run and block level.
+
+The sort runs on a worker thread and sends its ``ExternalEvent``s through a
+queue that the window drains every POLL_MS.  Each pass is one row of the
+canvas: run formation on top, then one row per merge pass, with every run
+drawn as a block whose width is its share of the input.  A merge's output
+fills up block by block under the runs it consumes.
+"""
+
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from sorting_visualizer.external import DEFAULT_FAN_IN, DEFAULT_MEMORY, external_sort_steps
+from sorting_visualizer.loaders import LoadError
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 400
+ROW_HEIGHT = 40
+ROW_GAP = 14
+POLL_MS = 50
+
+CONSUMED_COLOR = "#d5dbdb"
+PENDING_COLOR = "#ecf0f1"
+
+
+class ExternalWindow:
+    def __init__(self, root, bar_color="#3498db", sorted_color="#2ecc71"):
+        self.root = root
+        self.bar_color = bar_color
+        self.sorted_color = sorted_color
+        self.source = None
+        self.events = queue.Queue()
+        self.worker = None
+        self.cancelled = threading.Event()
+        # run -> [level, offset, count, written, consumed]
+        self.runs = {}
+        self.total = 0
+
+        self.window = tk.Toplevel(root)
+        self.window.title("External Merge Sort")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = tk.Frame(self.window)
+        controls.pack(pady=10)
+        tk.Button(controls, text="Choose File...", command=self.choose_file, bg="#3498db", fg="black").pack(
+            side="left", padx=5)
+        tk.Label(controls, text="Memory (MB)", font=("Arial", 11)).pack(side="left")
+        self.memory_mb = tk.IntVar(value=DEFAULT_MEMORY >> 20)
+        ttk.Spinbox(controls, from_=1, to=1 << 16, textvariable=self.memory_mb, width=7).pack(side="left", padx=5)
+        tk.Label(controls, text="Fan-in", font=("Arial", 11)).pack(side="left")
+        self.fan_in = tk.IntVar(value=DEFAULT_FAN_IN)
+        ttk.Spinbox(controls, from_=2, to=1024, textvariable=self.fan_in, width=5).pack(side="left", padx=5)
+        tk.Button(controls, text="Sort", command=self.start, bg="#2ecc71", fg="black").pack(side="left", padx=5)
+
+        self.status_label = tk.Label(self.window, text="Choose a file to sort.", font=("Arial", 11))
+        self.status_label.pack()
+        self.canvas = tk.Canvas(self.window, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="white")
+        self.canvas.pack(padx=10, pady=10)
+
+    def choose_file(self):
+        from tkinter import filedialog
+
+        path = filedialog.askopenfilename(
+            parent=self.window, title="File to sort",
+            filetypes=[("Arrays", "*.csv *.txt *.npy *.i32 *.i64 *.f64"), ("All files", "*")])
+        if path:
+            self.source = path
+            self.status_label.config(text=f"{os.path.basename(path)}: choose the budget and fan-in, then Sort.")
+
+    def start(self, output=None):
+        if self.source is None or (self.worker is not None and self.worker.is_alive()):
+            return
+        try:
+            memory = max(1, self.memory_mb.get()) << 20
+            fan_in = max(2, self.fan_in.get())
+        except tk.TclError:
+            self.status_label.config(text="Memory and fan-in must be whole numbers.")
+            return
+        if output is None:
+            from tkinter import filedialog
+
+            output = filedialog.asksaveasfilename(
+                parent=self.window, title="Write sorted values to", defaultextension=".i64",
+                filetypes=[("Raw int64", "*.i64"), ("Text", "*.txt")])
+            if not output:
+                return
+        self.runs = {}
+        self.total = 0
+        self.cancelled.clear()
+        self.events = queue.Queue()
+        self.worker = threading.Thread(
+            target=self._sort, args=(self.source, output, memory, fan_in, self.events), daemon=True)
+        self.worker.start()
+        self.status_label.config(text="Forming runs...")
+        self.window.after(POLL_MS, self.poll, self.events)
+
+    def _sort(self, source, output, memory, fan_in, events):
+        steps = external_sort_steps(source, output, memory, fan_in)
+        try:
+            for event in steps:
+                if self.cancelled.is_set():
+                    return
+                events.put(event)
+        except (OSError, LoadError, ValueError) as exc:
+            events.put(exc)
+        finally:
+            # Closing the generator removes its run files.
+            steps.close()
+
+    def poll(self, events):
+        if events is not self.events:
+            return
+        finished = False
+        try:
+            while True:
+                event = events.get_nowait()
+                if isinstance(event, Exception):
+                    self.status_label.config(text="\n".join(str(event).splitlines()[:2]))
+                    return
+                finished = self.apply(event) or finished
+        except queue.Empty:
+            pass
+        self.draw()
+        if not finished:
+            self.window.after(POLL_MS, self.poll, events)
+
+    def apply(self, event):
+        """Update the run table for ``event``; return True once the sort is done."""
+        if event.kind == "run":
+            self.runs[event.run] = [0, self.total, event.count, event.count, False]
+            self.total += event.count
+            self.status_label.config(text=f"Forming runs: {len(self.runs)} runs, {self.total} values")
+        elif event.kind == "merge":
+            offset = self.runs[event.sources[0]][1]
+            self.runs[event.run] = [event.level, offset, event.count, 0, False]
+            self.status_label.config(
+                text=f"Pass {event.level}: merging {len(event.sources)} runs into run {event.run}")
+        elif event.kind == "block":
+            self.runs[event.run][3] = event.count
+            if event.count == self.runs[event.run][2]:
+                for source in event.sources:
+                    self.runs[source][4] = True
+        elif event.kind == "done":
+            passes = max((run[0] for run in self.runs.values()), default=0)
+            self.status_label.config(text=f"Sorted {self.total} values with {passes} merge passes.")
+            return True
+        return False
+
+    def draw(self):
+        self.canvas.delete("all")
+        if not self.total:
+            return
+        scale = CANVAS_WIDTH / self.total
+        rows = 1 + max(run[0] for run in self.runs.values())
+        # Rows shrink when there are more passes than fit at full height.
+        pitch = min(ROW_HEIGHT + ROW_GAP, (CANVAS_HEIGHT - ROW_GAP) / rows)
+        height = pitch * ROW_HEIGHT / (ROW_HEIGHT + ROW_GAP)
+        for level, offset, count, written, consumed in self.runs.values():
+            y0 = ROW_GAP + level * pitch
+            x0 = offset * scale
+            fill = CONSUMED_COLOR if consumed else PENDING_COLOR
+            self.canvas.create_rectangle(x0, y0, (offset + count) * scale, y0 + height, fill=fill, outline="black")
+            if written and not consumed:
+                color = self.bar_color if level == 0 or written < count else self.sorted_color
+                self.canvas.create_rectangle(x0, y0, x0 + written * scale, y0 + height, fill=color, outline="")
+
+    def stop(self):
+        self.cancelled.set()
+        self.events = queue.Queue()
+
+    def close(self):
+        self.stop()
+        self.window.destroy()
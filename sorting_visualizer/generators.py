@@ -0,0 +1,182 @@
+"""Input array generators.
+
+Every distribution builds ``n`` integers in ``[low, high]`` with vectorized
+NumPy calls, so millions of values take milliseconds.  Without NumPy the same
+distributions fall back to the ``random`` module; results are reproducible
+for a given seed on either backend, but the two backends differ.
+
+NumPy is imported on first use only, and ``generate`` builds arrays shorter
+than NUMPY_MIN_SIZE with the ``random`` module, where importing NumPy would
+take longer than generating the values.
+"""
+
+import random
+
+np = None
+_numpy_checked = False
+
+# ``generate`` uses NumPy (when installed) from this many elements on.
+NUMPY_MIN_SIZE = 10000
+
+
+def load_numpy():
+    """Import NumPy on first call; return the module, or None without it."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+        except ImportError:  # NumPy is optional; the pure-Python path is just slower.
+            pass
+        else:
+            np = numpy
+    return np
+
+
+def _vectorized(rng):
+    return not isinstance(rng, random.Random)
+
+
+def _scale(shape, low, high, span):
+    """Map integer ``shape`` values in ``0..span`` onto ``low..high``."""
+    span = max(span, 1)
+    if not isinstance(shape, list):
+        return low + shape * (high - low) // span
+    return [low + s * (high - low) // span for s in shape]
+
+
+def uniform(n, rng, low, high):
+    if _vectorized(rng):
+        return rng.integers(low, high + 1, n)
+    return [rng.randint(low, high) for _ in range(n)]
+
+
+def gaussian(n, rng, low, high):
+    mid = (low + high) / 2
+    sigma = max((high - low) / 6, 1e-9)
+    if _vectorized(rng):
+        return np.clip(np.rint(rng.normal(mid, sigma, n)), low, high).astype(np.int64)
+    return [min(high, max(low, round(rng.gauss(mid, sigma)))) for _ in range(n)]
+
+
+def sorted_values(n, rng, low, high):
+    values = uniform(n, rng, low, high)
+    if _vectorized(rng):
+        values.sort()
+        return values
+    return sorted(values)
+
+
+def reversed_values(n, rng, low, high):
+    return sorted_values(n, rng, low, high)[::-1]
+
+
+def nearly_sorted(n, rng, low, high, swaps=0.01):
+    """Sorted input with ``swaps * n`` random pairs exchanged."""
+    values = sorted_values(n, rng, low, high)
+    count = max(1, int(n * swaps)) if n else 0
+    if _vectorized(rng):
+        i = rng.integers(0, n, count)
+        j = rng.integers(0, n, count)
+        values[np.concatenate((i, j))] = values[np.concatenate((j, i))]
+        return values
+    for _ in range(count):
+        a = rng.randrange(n)
+        b = rng.randrange(n)
+        values[a], values[b] = values[b], values[a]
+    return values
+
+
+def k_sorted(n, rng, low, high, k=16):
+    """Sorted input where every element is fewer than ``k`` places from home."""
+    values = sorted_values(n, rng, low, high)
+    if _vectorized(rng):
+        return values[np.argsort(np.arange(n) + rng.uniform(0, k, n), kind="stable")]
+    keys = [i + rng.uniform(0, k) for i in range(n)]
+    return [values[i] for i in sorted(range(n), key=keys.__getitem__)]
+
+
+def sawtooth(n, rng, low, high, teeth=8):
+    tooth = max(1, -(-n // teeth))
+    if _vectorized(rng):
+        return _scale(np.arange(n) % tooth, low, high, tooth - 1)
+    return _scale([i % tooth for i in range(n)], low, high, tooth - 1)
+
+
+def organ_pipe(n, rng, low, high):
+    half = max(1, (n - 1) // 2)
+    if _vectorized(rng):
+        i = np.arange(n)
+        return _scale(np.minimum(i, n - 1 - i), low, high, half)
+    return _scale([min(i, n - 1 - i) for i in range(n)], low, high, half)
+
+
+def few_unique(n, rng, low, high, unique=8):
+    if _vectorized(rng):
+        levels = np.linspace(low, high, unique).astype(np.int64)
+        return levels[rng.integers(0, unique, n)]
+    levels = [low + (high - low) * u // max(unique - 1, 1) for u in range(unique)]
+    return [levels[rng.randrange(unique)] for _ in range(n)]
+
+
+def quicksort_killer(n, rng, low, high):
+    """Musser's median-of-3 killer sequence, scaled onto ``low..high``.
+
+    Median-of-three pivot selection on this input degrades quick sort to
+    quadratic time.  The construction needs a multiple of four values, so the
+    sequence is built for the largest such m <= n and the values m + 1..n
+    are appended at the end in order.
+    """
+    m = n - n % 4
+    k = m // 2
+    if _vectorized(rng):
+        a = np.zeros(n, dtype=np.int64)
+        i = np.arange(1, k + 1)
+        a[k + i - 1] = 2 * i
+        odd = i[::2]
+        a[odd - 1] = odd
+        a[odd] = k + odd
+        a[m:] = np.arange(m + 1, n + 1)
+        return _scale(a - 1, low, high, max(n - 1, 1))
+    a = list(range(1, n + 1))
+    for i in range(1, k + 1):
+        if i % 2:
+            a[i - 1] = i
+            a[i] = k + i
+        a[k + i - 1] = 2 * i
+    return _scale([v - 1 for v in a], low, high, max(n - 1, 1))
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "gaussian": gaussian,
+    "sorted": sorted_values,
+    "reversed": reversed_values,
+    "nearly_sorted": nearly_sorted,
+    "k_sorted": k_sorted,
+    "sawtooth": sawtooth,
+    "organ_pipe": organ_pipe,
+    "few_unique": few_unique,
+    "quicksort_killer": quicksort_killer,
+}
+
+
+def _build(n, distribution, seed, low, high, vectorized, params):
+    if high is None:
+        high = max(low, n)
+    rng = np.random.default_rng(seed) if vectorized else random.Random(seed)
+    return DISTRIBUTIONS[distribution](n, rng, low, high, **params)
+
+
+def generate_array(n, distribution="uniform", seed=None, low=1, high=None, **params):
+    """Return ``n`` values as a NumPy int64 array (a list without NumPy)."""
+    if load_numpy() is None:
+        return list(_build(n, distribution, seed, low, high, False, params))
+    return np.asarray(_build(n, distribution, seed, low, high, True, params), dtype=np.int64)
+
+
+def generate(n, distribution="uniform", seed=None, low=1, high=None, **params):
+    """Return ``n`` values as a plain list, ready for the step engine."""
+    vectorized = n >= NUMPY_MIN_SIZE and load_numpy() is not None
+    values = _build(n, distribution, seed, low, high, vectorized, params)
+    return np.asarray(values, dtype=np.int64).tolist() if vectorized else list(values)
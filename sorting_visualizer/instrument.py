@@ -0,0 +1,310 @@
+"""Instrumented arrays, phase timing and profiling hooks.
+
+``Probe`` runs an algorithm and counts its comparisons and swaps from the step
+events.  By default reads and writes are only estimated from the same events
+(a COMPARE reads two elements, a SWAP reads and writes two, a WRITE writes
+one), which keeps a probed run within a few percent of a plain one but misses
+reads made without an event, such as insertion sort's key or the runs merge
+sort copies out.  Reports label them ``estimated_reads`` and
+``estimated_writes``.  With ``exact=True`` the run sorts an
+``InstrumentedArray`` instead, which counts every element an algorithm
+actually reads or writes (scratch buffers aside) at about three times the
+cost.  Instrumentation is opt-in: the engine still sorts plain lists, which
+pay nothing for it.  The profiling modules are imported by the hooks that
+use them, keeping this module cheap to import.
+
+    python -m sorting_visualizer.instrument quick --size 100000 --profile
+"""
+
+import argparse
+import json
+import re
+from array import array
+from collections import namedtuple
+from itertools import islice
+from operator import itemgetter
+from time import perf_counter
+
+from sorting_visualizer import engine
+
+Counters = namedtuple("Counters", "reads writes comparisons swaps")
+
+# Phases each algorithm is split into: the phase a run starts in, and the
+# phase entered whenever an event with the given opcode is seen.  Algorithms
+# without an entry are timed as a single "sort" phase.
+PHASES = {
+    "Quick Sort": ("recursion", {engine.PIVOT: "partition", engine.DONE: "recursion"}),
+    "Heap Sort": ("heapify", {engine.DONE: "extract"}),
+}
+DEFAULT_PHASES = ("sort", {})
+
+# Events whose opcodes Probe.run tallies per pass.
+COUNT_CHUNK = 1 << 16
+
+
+class InstrumentedArray:
+    """Array-backed sequence that counts element reads and writes.
+
+    Slices come back as lists, so scratch buffers can be mixed with it freely;
+    the elements a slice or an iteration covers are counted one by one.
+    """
+
+    __slots__ = ("data", "reads", "writes")
+
+    def __init__(self, values, typecode="q"):
+        self.data = array(typecode, values)
+        self.reads = 0
+        self.writes = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        if i.__class__ is slice:
+            items = self.data[i]
+            self.reads += len(items)
+            return items.tolist()
+        self.reads += 1
+        return self.data[i]
+
+    def __setitem__(self, i, value):
+        if i.__class__ is slice:
+            value = array(self.data.typecode, value)
+            self.writes += len(value)
+        else:
+            self.writes += 1
+        self.data[i] = value
+
+    def __iter__(self):
+        self.reads += len(self.data)
+        return iter(self.data)
+
+    def __repr__(self):
+        return f"InstrumentedArray({self.data.tolist()!r})"
+
+    def tolist(self):
+        return self.data.tolist()
+
+
+class Probe:
+    """One instrumented run of algorithm ``name`` over a copy of ``values``.
+
+    ``run()`` drains the run and counts the events at C speed; a caller that
+    consumes ``steps()`` itself (the animated worker) passes each event to
+    ``count()`` instead, or hands the rest of the run to ``tally()`` a chunk
+    at a time.  Phase times are the wall time between the events that switch
+    phases, so they include whatever the consumer does in between.
+    """
+
+    __slots__ = ("name", "array", "comparisons", "swaps", "writes", "phases", "seconds")
+
+    def __init__(self, name, values, exact=False):
+        self.name = name
+        self.array = InstrumentedArray(values) if exact else list(values)
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.phases = {}
+        self.seconds = 0.0
+
+    def steps(self):
+        """Yield the run's events, timing its phases."""
+        phase, switches = PHASES.get(self.name, DEFAULT_PHASES)
+        phases = self.phases
+        start = since = perf_counter()
+        events = engine.steps(self.name, self.array)
+        try:
+            if not switches:
+                yield from events
+                return
+            for event in events:
+                if event[0] in switches:
+                    now = perf_counter()
+                    phases[phase] = phases.get(phase, 0.0) + now - since
+                    phase = switches[event[0]]
+                    since = now
+                yield event
+        finally:
+            events.close()
+            now = perf_counter()
+            phases[phase] = phases.get(phase, 0.0) + now - since
+            self.seconds = now - start
+
+    def run(self):
+        """Sort to completion and return the final counters.
+
+        The events are drained in chunks at C speed, so phase times are
+        estimated: each chunk's time is shared among the phases in proportion
+        to the events of the chunk that fall in each.
+        """
+        phase, switches = PHASES.get(self.name, DEFAULT_PHASES)
+        pattern = re.compile(b"[" + re.escape(bytes(switches)) + b"]") if switches else None
+        phases = self.phases
+        events = engine.steps(self.name, self.array)
+        start = last = perf_counter()
+        try:
+            while True:
+                ops = self._take(events, COUNT_CHUNK)
+                now = perf_counter()
+                elapsed = now - last
+                last = now
+                begin = 0
+                if ops and pattern is not None:
+                    for match in pattern.finditer(ops):
+                        at = match.start()
+                        phases[phase] = phases.get(phase, 0.0) + elapsed * (at - begin) / len(ops)
+                        phase = switches[ops[at]]
+                        begin = at
+                share = (len(ops) - begin) / len(ops) if ops else 1.0
+                phases[phase] = phases.get(phase, 0.0) + elapsed * share
+                if not ops:
+                    break
+        finally:
+            events.close()
+        self.seconds = perf_counter() - start
+        return self.counters()
+
+    def tally(self, events, limit=COUNT_CHUNK):
+        """Consume and count up to ``limit`` of ``events``; return how many there were."""
+        return len(self._take(events, limit))
+
+    def _take(self, events, limit):
+        # Opcodes fit in a byte, so bytes() collects a chunk of them and
+        # bytes.count tallies it without a Python-level loop.
+        ops = bytes(map(itemgetter(0), islice(events, limit)))
+        self.comparisons += ops.count(engine.COMPARE)
+        self.swaps += ops.count(engine.SWAP)
+        self.writes += ops.count(engine.WRITE)
+        return ops
+
+    def count(self, event):
+        """Count ``event`` and return the ``Counters`` after it."""
+        op = event[0]
+        if op == engine.COMPARE:
+            self.comparisons += 1
+        elif op == engine.SWAP:
+            self.swaps += 1
+        elif op == engine.WRITE:
+            self.writes += 1
+        return self.counters()
+
+    def counters(self):
+        """The ``Counters`` so far; reads and writes are estimates unless ``exact``."""
+        if self.array.__class__ is InstrumentedArray:
+            return Counters(self.array.reads, self.array.writes, self.comparisons, self.swaps)
+        return Counters(2 * (self.comparisons + self.swaps), 2 * self.swaps + self.writes, self.comparisons, self.swaps)
+
+    def tolist(self):
+        """The array being sorted, as a list."""
+        return list(self.array)
+
+
+class ProfileHook:
+    """Runs cProfile around a measurement and reports the top functions."""
+
+    name = "profile"
+
+    def __init__(self, sort="cumulative", limit=15):
+        self.sort = sort
+        self.limit = limit
+        self.profile = None
+
+    def start(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def result(self):
+        import io
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats(self.sort).print_stats(self.limit)
+        return out.getvalue()
+
+
+class MemoryHook:
+    """Reports the peak traced allocation of a measurement in bytes."""
+
+    name = "peak_bytes"
+
+    def __init__(self):
+        self.peak = 0
+
+    def start(self):
+        import tracemalloc
+
+        tracemalloc.start()
+
+    def stop(self):
+        import tracemalloc
+
+        self.peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def result(self):
+        return self.peak
+
+
+def measure(name, values, hooks=(), exact=False):
+    """Sort a copy of ``values`` with ``name`` under instrumentation and return a report.
+
+    ``hooks`` are objects with ``name``, ``start()``, ``stop()`` and
+    ``result()``; each one's result is added to the report under its name.
+    Without ``exact`` the reads and writes are reported as
+    ``estimated_reads`` and ``estimated_writes``.
+    """
+    probe = Probe(name, values, exact)
+    for hook in hooks:
+        hook.start()
+    try:
+        counters = probe.run()
+    finally:
+        for hook in reversed(hooks):
+            hook.stop()
+    report = {"algorithm": name, "n": len(values), "seconds": probe.seconds}
+    report.update(counters._asdict())
+    if not exact:
+        report["estimated_reads"] = report.pop("reads")
+        report["estimated_writes"] = report.pop("writes")
+    report["phases"] = dict(probe.phases)
+    for hook in hooks:
+        report[hook.name] = hook.result()
+    return report
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+    from sorting_visualizer.generators import DISTRIBUTIONS, generate
+
+    parser = argparse.ArgumentParser(description="Count and time the operations of a sort.")
+    parser.add_argument("algorithms", nargs="*", help="algorithms to run (default: all)")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--distribution", choices=sorted(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", action="store_true", help="add a cProfile report")
+    parser.add_argument("--memory", action="store_true", help="add the tracemalloc peak")
+    parser.add_argument("--exact", action="store_true",
+                        help="count every element access instead of estimating reads and writes from the events (slower)")
+    args = parser.parse_args(argv)
+
+    values = generate(args.size, args.distribution, seed=args.seed)
+    for name in resolve_algorithms(args.algorithms):
+        hooks = []
+        if args.profile:
+            hooks.append(ProfileHook())
+        if args.memory:
+            hooks.append(MemoryHook())
+        report = measure(name, values, hooks, args.exact)
+        profile = report.pop("profile", None)
+        print(json.dumps(report))
+        if profile:
+            print(profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Array loaders for CSV/text, ``.npy`` and raw binary files.
+
+Text files are read in chunks and parsed a chunk at a time, so millions of
+values never pass through a text box or a list of lines.  ``.npy`` files are
+memory-mapped and raw little-endian buffers are viewed in place (with
+``numpy.memmap`` when NumPy is installed, ``memoryview`` otherwise), so large
+inputs are only copied when a sort takes its own copy.
+
+Every loader returns ``Loaded(values, errors, skipped)``; ``values`` supports
+``len()``, indexing and ``tolist()``.  Malformed text tokens raise ``LoadError``
+listing them by line, or are dropped with ``skip_invalid=True`` and reported in
+``errors`` (the first MAX_ERRORS of them) and ``skipped`` (all of them).
+
+The sorts in this package work on integers, so float64 data must hold whole
+numbers; anything else is rejected with the index of the first offender.
+"""
+
+import mmap
+import os
+import sys
+from array import array
+from collections import namedtuple
+
+Loaded = namedtuple("Loaded", "values errors skipped")
+LineError = namedtuple("LineError", "line token")
+
+# Bytes read from a text file per parsing pass.
+CHUNK_SIZE = 1 << 20
+
+# Malformed tokens listed in an error message or kept in ``Loaded.errors``.
+MAX_ERRORS = 20
+
+# Raw dtypes: array typecode and the little-endian NumPy dtype.
+RAW_DTYPES = {"int32": ("i", "<i4"), "int64": ("q", "<i8"), "float64": ("d", "<f8")}
+RAW_EXTENSIONS = {".i32": "int32", ".i64": "int64", ".f64": "float64"}
+
+
+class LoadError(ValueError):
+    """A file could not be turned into an array; ``errors`` lists bad tokens by line."""
+
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _fail(path, errors, skipped):
+    shown = "\n".join(f"  {path}:{e.line}: invalid value {e.token!r}" for e in errors)
+    more = f"\n  ... and {skipped - len(errors)} more" if skipped > len(errors) else ""
+    raise LoadError(f"{skipped} malformed value(s) in {path}:\n{shown}{more}", errors)
+
+
+class _TextParser:
+    """Parses whole lines of a text file into ``values``, keeping line numbers."""
+
+    def __init__(self, column):
+        self.values = array("q")
+        self.errors = []
+        self.skipped = 0
+        self.column = column
+        self.line = 1
+
+    def feed(self, chunk):
+        if self.line == 1:
+            chunk = self._header(chunk)
+        if self.column is None:
+            try:
+                # Fast path: the whole chunk parses, no per-line bookkeeping.
+                self.values.extend(array("q", map(int, chunk.replace(b",", b" ").split())))
+                self.line += chunk.count(b"\n")
+                return
+            except (ValueError, OverflowError):
+                pass
+        for line in chunk.splitlines():
+            self._parse_line(line)
+            self.line += 1
+
+    def _header(self, chunk):
+        """Skip a first line without a single number in it; resolve a named column."""
+        end = chunk.find(b"\n") + 1 or len(chunk)
+        first = chunk[:end]
+        cells = [cell.strip() for cell in first.split(b",")]
+        if isinstance(self.column, str):
+            names = [cell.decode(errors="replace") for cell in cells]
+            if self.column not in names:
+                raise LoadError(f"no column named {self.column!r}; the header is {names}")
+            self.column = names.index(self.column)
+        elif any(_is_int(token) for token in first.replace(b",", b" ").split()):
+            return chunk
+        self.line += 1
+        return chunk[end:]
+
+    def _parse_line(self, line):
+        if self.column is None:
+            tokens = line.replace(b",", b" ").split()
+        else:
+            cells = line.split(b",")
+            if not line.strip():
+                return
+            tokens = [cells[self.column].strip() if self.column < len(cells) else b""]
+        for token in tokens:
+            try:
+                self.values.append(int(token))
+            except (ValueError, OverflowError):
+                self.skipped += 1
+                if len(self.errors) < MAX_ERRORS:
+                    self.errors.append(LineError(self.line, token.decode(errors="replace")))
+
+
+def _is_int(token):
+    try:
+        int(token)
+    except (ValueError, OverflowError):
+        return False
+    return True
+
+
+def _text_blocks(f, chunk_size):
+    """Yield ``chunk_size`` reads of ``f`` cut back to whole lines."""
+    tail = b""
+    while True:
+        block = f.read(chunk_size)
+        if not block:
+            if tail:
+                yield tail
+            return
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        tail = block[cut:]
+        if cut:
+            yield block[:cut]
+
+
+def load_text(path, column=None, skip_invalid=False, chunk_size=CHUNK_SIZE):
+    """Load integers separated by commas, whitespace or newlines.
+
+    With ``column`` (an index, or a name from the header line) only that field
+    of each comma-separated row is read.  A first line without any number is
+    taken as a header and skipped.
+    """
+    parser = _TextParser(column)
+    with open(path, "rb") as f:
+        for block in _text_blocks(f, chunk_size):
+            parser.feed(block)
+    if parser.skipped and not skip_invalid:
+        _fail(path, parser.errors, parser.skipped)
+    return Loaded(parser.values, parser.errors, parser.skipped)
+
+
+def _little_endian(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _whole(values, path, offset=0):
+    """Return float ``values`` as int64, or raise at the first non-integer.
+
+    ``offset`` is the file index of ``values[0]``, for the error message.
+    """
+    np = _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        bad = np.flatnonzero(~np.isfinite(values) | (values != np.trunc(values)))
+        if len(bad):
+            raise LoadError(f"{path}: value {values[bad[0]]} at index {offset + bad[0]} is not a whole number")
+        return values.astype(np.int64)
+    ints = array("q")
+    for i, value in enumerate(values, offset):
+        if value != value or value in (float("inf"), float("-inf")) or not value.is_integer():
+            raise LoadError(f"{path}: value {value!r} at index {i} is not a whole number")
+        ints.append(int(value))
+    return ints
+
+
+def _map_npy(path):
+    """Memory-map a one-dimensional ``.npy`` array of integers or floats, unconverted."""
+    np = _numpy()
+    if np is None:
+        raise LoadError("reading .npy files needs NumPy: pip install numpy")
+    try:
+        values = np.load(path, mmap_mode="r", allow_pickle=False)
+    except ValueError as exc:
+        raise LoadError(f"{path}: {exc}")
+    if values.ndim != 1:
+        raise LoadError(f"{path}: expected a one-dimensional array, got shape {values.shape}")
+    if values.dtype.kind not in "iuf":
+        raise LoadError(f"{path}: unsupported dtype {values.dtype}")
+    return values
+
+
+def load_npy(path):
+    """Memory-map a one-dimensional ``.npy`` array of integers or whole floats."""
+    values = _map_npy(path)
+    if values.dtype.kind == "f":
+        values = _whole(values, path)
+    return Loaded(values, [], 0)
+
+
+def load_raw(path, dtype="int64"):
+    """View a headerless little-endian int32, int64 or float64 buffer."""
+    if dtype not in RAW_DTYPES:
+        raise LoadError(f"unknown raw dtype {dtype!r}; choose from {', '.join(RAW_DTYPES)}")
+    typecode, numpy_dtype = RAW_DTYPES[dtype]
+    size = array(typecode).itemsize
+    length = os.path.getsize(path)
+    if length % size:
+        raise LoadError(f"{path}: {length} bytes is not a whole number of {dtype} values")
+    np = _numpy()
+    if length == 0:
+        values = array(typecode)
+    elif np is not None:
+        values = np.memmap(path, dtype=numpy_dtype, mode="r")
+    else:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder == "little":
+            values = memoryview(buffer).cast(typecode)
+        else:
+            values = _little_endian(typecode, buffer)
+    if dtype == "float64":
+        values = _whole(values, path)
+    return Loaded(values, [], 0)
+
+
+def load(path, dtype=None, column=None, skip_invalid=False):
+    """Load ``path`` with the loader its extension calls for.
+
+    ``.npy`` files are memory-mapped; ``.i32``/``.i64``/``.f64`` files, or any
+    file when ``dtype`` is given, are raw buffers; everything else is text.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return load_npy(path)
+    dtype = dtype or RAW_EXTENSIONS.get(extension)
+    if dtype is not None:
+        return load_raw(path, dtype)
+    return load_text(path, column, skip_invalid)
+
+
+def iter_chunks(path, count, dtype=None, column=None, skip_invalid=False):
+    """Yield the values of ``path`` in sequences of at most ``count`` integers.
+
+    Only about one chunk is held in memory at a time, whatever the file size;
+    the file types and options are those of ``load``.  Malformed text raises
+    ``LoadError`` as soon as the chunk holding it is parsed.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        # Floats are checked and converted a chunk at a time, so no
+        # temporary is ever the size of the file.
+        values = _map_npy(path)
+        for start in range(0, len(values), count):
+            chunk = values[start:start + count]
+            if chunk.dtype.kind == "f":
+                chunk = _whole(chunk, path, start)
+            yield chunk.tolist()
+        return
+    dtype = dtype or RAW_EXTENSIONS.get(extension)
+    if dtype is not None:
+        if dtype not in RAW_DTYPES:
+            raise LoadError(f"unknown raw dtype {dtype!r}; choose from {', '.join(RAW_DTYPES)}")
+        typecode = RAW_DTYPES[dtype][0]
+        size = array(typecode).itemsize
+        if os.path.getsize(path) % size:
+            raise LoadError(f"{path}: {os.path.getsize(path)} bytes is not a whole number of {dtype} values")
+        with open(path, "rb") as f:
+            start = 0
+            while True:
+                data = f.read(count * size)
+                if not data:
+                    return
+                values = _little_endian(typecode, data)
+                yield _whole(values, path, start) if dtype == "float64" else values
+                start += len(values)
+    parser = _TextParser(column)
+    with open(path, "rb") as f:
+        for block in _text_blocks(f, min(CHUNK_SIZE, max(count, 64))):
+            parser.feed(block)
+            if parser.skipped and not skip_invalid:
+                _fail(path, parser.errors, parser.skipped)
+            if len(parser.values) >= count:
+                values = parser.values
+                for start in range(0, len(values) - count + 1, count):
+                    yield values[start:start + count]
+                parser.values = values[len(values) - len(values) % count:]
+    if parser.values:
+        yield parser.values
@@ -0,0 +1,282 @@
+"""Multi-process merge sort and sample sort over shared memory.
+
+The values are copied once into a ``multiprocessing.shared_memory`` block of
+int64, next to a scratch block of the same size.  Pool workers attach to both
+when they start and every task names only index ranges, so no array data is
+pickled:
+
+- merge sort: each worker sorts one segment in place, then pairs of runs are
+  merged into the other block in log2(p) rounds.  Every merge is cut along
+  the merge path into pieces of about n/p values, so each round keeps all
+  workers busy however few runs are left.
+- sample sort: each worker sorts its segment and returns p regular samples;
+  the p - 1 splitters drawn from them cut every segment into p buckets, and
+  worker b gathers bucket b from all segments into the scratch block and
+  merges it there.  Inputs with few distinct values put most of the array in
+  one bucket, so merge sort scales better on those.
+
+Workers sort and merge with NumPy when it is installed, and with ``sorted``
+and ``heapq.merge`` otherwise.  A ``SharedSort`` keeps the blocks and the
+started pool for repeated sorts of one size, so timings leave out process
+startup.  The animated versions of both sorts are in ``algorithms.parallel``.
+
+    python -m sorting_visualizer parallel --size 10000000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import heapq
+import os
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import shared_memory
+from time import perf_counter
+
+from sorting_visualizer.algorithms.parallel import merge_pieces, segments
+from sorting_visualizer.generators import DISTRIBUTIONS, load_numpy
+
+METHODS = ("merge", "sample")
+
+np = None
+_blocks = None
+_views = None
+
+
+def _view(block, n):
+    if np is not None:
+        return np.ndarray((n,), dtype=np.int64, buffer=block.buf)
+    return block.buf[:n * 8].cast("q")
+
+
+def _attach(names, n):
+    """Pool initializer: map the shared blocks of an ``n``-value sort."""
+    global np, _blocks, _views
+    # A forked worker inherits the parent's mapping; let go of it first.
+    _detach()
+    np = load_numpy()
+    _blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _views = [_view(block, n) for block in _blocks]
+
+
+def _sort_segment(low, high, samples):
+    """Sort block 0's ``[low, high)`` in place; return ``samples`` evenly spaced values of it."""
+    view = _views[0]
+    if np is not None:
+        view[low:high].sort()
+    else:
+        view[low:high] = array("q", sorted(view[low:high]))
+    return [int(view[low + (high - low) * t // samples]) for t in range(samples)] if high > low else []
+
+
+def _merge(src, a_low, a_high, b_low, b_high, out):
+    """Merge two sorted ranges of block ``src`` into the other block from ``out`` on, stably."""
+    a = _views[src][a_low:a_high]
+    b = _views[src][b_low:b_high]
+    end = out + len(a) + len(b)
+    dst = _views[1 - src]
+    if np is not None:
+        # NumPy's stable sort is a timsort for int64, which merges the two
+        # runs it finds in linear time.
+        np.concatenate((a, b), out=dst[out:end])
+        dst[out:end].sort(kind="stable")
+    else:
+        dst[out:end] = array("q", heapq.merge(a, b))
+
+
+def _gather(pieces, out):
+    """Merge the sorted ranges ``pieces`` of block 0 into block 1 from ``out`` on."""
+    src, dst = _views
+    end = out + sum(high - low for low, high in pieces)
+    if end == out:
+        return
+    if np is not None:
+        np.concatenate([src[low:high] for low, high in pieces], out=dst[out:end])
+        dst[out:end].sort(kind="stable")
+    else:
+        dst[out:end] = array("q", heapq.merge(*(src[low:high] for low, high in pieces)))
+
+
+class _Inline:
+    """Runs tasks in this process, for one worker."""
+
+    def submit(self, function, *args):
+        return _Done(function(*args))
+
+    def shutdown(self):
+        pass
+
+
+class _Done:
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+def _run(pool, function, tasks):
+    return [future.result() for future in [pool.submit(function, *task) for task in tasks]]
+
+
+def _merge_sort(pool, view, n, workers):
+    runs = segments(n, workers)
+    _run(pool, _sort_segment, [(low, high, 0) for low, high in runs])
+    src = 0
+    while len(runs) > 1:
+        _run(pool, _merge, [(src, *piece) for piece in merge_pieces(view[src], runs, n, workers)])
+        runs = [(runs[t][0], runs[min(t + 1, len(runs) - 1)][1]) for t in range(0, len(runs), 2)]
+        src = 1 - src
+    return src
+
+
+def _sample_sort(pool, view, n, workers):
+    ranges = segments(n, workers)
+    samples = sorted(chain.from_iterable(_run(pool, _sort_segment, [(low, high, workers) for low, high in ranges])))
+    splitters = [samples[len(samples) * t // workers] for t in range(1, workers)]
+    cuts = [[low] + [bisect_right(view[0], s, low, high) for s in splitters] + [high] for low, high in ranges]
+    tasks = []
+    out = 0
+    for b in range(workers):
+        pieces = [(row[b], row[b + 1]) for row in cuts if row[b + 1] > row[b]]
+        tasks.append((pieces, out))
+        out += sum(high - low for low, high in pieces)
+    _run(pool, _gather, tasks)
+    return 1
+
+
+def _ready():
+    pass
+
+
+class SharedSort:
+    """Shared blocks and a started pool of ``workers`` processes for sorting ``n`` values.
+
+    One worker sorts in this process.  Use as a context manager, or call
+    ``close``, to stop the pool and free the blocks.
+    """
+
+    def __init__(self, n, workers=None):
+        self.n = n
+        self.workers = max(1, min(workers or os.cpu_count() or 1, n))
+        self.blocks = [shared_memory.SharedMemory(create=True, size=max(n, 1) * 8) for _ in range(2)]
+        names = [block.name for block in self.blocks]
+        self.pool = _Inline()
+        try:
+            _attach(names, n)
+            if self.workers > 1:
+                self.pool = ProcessPoolExecutor(self.workers, initializer=_attach, initargs=(names, n))
+                # Submitting one task per worker at once starts them all now.
+                _run(self.pool, _ready, [()] * self.workers)
+        except BaseException:
+            self.close()
+            raise
+
+    def sort(self, values, method="sample"):
+        """Sort ``values`` (``n`` integers); return the result as an ``array("q")``."""
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}; expected one of {', '.join(METHODS)}")
+        n = self.n
+        if n < 2:
+            return array("q", values)
+        if np is not None:
+            _views[0][:] = values
+        else:
+            _views[0][:] = array("q", values)
+        result = (_merge_sort if method == "merge" else _sample_sort)(self.pool, _views, n, self.workers)
+        out = array("q")
+        out.frombytes(self.blocks[result].buf[:n * 8])
+        return out
+
+    def close(self):
+        self.pool.shutdown()
+        _detach()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parallel_sort(values, method="sample", workers=None):
+    """Sort integer ``values`` with ``workers`` processes; return the result as an ``array("q")``.
+
+    ``method`` is "merge" or "sample"; one worker sorts in this process.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}; expected one of {', '.join(METHODS)}")
+    if len(values) < 2:
+        return array("q", values)
+    with SharedSort(len(values), workers) as sorter:
+        return sorter.sort(values, method)
+
+
+def _detach():
+    global _blocks, _views
+    if _views is not None:
+        for view in _views:
+            if isinstance(view, memoryview):
+                view.release()
+    _views = None
+    if _blocks is not None:
+        for block in _blocks:
+            block.close()
+    _blocks = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sort with parallel merge sort or sample sort over shared memory.")
+    parser.add_argument("--method", choices=METHODS + ("both",), default="both")
+    parser.add_argument("--workers", nargs="*", type=int, help="worker counts to time (default: 1 and every core)")
+    parser.add_argument("--size", type=int, default=10 ** 7)
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--input", help="sort the integers in this CSV, text, .npy or raw binary file instead")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.input:
+        from sorting_visualizer.loaders import LoadError, load
+
+        try:
+            values = load(args.input).values
+        except (OSError, LoadError) as exc:
+            raise SystemExit(str(exc))
+    else:
+        from sorting_visualizer.generators import generate_array
+
+        values = generate_array(args.size, args.distribution, args.seed)
+    counts = sorted(set(args.workers or (1, os.cpu_count() or 1)))
+    methods = METHODS if args.method == "both" else (args.method,)
+    expected = array("q")
+    numpy = load_numpy()
+    if numpy is not None:
+        expected.frombytes(numpy.sort(numpy.asarray(values, dtype=numpy.int64)).tobytes())
+    else:
+        expected.extend(sorted(values))
+    print(f"{len(values):,} values, {os.cpu_count()} cores")
+    for method in methods:
+        baseline = None
+        for workers in counts:
+            times = []
+            with SharedSort(len(values), workers) as sorter:
+                for _ in range(max(1, args.repeats)):
+                    start = perf_counter()
+                    result = sorter.sort(values, method)
+                    times.append(perf_counter() - start)
+            if result != expected:
+                raise SystemExit(f"{method} sort with {workers} workers returned a wrong result")
+            best = min(times)
+            baseline = baseline or (counts[0], best)
+            speedup = baseline[1] / best
+            print(f"{method:>6} sort {workers:>3} workers  {best:8.3f}s  speedup {speedup:5.2f}x "
+                  f"over {baseline[0]}, efficiency {speedup * baseline[0] / workers:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Algorithm races on a process pool.
+
+Every lane sorts its own copy of the input in a separate process, so N
+algorithms use N cores instead of sharing one behind the GIL.  Workers stream
+batches of ``(op, a, b)`` events, packed as int64 bytes, through one bounded
+queue per lane.  A worker never waits for the display: when its queue is full
+it keeps sorting and later sends a full snapshot of the array instead of the
+events it skipped, so a slow display never slows the race down.
+"""
+
+import argparse
+import multiprocessing
+import queue
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from sorting_visualizer import engine
+from sorting_visualizer.scheduler import Failure, Snapshot
+
+# Events per message sent to the main process.
+RACE_BATCH = 4096
+
+# Messages buffered per lane before a worker falls back to snapshots.
+QUEUE_SIZE = 16
+
+# Minimum seconds between snapshot attempts of a lagging lane.
+SNAPSHOT_INTERVAL = 1 / 30
+
+_queues = None
+_stopped = None
+
+
+def _init_worker(queues, stopped):
+    global _queues, _stopped
+    _queues = queues
+    _stopped = stopped
+
+
+def _put_blocking(out, message):
+    """Put ``message`` unless the race is stopped first; return whether it was sent."""
+    while not _stopped.is_set():
+        try:
+            out.put(message, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _replay(mirror, flat):
+    it = iter(flat)
+    for op, i, j in zip(it, it, it):
+        if op == engine.SWAP:
+            mirror[i], mirror[j] = mirror[j], mirror[i]
+        elif op == engine.WRITE:
+            mirror[i] = j
+
+
+def run_lane(index, name, values, batch_size=RACE_BATCH):
+    """Sort ``values`` with ``name`` in a pool worker, streaming to lane ``index``.
+
+    Snapshots come from a mirror replayed from the events, because merge and
+    radix sort keep part of the logical array in a scratch buffer.  Time spent
+    on the mirror and the queue is left out of the reported seconds.  If the
+    algorithm raises, the lane gets an error message and the exception
+    propagates to the lane's future.
+    """
+    out = _queues[index]
+    data = list(values)
+    mirror = array("q", values)
+    events = engine.steps(name, data)
+    flat = array("q")
+    limit = 3 * batch_size
+    steps = 0
+    seconds = 0.0
+    behind = False
+    last_try = 0.0
+    resumed = perf_counter()
+    try:
+        for event in events:
+            flat.extend(event)
+            if len(flat) < limit:
+                continue
+            paused = perf_counter()
+            seconds += paused - resumed
+            steps += batch_size
+            if _stopped.is_set():
+                return None
+            _replay(mirror, flat)
+            if not behind:
+                try:
+                    out.put_nowait(("events", flat.tobytes()))
+                except queue.Full:
+                    behind = True
+            elif paused - last_try >= SNAPSHOT_INTERVAL:
+                last_try = paused
+                try:
+                    out.put_nowait(("state", mirror.tobytes()))
+                    behind = False
+                except queue.Full:
+                    pass
+            flat = array("q")
+            resumed = perf_counter()
+    except Exception as exc:
+        _put_blocking(out, ("error", str(exc).encode()))
+        raise
+    finally:
+        events.close()
+    seconds += perf_counter() - resumed
+    steps += len(flat) // 3
+    _replay(mirror, flat)
+    if behind:
+        message = ("state", mirror.tobytes())
+    else:
+        message = ("events", flat.tobytes())
+    if _put_blocking(out, message):
+        _put_blocking(out, None)
+    return {"algorithm": name, "seconds": seconds, "steps": steps}
+
+
+class RaceLane:
+    """Adapts a lane queue to the batch source ``FrameScheduler.play`` expects."""
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    def get_nowait(self):
+        message = self.messages.get_nowait()
+        if message is None:
+            return None
+        kind, payload = message
+        if kind == "error":
+            return Failure(payload.decode())
+        values = array("q")
+        values.frombytes(payload)
+        if kind == "state":
+            return Snapshot(values)
+        it = iter(values)
+        return list(zip(it, it, it))
+
+
+class Race:
+    """Start one pool worker per algorithm, all sorting copies of ``values``."""
+
+    def __init__(self, names, values, batch_size=RACE_BATCH, queue_size=QUEUE_SIZE):
+        context = multiprocessing.get_context()
+        self.names = list(names)
+        self.queues = [context.Queue(queue_size) for _ in self.names]
+        self.stopped = context.Event()
+        self.executor = ProcessPoolExecutor(
+            max(len(self.names), 1), mp_context=context,
+            initializer=_init_worker, initargs=(self.queues, self.stopped))
+        values = list(values)
+        self.futures = [self.executor.submit(run_lane, i, name, values, batch_size)
+                        for i, name in enumerate(self.names)]
+        self.lanes = [RaceLane(q) for q in self.queues]
+
+    def stop(self):
+        """Ask every worker to quit at its next batch and shut the pool down."""
+        self.stopped.set()
+        finished = all(future.done() for future in self.futures)
+        self.executor.shutdown(wait=finished, cancel_futures=True)
+
+    def results(self):
+        """Block until every lane finished; return their stats in finishing order.
+
+        Lanes whose algorithm raised come last, with the message under "error".
+        """
+        results = []
+        failed = []
+        for name, future in zip(self.names, self.futures):
+            exc = future.exception()
+            if exc is not None:
+                failed.append({"algorithm": name, "error": str(exc)})
+            elif future.result() is not None:
+                results.append(future.result())
+        return sorted(results, key=lambda r: r["seconds"]) + failed
+
+
+def race(names, values, batch_size=RACE_BATCH):
+    """Run a race without a display, draining every lane; return ``Race.results()``."""
+    contest = Race(names, values, batch_size)
+    try:
+        pending = set(range(len(contest.lanes)))
+        while pending:
+            for i in list(pending):
+                try:
+                    while True:
+                        message = contest.queues[i].get(timeout=0.01)
+                        if message is None or message[0] == "error":
+                            break
+                    pending.discard(i)
+                except queue.Empty:
+                    # A worker that died without a last message never sends one.
+                    if contest.futures[i].done():
+                        pending.discard(i)
+        return contest.results()
+    finally:
+        contest.executor.shutdown()
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+    from sorting_visualizer.generators import DISTRIBUTIONS, generate
+
+    parser = argparse.ArgumentParser(description="Race sorting algorithms on separate cores.")
+    parser.add_argument("--algorithms", nargs="+", default=["quick", "merge", "heap", "shell", "tim"])
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--distribution", choices=sorted(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    values = generate(args.size, args.distribution, seed=args.seed)
+    for place, result in enumerate(race(resolve_algorithms(args.algorithms), values), 1):
+        if "error" in result:
+            print(f"-. {result['algorithm']:<15} failed: {result['error']}")
+        else:
+            print(f"{place}. {result['algorithm']:<15} {result['seconds']:8.3f} s {result['steps']:>12} steps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Tk window that races several algorithms side by side.
+
+Each lane gets its own canvas, renderer and ``FrameScheduler``; the schedulers
+play the batches that ``race.Race`` workers stream from their processes.
+Lanes are not throttled by the speed slider: the race shows each worker's
+progress as fast as the frame budget allows.
+"""
+
+import tkinter as tk
+from functools import partial
+
+from sorting_visualizer import engine
+from sorting_visualizer.race import Race
+from sorting_visualizer.render import CanvasRenderer
+from sorting_visualizer.scheduler import FrameScheduler
+
+LANE_WIDTH = 400
+LANE_HEIGHT = 180
+COLUMNS = 2
+
+# Steps per second for race lanes; high enough that only the budget limits them.
+UNLIMITED = 10 ** 9
+
+# Total milliseconds per frame shared by all lanes.
+FRAME_BUDGET_MS = 12
+
+
+class RaceWindow:
+    def __init__(self, root, values, bar_color="#3498db", sorted_color="#2ecc71"):
+        self.root = root
+        self.values = list(values)
+        self.bar_color = bar_color
+        self.sorted_color = sorted_color
+        self.race = None
+        self.lanes = []
+        self.finished = 0
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Algorithm Race")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = tk.Frame(self.window)
+        controls.pack(side="left", fill="y", padx=10, pady=10)
+        tk.Label(controls, text="Algorithms", font=("Arial", 12)).pack()
+        self.algorithm_list = tk.Listbox(controls, selectmode="multiple", exportselection=False, height=12)
+        for name in engine.ALGORITHMS:
+            self.algorithm_list.insert("end", name)
+        self.algorithm_list.pack(pady=5)
+        tk.Button(controls, text="Start Race", command=self.start, bg="#2ecc71", fg="black").pack(pady=5)
+        self.status_label = tk.Label(controls, text=f"{len(self.values)} elements", font=("Arial", 10))
+        self.status_label.pack(pady=5)
+
+        self.grid = tk.Frame(self.window)
+        self.grid.pack(side="left", padx=10, pady=10)
+
+    def start(self):
+        names = [self.algorithm_list.get(i) for i in self.algorithm_list.curselection()]
+        if not names or not self.values:
+            self.status_label.config(text="Select at least one algorithm.")
+            return
+        self.stop()
+        for child in self.grid.winfo_children():
+            child.destroy()
+
+        self.race = Race(names, self.values)
+        self.finished = 0
+        budget = max(1, FRAME_BUDGET_MS // len(names))
+        self.lanes = []
+        for i, name in enumerate(names):
+            frame = tk.Frame(self.grid)
+            frame.grid(row=i // COLUMNS, column=i % COLUMNS, padx=5, pady=5)
+            label = tk.Label(frame, text=name, font=("Arial", 11))
+            label.pack()
+            canvas = tk.Canvas(frame, width=LANE_WIDTH, height=LANE_HEIGHT, bg="white")
+            canvas.pack()
+            renderer = CanvasRenderer(canvas, LANE_WIDTH, LANE_HEIGHT, self.bar_color, self.sorted_color,
+                                      show_values=False)
+            data = list(self.values)
+            renderer.reset(data)
+            scheduler = FrameScheduler(self.window, renderer, lambda: UNLIMITED, budget_ms=budget)
+            scheduler.play(data, self.race.lanes[i], on_done=partial(self.lane_done, self.race, i),
+                           on_error=partial(self.lane_failed, self.race, i))
+            self.lanes.append((name, label, scheduler))
+        self.status_label.config(text=f"Racing {len(names)} algorithms on {len(self.values)} elements...")
+
+    def lane_done(self, race, index):
+        if race is not self.race:
+            return
+        future = race.futures[index]
+        if not future.done():
+            self.window.after(50, self.lane_done, race, index)
+            return
+        result = future.result()
+        name, label, _ = self.lanes[index]
+        label.config(text=f"{name}: {result['seconds']:.3f} s, {result['steps']} steps")
+        self.lane_finished(race)
+
+    def lane_failed(self, race, index, message):
+        if race is not self.race:
+            return
+        name, label, _ = self.lanes[index]
+        label.config(text=f"{name} failed: {message}")
+        self.lane_finished(race)
+
+    def lane_finished(self, race):
+        self.finished += 1
+        if self.finished < len(self.lanes):
+            return
+        winner = race.results()[0]
+        if "error" in winner:
+            self.status_label.config(text="Every algorithm failed.")
+        else:
+            self.status_label.config(text=f"{winner['algorithm']} wins in {winner['seconds']:.3f} s.")
+
+    def stop(self):
+        for _, _, scheduler in self.lanes:
+            scheduler.stop()
+        if self.race is not None:
+            self.race.stop()
+            self.race = None
+
+    def close(self):
+        self.stop()
+        self.window.destroy()
@@ -0,0 +1,261 @@
+"""Incremental Tk canvas renderers.
+
+The canvas items for the bars are created once per array; after that only the
+indices touched by a step are moved with ``coords`` and recolored, so a step
+costs O(changed bars) instead of O(n) item churn.
+
+Arrays much wider than the canvas are drawn by ``ColumnRenderer`` instead:
+each pixel column aggregates a bucket of elements and the whole array is a
+single ``PhotoImage``, so the item count no longer grows with n.
+
+While a parallel sort runs, ``color_segments`` fills each worker's part of the
+array with that worker's color from SEGMENT_COLORS.
+"""
+
+import tkinter as tk
+from bisect import bisect_right
+
+HIGHLIGHT_TAG = "highlight"
+
+# Value labels are only drawn when a bar is at least this many pixels wide.
+MIN_LABEL_WIDTH = 12
+
+# CanvasRenderer switches to pixel columns above this many elements per pixel.
+MAX_BARS_PER_PIXEL = 8
+
+# Fill of the bars each worker of a parallel sort owns, by worker number.
+SEGMENT_COLORS = ("#3498db", "#e67e22", "#9b59b6", "#e74c3c", "#f1c40f", "#34495e", "#fd79a8", "#a0522d")
+
+
+class _Segments:
+    """Owner lookup for a layout of ``(start, worker)`` pairs in increasing start order."""
+
+    def __init__(self, layout=()):
+        self.starts = [start for start, _ in layout]
+        self.colors = [SEGMENT_COLORS[worker % len(SEGMENT_COLORS)] for _, worker in layout]
+
+    def fill(self, i, default):
+        k = bisect_right(self.starts, i) - 1
+        return self.colors[k] if k >= 0 else default
+
+
+class BarRenderer:
+    def __init__(self, canvas, width, height, bar_color="#3498db", highlight_color="#2ecc71",
+                 show_values=True):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.bar_color = bar_color
+        self.highlight_color = highlight_color
+        self.show_values = show_values
+        self.data = []
+        self.bars = []
+        self.labels = []
+        self.highlighted = set()
+        self.segments = _Segments()
+        self.max_value = 1
+        self.bar_width = 0
+
+    def reset(self, data):
+        """Bind ``data`` and create one bar item (plus label) per element."""
+        self.canvas.delete("all")
+        self.data = data
+        self.highlighted = set()
+        self.segments = _Segments()
+        self.bars = []
+        self.labels = []
+        if not data:
+            return
+        self.max_value = max(max(data), 1)
+        self.bar_width = self.width / len(data)
+        with_labels = self.show_values and self.bar_width >= MIN_LABEL_WIDTH
+        for i, value in enumerate(data):
+            x0, y0, x1, y1 = self._bar_coords(i, value)
+            self.bars.append(self.canvas.create_rectangle(x0, y0, x1, y1, fill=self.bar_color))
+            if with_labels:
+                self.labels.append(self.canvas.create_text(
+                    x0 + self.bar_width / 2, y0 - 10, text=str(value), font=("Arial", 8), fill="black"))
+
+    def clear(self):
+        self.reset([])
+
+    def update(self, indices):
+        """Move (and relabel) the bars at ``indices`` to their current values."""
+        data = self.data
+        for i in indices:
+            if data[i] > self.max_value:
+                self.rescale()
+                return
+        coords = self.canvas.coords
+        for i in indices:
+            value = data[i]
+            x0, y0, x1, y1 = self._bar_coords(i, value)
+            coords(self.bars[i], x0, y0, x1, y1)
+            if self.labels:
+                coords(self.labels[i], x0 + self.bar_width / 2, y0 - 10)
+                self.canvas.itemconfigure(self.labels[i], text=str(value))
+
+    def rescale(self):
+        """Recompute every bar height after the maximum value grew."""
+        self.max_value = max(max(self.data), 1)
+        highlighted = self.highlighted
+        self.highlighted = set()
+        self.update(range(len(self.data)))
+        self.highlighted = highlighted
+
+    def highlight(self, indices):
+        """Move the highlight tag from the previous set of bars to ``indices``."""
+        current = set(indices)
+        canvas = self.canvas
+        for i in self.highlighted - current:
+            canvas.dtag(self.bars[i], HIGHLIGHT_TAG)
+            canvas.itemconfigure(self.bars[i], fill=self.segments.fill(i, self.bar_color))
+        for i in current - self.highlighted:
+            canvas.addtag_withtag(HIGHLIGHT_TAG, self.bars[i])
+        self.highlighted = current
+        if current:
+            canvas.itemconfigure(HIGHLIGHT_TAG, fill=self.highlight_color)
+
+    def color_segments(self, layout):
+        """Fill the bars by owner for a layout of ``(start, worker)`` pairs; an empty one clears it."""
+        old, self.segments = self.segments, _Segments(layout)
+        itemconfigure = self.canvas.itemconfigure
+        for i, bar in enumerate(self.bars):
+            fill = self.segments.fill(i, self.bar_color)
+            if i not in self.highlighted and fill != old.fill(i, self.bar_color):
+                itemconfigure(bar, fill=fill)
+
+    def _bar_coords(self, i, value):
+        x0 = i * self.bar_width
+        y0 = self.height - (value / self.max_value) * self.height
+        return x0, y0, x0 + self.bar_width, self.height
+
+
+class ColumnRenderer:
+    """Draws one pixel column per bucket of ``n / width`` elements.
+
+    A column is solid up to the bucket minimum, shaded between minimum and
+    maximum, and marked with a one-pixel tick at the bucket mean.  Only
+    columns whose buckets were touched since the last frame are rebuilt.
+    """
+
+    def __init__(self, canvas, width, height, bar_color="#3498db", highlight_color="#2ecc71",
+                 range_color="#aed6f1", background="white"):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.bar_color = bar_color
+        self.highlight_color = highlight_color
+        self.range_color = range_color
+        self.background = background
+        self.data = []
+        self.image = None
+        self.highlighted = set()
+        self.segments = _Segments()
+        self.max_value = 1
+
+    def reset(self, data):
+        self.canvas.delete("all")
+        self.data = data
+        self.highlighted = set()
+        self.segments = _Segments()
+        self.image = None
+        if not data:
+            return
+        self.columns = min(self.width, len(data))
+        self.max_value = max(max(data), 1)
+        self.image = tk.PhotoImage(master=self.canvas, width=self.columns, height=self.height)
+        self.image.put(self.background, to=(0, 0, self.columns, self.height))
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+        self._draw(range(self.columns))
+
+    def clear(self):
+        self.reset([])
+
+    def update(self, indices):
+        data = self.data
+        for i in indices:
+            if data[i] > self.max_value:
+                self.rescale()
+                return
+        self._draw(self._columns_of(indices))
+
+    def rescale(self):
+        self.max_value = max(max(self.data), 1)
+        self._draw(range(self.columns))
+
+    def highlight(self, indices):
+        current = self._columns_of(indices)
+        changed = current ^ self.highlighted
+        self.highlighted = current
+        self._draw(changed)
+
+    def color_segments(self, layout):
+        self.segments = _Segments(layout)
+        if self.image is not None:
+            self._draw(range(self.columns))
+
+    def _columns_of(self, indices):
+        n = len(self.data)
+        if len(indices) >= n:
+            return set(range(self.columns))
+        columns = self.columns
+        return {i * columns // n for i in indices}
+
+    def _draw(self, columns):
+        data = self.data
+        n = len(data)
+        height = self.height
+        scale = height / self.max_value
+        put = self.image.put
+        for x in columns:
+            bucket = data[x * n // self.columns:(x + 1) * n // self.columns]
+            top = height - int(max(bucket) * scale)
+            floor = height - int(min(bucket) * scale)
+            mean = min(height - int(sum(bucket) / len(bucket) * scale), height - 1)
+            if x in self.highlighted:
+                color = self.highlight_color
+            else:
+                color = self.segments.fill(x * n // self.columns, self.bar_color)
+            put(self.background, to=(x, 0, x + 1, top))
+            if floor > top:
+                put(self.range_color, to=(x, top, x + 1, floor))
+            if floor < height:
+                put(color, to=(x, floor, x + 1, height))
+            put(color, to=(x, mean, x + 1, mean + 1))
+
+
+class CanvasRenderer:
+    """Uses a BarRenderer for small arrays and a ColumnRenderer for huge ones."""
+
+    def __init__(self, canvas, width, height, bar_color="#3498db", highlight_color="#2ecc71",
+                 show_values=True):
+        self.bars = BarRenderer(canvas, width, height, bar_color, highlight_color, show_values)
+        self.columns = ColumnRenderer(canvas, width, height, bar_color, highlight_color,
+                                      background=canvas.cget("background") or "white")
+        self.width = width
+        self.active = self.bars
+
+    @property
+    def data(self):
+        return self.active.data
+
+    def reset(self, data):
+        large = len(data) > self.width * MAX_BARS_PER_PIXEL
+        self.active = self.columns if large else self.bars
+        self.active.reset(data)
+
+    def clear(self):
+        self.active.clear()
+
+    def update(self, indices):
+        self.active.update(indices)
+
+    def rescale(self):
+        self.active.rescale()
+
+    def highlight(self, indices):
+        self.active.highlight(indices)
+
+    def color_segments(self, layout):
+        self.active.color_segments(layout)
@@ -0,0 +1,402 @@
+"""Main-thread frame scheduler for animated sorts.
+
+The algorithm runs in a worker thread (or, through ``play``, any other batch
+source such as a race process) on a private copy of the array and only
+ever talks to the scheduler through a bounded ring buffer of event batches.
+The worker runs ahead until the ring is full and then waits, so memory stays
+capped however long the sort is.  Everything that touches Tk happens in
+``_tick``, which ``root.after`` calls once per frame: it applies as many
+buffered steps as the speed setting (steps per second) and the frame budget
+allow, then renders once.
+
+Each run has a ``RunController``: ``pause``/``resume`` freeze both the
+animation and the worker, ``finish`` lets the worker complete without
+animating and shows the result, and ``stop`` cancels the worker, which
+notices within one batch, or at the next ``engine.poll`` of a phase that
+yields no events.
+"""
+
+import queue
+import threading
+from collections import deque, namedtuple
+from itertools import islice
+from time import perf_counter
+
+from sorting_visualizer import engine, trace
+from sorting_visualizer.instrument import Counters, Probe
+
+# Never carry more than this many seconds of unused step credit into a frame,
+# so a stalled worker does not cause a burst once it catches up.
+MAX_CREDIT_SECONDS = 0.1
+
+# Events a finishing worker runs between checks for cancellation; small
+# enough that a cancel takes effect well within a frame.
+FINISH_CHUNK = 8192
+
+# A source may hand over a full copy of the array instead of a batch of events
+# when it fell too far behind to stream every step, optionally with the
+# instrumentation counters at that point.
+Snapshot = namedtuple("Snapshot", "values counters", defaults=(None,))
+
+# Sent in place of the end of a run when the algorithm raised ``error``.
+Failure = namedtuple("Failure", "error")
+
+
+class CountedBatch(list):
+    """A batch of events plus the instrumentation counters after each one."""
+
+    __slots__ = ("counters",)
+
+    def __init__(self):
+        super().__init__()
+        self.counters = []
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO of batches shared by one producer and one consumer.
+
+    ``put`` blocks while the ring is full (backpressure on the algorithm);
+    ``get_nowait`` never blocks, so the Tk thread cannot stall on it.
+    ``close`` wakes a waiting producer and makes further puts fail.
+    """
+
+    def __init__(self, capacity):
+        self.slots = [None] * capacity
+        self.capacity = capacity
+        self.head = 0
+        self.size = 0
+        self.closed = False
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+
+    def put(self, batch):
+        """Append ``batch``, waiting for room; return False if the ring was closed."""
+        with self.not_full:
+            while self.size == self.capacity and not self.closed:
+                self.not_full.wait()
+            if self.closed:
+                return False
+            self.slots[(self.head + self.size) % self.capacity] = batch
+            self.size += 1
+            return True
+
+    def get_nowait(self):
+        with self.lock:
+            if not self.size:
+                raise queue.Empty
+            batch = self.slots[self.head]
+            self.slots[self.head] = None
+            self.head = (self.head + 1) % self.capacity
+            self.size -= 1
+            self.not_full.notify()
+            return batch
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.not_full.notify_all()
+
+
+class RunController:
+    """Cancel, pause and finish requests shared by a worker and the Tk thread.
+
+    The worker calls ``checkpoint()`` between batches: it blocks while the run
+    is paused and returns False once it was cancelled.  ``poll`` also stops
+    the algorithm inside the phases that yield no events.
+    """
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self.cancelled = False
+        self.finishing = False
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def finish(self):
+        """Run to completion without animating the remaining steps."""
+        self.finishing = True
+        self._running.set()
+
+    def cancel(self):
+        self.cancelled = True
+        self._running.set()
+
+    def checkpoint(self):
+        self._running.wait()
+        return not self.cancelled
+
+    def poll(self):
+        """``engine.polling`` hook: stop a long event-free phase once cancelled."""
+        if self.cancelled:
+            raise engine.Cancelled
+
+
+def _skip(events, limit):
+    """Consume up to ``limit`` of ``events``; return how many there were."""
+    last = deque(enumerate(islice(events, limit), 1), maxlen=1)
+    return last[0][0] if last else 0
+
+
+class FrameScheduler:
+    def __init__(self, root, renderer, speed, frame_ms=16, budget_ms=10, batch_size=512, buffer_batches=64):
+        self.root = root
+        self.renderer = renderer
+        self.speed = speed
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000
+        self.batch_size = batch_size
+        self.buffer_batches = buffer_batches
+        self.running = False
+        self._queue = None
+        self._worker = None
+        self._after_id = None
+        self._ring = None
+        self.control = None
+        self.counters = None
+
+    def start(self, name, data, on_frame=None, on_done=None, trace_path=None, instrument=False, on_error=None):
+        """Animate algorithm ``name`` sorting ``data`` (the list the renderer is bound to).
+
+        If ``trace_path`` is given the worker also records the run there; the
+        trace is complete by the time ``on_done`` is called.  If the algorithm
+        raises, the run stops and ``on_error`` is called with the exception
+        instead of ``on_done``.  With
+        ``instrument`` the worker counts the run's operations with a ``Probe``
+        and ``counters`` follows the animation, step for step.
+        """
+        self.stop()
+        control = RunController()
+        self._ring = RingBuffer(self.buffer_batches)
+        self._worker = threading.Thread(
+            target=self._produce, args=(name, list(data), self._ring, trace_path, instrument, control),
+            daemon=True)
+        self._worker.start()
+        self.play(data, self._ring, on_frame, on_done, control, on_error)
+        self.counters = Counters(0, 0, 0, 0) if instrument else None
+
+    def play(self, data, source, on_frame=None, on_done=None, control=None, on_error=None):
+        """Animate batches from ``source`` onto ``data``.
+
+        ``source.get_nowait()`` must return a list of events, a ``Snapshot``,
+        a ``Failure`` or None once the run is over, and raise ``queue.Empty``
+        while nothing is ready.  ``control`` is the run's ``RunController`` (a new one by
+        default).
+        """
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        if self.control is not None and self.control is not control:
+            self.control.cancel()
+        self.control = control or RunController()
+        self.data = data
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.on_error = on_error
+        self.running = True
+        self._queue = source
+        self._batch = []
+        self._pos = 0
+        self._credit = 0.0
+        self._layout = []
+        self._last = perf_counter()
+        self._after_id = self.root.after(self.frame_ms, self._tick)
+
+    @property
+    def paused(self):
+        return self.running and self.control.paused
+
+    def pause(self):
+        """Freeze the animation and the worker until ``resume``."""
+        if self.running:
+            self.control.pause()
+
+    def resume(self):
+        if self.running:
+            self.control.resume()
+
+    def finish(self):
+        """Skip the rest of the animation and show the result as soon as it is ready."""
+        if self.running:
+            self.control.finish()
+
+    def stop(self):
+        """Stop animating and cancel the worker, which exits at its next batch or poll."""
+        if self.control is not None:
+            self.control.cancel()
+            self.control = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+        self.counters = None
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self.running = False
+
+    def _produce(self, name, data, out, trace_path, instrument, control):
+        probe = Probe(name, data) if instrument else None
+        events = probe.steps() if probe is not None else engine.steps(name, data)
+        if trace_path is not None:
+            # Comparisons change nothing to replay, and would make up most of the file.
+            events = trace.record_events(events, data, trace_path, compares=False)
+        new_batch = CountedBatch if probe is not None else list
+        with engine.polling(control.poll):
+            try:
+                batch = new_batch()
+                for event in events:
+                    batch.append(event)
+                    if probe is not None:
+                        batch.counters.append(probe.count(event))
+                    if len(batch) >= self.batch_size:
+                        if not control.checkpoint() or not out.put(batch):
+                            return
+                        batch = new_batch()
+                        if control.finishing:
+                            break
+                if control.finishing:
+                    # Sort the rest at full speed, then send the final array at once.
+                    tally = probe.tally if probe is not None else _skip
+                    while tally(events, FINISH_CHUNK) == FINISH_CHUNK:
+                        if not control.checkpoint():
+                            return
+                    if probe is not None:
+                        batch = Snapshot(probe.tolist(), tuple(probe.counters()))
+                    else:
+                        batch = Snapshot(list(data))
+            except engine.Cancelled:
+                return
+            except Exception as exc:
+                out.put(Failure(exc))
+                return
+            finally:
+                events.close()
+        if out.put(batch):
+            out.put(None)
+
+    def _apply_snapshot(self, snapshot):
+        self.data[:] = snapshot.values
+        if snapshot.counters is not None:
+            self.counters = Counters._make(snapshot.counters)
+
+    def _tick(self):
+        now = perf_counter()
+        if self.control.paused:
+            self._last = now
+            self._after_id = self.root.after(self.frame_ms, self._tick)
+            return
+        if self.control.finishing:
+            # Apply whatever is buffered as fast as the frame budget allows.
+            self._credit = float(1 << 62)
+        else:
+            rate = max(float(self.speed()), 0.0)
+            self._credit = min(self._credit + (now - self._last) * rate, rate * MAX_CREDIT_SECONDS + 1)
+        self._last = now
+        deadline = now + self.budget
+
+        data = self.data
+        dirty = set()
+        refresh = False
+        recolor = False
+        last = None
+        finished = False
+        failure = None
+        allowance = int(self._credit)
+        applied = 0
+        while applied < allowance:
+            if self._pos >= len(self._batch):
+                try:
+                    batch = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if batch is None or isinstance(batch, Failure):
+                    finished = True
+                    failure = batch
+                    break
+                if isinstance(batch, Snapshot):
+                    self._apply_snapshot(batch)
+                    refresh = True
+                    applied += 1
+                    continue
+                self._batch = batch
+                self._pos = 0
+                continue
+            end = min(self._pos + allowance - applied, len(self._batch), self._pos + 1024)
+            for event in self._batch[self._pos:end]:
+                op, i, j = event
+                if op == engine.SWAP:
+                    data[i], data[j] = data[j], data[i]
+                    dirty.add(i)
+                    dirty.add(j)
+                elif op == engine.WRITE:
+                    data[i] = j
+                    dirty.add(i)
+                elif op == engine.SEGMENT:
+                    if self._layout and i <= self._layout[-1][0]:
+                        self._layout = []
+                    self._layout.append((i, j))
+                    recolor = True
+                    continue
+                if op != engine.DONE:
+                    last = event
+            applied += end - self._pos
+            self._pos = end
+            if self._batch.__class__ is CountedBatch:
+                self.counters = Counters._make(self._batch.counters[end - 1])
+            if perf_counter() > deadline:
+                break
+        self._credit -= applied
+
+        # Look ahead so a run whose last batch was just drained finishes this
+        # frame instead of waiting for credit it does not need.
+        if not finished and self._pos >= len(self._batch):
+            try:
+                batch = self._queue.get_nowait()
+            except queue.Empty:
+                batch = []
+            if batch is None or isinstance(batch, Failure):
+                finished = True
+                failure = batch
+            elif isinstance(batch, Snapshot):
+                self._apply_snapshot(batch)
+                refresh = True
+            else:
+                self._batch = batch
+                self._pos = 0
+
+        if recolor:
+            self.renderer.color_segments(self._layout)
+        if refresh:
+            self.renderer.update(range(len(data)))
+        elif dirty:
+            self.renderer.update(dirty)
+        if last is not None:
+            op, i, j = last
+            self.renderer.highlight((i, j) if op in (engine.COMPARE, engine.SWAP) else (i,))
+        if last is not None and self.on_frame is not None:
+            self.on_frame(last)
+
+        if finished:
+            self._after_id = None
+            self.running = False
+            if self._layout:
+                self._layout = []
+                self.renderer.color_segments(())
+            if failure is not None:
+                self.renderer.highlight(())
+                if self.on_error is not None:
+                    self.on_error(failure.error)
+                return
+            self.renderer.highlight(range(len(data)))
+            if self.on_done is not None:
+                self.on_done()
+        else:
+            self._after_id = self.root.after(self.frame_ms, self._tick)
@@ -0,0 +1,414 @@
+"""Local HTTP/WebSocket server that broadcasts one sort to many viewers.
+
+The step engine runs once, inside the event loop, a few milliseconds per
+frame.  Every frame's changes (the indices touched since the previous frame
+and their new values) are encoded once and shared by every subscriber that is
+keeping up.  A subscriber whose socket is still draining simply misses
+frames: when it is ready again it gets the changes of all the frames it
+missed merged into one delta, or a full snapshot if it fell far behind, so a
+slow viewer never holds up the sort or the other viewers.
+
+    python -m sorting_visualizer serve quick --size 500 --port 8765
+
+``GET /`` serves a browser viewer and ``/ws`` the WebSocket stream;
+``python -m sorting_visualizer watch`` is a terminal subscriber.
+
+Stream messages are a JSON text message ``{"type": "info", ...}`` whenever a
+run starts, then binary messages with a 16-byte header of little-endian
+uint32s ``kind, frame, count, 0``.  A SNAPSHOT holds ``count`` float64 values;
+a DELTA holds ``count`` uint32 indices, zero padding to a multiple of 8 bytes,
+then ``count`` float64 values; DONE has no payload.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from array import array
+from collections import deque
+from itertools import islice
+from time import perf_counter
+
+from sorting_visualizer import engine
+
+SNAPSHOT, DELTA, DONE = range(3)
+HEADER = struct.Struct("<IIII")
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+WS_VERSION = "13"
+WS_TEXT, WS_BINARY, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+# Frames kept for subscribers that are behind; older ones get a snapshot.
+HISTORY = 64
+
+# Milliseconds of each frame the engine may run for.
+STEP_BUDGET_MS = 8
+
+# Largest client frame accepted; viewers only ever send control frames.
+MAX_CLIENT_FRAME = 1 << 16
+
+
+def encode_snapshot(frame, values):
+    return HEADER.pack(SNAPSHOT, frame, len(values), 0) + array("d", values).tobytes()
+
+
+def encode_delta(frame, changes):
+    count = len(changes)
+    indices = array("I", changes.keys()).tobytes()
+    padding = b"\0" * (-len(indices) % 8)
+    return HEADER.pack(DELTA, frame, count, 0) + indices + padding + array("d", changes.values()).tobytes()
+
+
+def ws_frame(opcode, payload):
+    """Encode an unmasked (server to client) WebSocket frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def ws_read(reader, limit=None):
+    """Read one WebSocket frame; return ``(opcode, payload)``, unmasking if needed."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    if limit is not None and length > limit:
+        raise ConnectionError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def ws_accept(key):
+    return base64.b64encode(hashlib.sha1(key.encode() + WS_GUID).digest()).decode()
+
+
+def ws_handshake_error(headers):
+    """Check an upgrade request's headers (RFC 6455 section 4.2.1); return ``(status, reason)`` or None."""
+    def tokens(name):
+        return {token.strip().lower() for token in headers.get(name, "").split(",")}
+
+    if "websocket" not in tokens("upgrade") or "upgrade" not in tokens("connection"):
+        return "400 Bad Request", "not a WebSocket upgrade"
+    if headers.get("sec-websocket-version") != WS_VERSION:
+        return "426 Upgrade Required", f"only WebSocket version {WS_VERSION} is supported"
+    try:
+        key = base64.b64decode(headers.get("sec-websocket-key", ""), validate=True)
+    except ValueError:
+        key = b""
+    if len(key) != 16:
+        return "400 Bad Request", "missing or malformed Sec-WebSocket-Key"
+    return None
+
+
+class Broadcast:
+    """One run of the step engine, sliced into frames for any number of subscribers."""
+
+    def __init__(self, name, values, speed, fps):
+        self.speed = speed
+        self.fps = fps
+        self.frame = 0
+        self.history = deque(maxlen=HISTORY)
+        self.generation = 0
+        self.clients = set()
+        self._changed = asyncio.Event()
+        self._snapshot = None
+        self.restart(name, values)
+
+    def restart(self, name, values):
+        """Start sorting ``values`` with ``name``; every subscriber gets a fresh snapshot."""
+        self.name = name
+        self.values = list(values)
+        self.events = engine.steps(name, list(values))
+        self.done = False
+        self.generation += 1
+        self.history.clear()
+        self._credit = 0.0
+        self._publish({})
+
+    def info(self):
+        return json.dumps({
+            "type": "info", "algorithm": self.name, "n": len(self.values),
+            "max": max(self.values, default=1), "fps": self.fps, "speed": self.speed,
+        })
+
+    def advance(self, elapsed):
+        """Run the engine for one frame's worth of steps and publish the changes."""
+        if self.done:
+            return
+        self._credit = min(self._credit + elapsed * self.speed, self.speed)
+        allowance = int(self._credit)
+        deadline = perf_counter() + STEP_BUDGET_MS / 1000
+        values = self.values
+        dirty = set()
+        applied = 0
+        while applied < allowance and perf_counter() < deadline:
+            chunk = list(islice(self.events, min(allowance - applied, 256)))
+            if not chunk:
+                self.done = True
+                break
+            for op, i, j in chunk:
+                if op == engine.SWAP:
+                    values[i], values[j] = values[j], values[i]
+                    dirty.add(i)
+                    dirty.add(j)
+                elif op == engine.WRITE:
+                    values[i] = j
+                    dirty.add(i)
+            applied += len(chunk)
+        self._credit -= applied
+        if dirty or self.done:
+            self._publish({i: values[i] for i in dirty})
+
+    def _publish(self, changes):
+        self.frame += 1
+        self.history.append((self.frame, changes, None))
+        self._snapshot = None
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def message_since(self, frame, generation):
+        """Return the bytes that bring a subscriber at ``frame`` up to date."""
+        if generation != self.generation or not self.history or frame < self.history[0][0] - 1:
+            return self.snapshot()
+        missed = [entry for entry in self.history if entry[0] > frame]
+        if len(missed) == 1:
+            number, changes, encoded = missed[0]
+            if encoded is None:
+                # Encoded on first use and shared by every subscriber after that.
+                encoded = encode_delta(number, changes)
+                self.history[-1] = (number, changes, encoded)
+            return encoded
+        merged = {}
+        for _, changes, _ in missed:
+            merged.update(changes)
+            if len(merged) > len(self.values) // 2:
+                return self.snapshot()
+        return encode_delta(self.frame, merged)
+
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = encode_snapshot(self.frame, self.values)
+        return self._snapshot
+
+    async def wait(self, frame, generation):
+        """Wait until there is something newer than ``frame`` of ``generation``."""
+        while frame == self.frame and generation == self.generation:
+            await self._changed.wait()
+
+    async def run(self, repeat=None, make_values=None):
+        """Advance the sort once per frame; with ``repeat``, restart after that many seconds."""
+        interval = 1 / self.fps
+        last = perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = perf_counter()
+            self.advance(now - last)
+            last = now
+            if self.done and repeat is not None:
+                await asyncio.sleep(repeat)
+                self.restart(self.name, make_values())
+                last = perf_counter()
+
+
+class Subscriber:
+    """A connected WebSocket viewer; sends updates as fast as its socket drains."""
+
+    def __init__(self, broadcast, reader, writer):
+        self.broadcast = broadcast
+        self.reader = reader
+        self.writer = writer
+
+    async def serve(self):
+        listener = asyncio.ensure_future(self._listen())
+        try:
+            await self._send_updates(listener)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            listener.cancel()
+            self.writer.close()
+
+    async def _send_updates(self, listener):
+        broadcast = self.broadcast
+        frame = generation = None
+        sent_done = False
+        while not listener.done():
+            if generation != broadcast.generation:
+                self.writer.write(ws_frame(WS_TEXT, broadcast.info().encode()))
+                sent_done = False
+            message = broadcast.message_since(frame if frame is not None else -1, generation)
+            frame, generation = broadcast.frame, broadcast.generation
+            self.writer.write(ws_frame(WS_BINARY, message))
+            if broadcast.done and not sent_done:
+                self.writer.write(ws_frame(WS_BINARY, HEADER.pack(DONE, frame, 0, 0)))
+                sent_done = True
+            # Frames published while this drains are merged into the next message.
+            await self.writer.drain()
+            waiter = asyncio.ensure_future(broadcast.wait(frame, generation))
+            await asyncio.wait((waiter, listener), return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+
+    async def _listen(self):
+        """Answer pings and notice the viewer leaving."""
+        while True:
+            opcode, payload = await ws_read(self.reader, MAX_CLIENT_FRAME)
+            if opcode == WS_CLOSE:
+                self.writer.write(ws_frame(WS_CLOSE, payload[:2]))
+                return
+            if opcode == WS_PING:
+                self.writer.write(ws_frame(WS_PONG, payload))
+
+
+async def handle(broadcast, reader, writer):
+    """Serve one HTTP connection: the viewer page or a WebSocket upgrade."""
+    try:
+        request = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        writer.close()
+        return
+    lines = request.decode("latin-1").split("\r\n")
+    method, path = (lines[0].split() + ["", ""])[:2]
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    extra = ""
+    if method == "GET" and path == "/ws":
+        error = ws_handshake_error(headers)
+        if error is None:
+            writer.write((
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {ws_accept(headers['sec-websocket-key'])}\r\n\r\n").encode())
+            broadcast.clients.add(writer)
+            try:
+                await Subscriber(broadcast, reader, writer).serve()
+            finally:
+                broadcast.clients.discard(writer)
+            return
+        status, reason = error
+        body = f"{reason}\n".encode()
+        if status.startswith("426"):
+            extra = f"Sec-WebSocket-Version: {WS_VERSION}\r\n"
+    elif method == "GET" and path == "/":
+        body, status = VIEWER.encode(), "200 OK"
+    else:
+        body, status = b"not found\n", "404 Not Found"
+    content_type = "text/html; charset=utf-8" if status == "200 OK" else "text/plain"
+    writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                 f"{extra}Connection: close\r\n\r\n".encode() + body)
+    try:
+        await writer.drain()
+    except ConnectionError:
+        pass
+    writer.close()
+
+
+async def serve(broadcast, host="127.0.0.1", port=8765, repeat=None, make_values=None, ready=None):
+    """Run ``broadcast`` and the HTTP server until cancelled.
+
+    ``ready`` (a callable) receives the listening server once it is bound.
+    """
+    server = await asyncio.start_server(lambda r, w: handle(broadcast, r, w), host, port, limit=1 << 16)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await asyncio.gather(server.serve_forever(), broadcast.run(repeat, make_values))
+
+
+VIEWER = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Sorting Visualizer</title>
+<style>body{font-family:Arial,sans-serif;background:#f0f0f0;text-align:center}canvas{background:#fff}</style>
+</head><body>
+<h2 id="title">Connecting...</h2><canvas id="bars" width="800" height="400"></canvas><p id="status"></p>
+<script>
+const canvas = document.getElementById("bars"), ctx = canvas.getContext("2d");
+let values = new Float64Array(0), touched = new Set(), max = 1, done = false, dirty = true;
+const ws = new WebSocket(`ws://${location.host}/ws`);
+ws.binaryType = "arraybuffer";
+ws.onmessage = (msg) => {
+  if (typeof msg.data === "string") {
+    const info = JSON.parse(msg.data);
+    document.getElementById("title").textContent = `${info.algorithm} on ${info.n} elements`;
+    max = Math.max(info.max, 1); done = false; return;
+  }
+  const [kind, frame, count] = new Uint32Array(msg.data, 0, 3);
+  touched = new Set();
+  if (kind === 0) { values = new Float64Array(msg.data.slice(16)); }
+  else if (kind === 1) {
+    const indices = new Uint32Array(msg.data, 16, count);
+    const updates = new Float64Array(msg.data, 16 + Math.ceil(count * 4 / 8) * 8, count);
+    for (let k = 0; k < count; k++) { values[indices[k]] = updates[k]; touched.add(indices[k]); }
+  } else { done = true; }
+  document.getElementById("status").textContent = done ? "Sorted." : `frame ${frame}`;
+  dirty = true;
+};
+ws.onclose = () => { document.getElementById("status").textContent = "Disconnected."; };
+function draw() {
+  if (dirty) {
+    dirty = false;
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    const width = canvas.width / Math.max(values.length, 1);
+    for (let i = 0; i < values.length; i++) {
+      const h = values[i] / max * canvas.height;
+      ctx.fillStyle = done || touched.has(i) ? "#2ecc71" : "#3498db";
+      ctx.fillRect(i * width, canvas.height - h, Math.max(width - (width > 3), 1), h);
+    }
+  }
+  requestAnimationFrame(draw);
+}
+requestAnimationFrame(draw);
+</script></body></html>
+"""
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+    from sorting_visualizer.generators import DISTRIBUTIONS, generate
+
+    parser = argparse.ArgumentParser(description="Broadcast a sort to browsers and terminal viewers.")
+    parser.add_argument("algorithm")
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--distribution", choices=sorted(DISTRIBUTIONS), default="uniform")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--speed", type=float, default=500, help="steps per second")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repeat", type=float, metavar="SECONDS",
+                        help="sort a new array this many seconds after each run finishes")
+    args = parser.parse_args(argv)
+
+    name = resolve_algorithms([args.algorithm])[0]
+
+    def make_values():
+        return generate(args.size, args.distribution, seed=args.seed)
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"serving {name} on http://{host}:{port}/ (stream at ws://{host}:{port}/ws)")
+
+    async def run():
+        await serve(Broadcast(name, make_values(), args.speed, args.fps), args.host, args.port,
+                    args.repeat, make_values, ready)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Check the stability each algorithm declares.
+
+Every algorithm is run on inputs with few distinct values whose elements are
+tagged with their input position.  A sort is stable on an input when equal
+values come out in increasing tag order; an algorithm registered as stable
+must be stable on every input, while one registered as unstable is confirmed
+once any input shows it.  The key and reverse path of ``engine.run`` is also
+compared with ``sorted`` on records, for every algorithm; stable algorithms
+put the records in order themselves there, so this checks them again:
+
+    python -m sorting_visualizer stability
+"""
+
+import argparse
+import random
+import sys
+from collections import namedtuple
+
+from sorting_visualizer import engine
+
+Verdict = namedtuple("Verdict", "name declared observed failures")
+
+DEFAULT_SIZES = (2, 3, 5, 17, 64, 257, 600)
+DEFAULT_SEEDS = 5
+
+# Distinct values per input: a handful so equal values are common.
+DISTINCT = (2, 3, 8)
+
+# The keyed check also sorts one input this large with integer keys over
+# LARGE_GROUPS values, so any widening of the key range on the way to
+# counting and radix sort shows up.  Algorithms ``bench`` caps below it skip it.
+LARGE_N = 20000
+LARGE_GROUPS = 1001
+
+
+class _Tagged(int):
+    """An int that remembers its input position; compares as its value."""
+
+    def __new__(cls, value, tag):
+        self = super().__new__(cls, value)
+        self.tag = tag
+        return self
+
+
+def tagged_inputs(sizes=DEFAULT_SIZES, seeds=DEFAULT_SEEDS):
+    """Yield lists of ``_Tagged`` values with many ties, including runs and reversed runs."""
+    for n in sizes:
+        for seed in range(seeds):
+            rng = random.Random(seed * 7919 + n)
+            distinct = DISTINCT[seed % len(DISTINCT)]
+            values = [rng.randrange(distinct) for _ in range(n)]
+            if seed % 3 == 1:
+                values.sort()
+            elif seed % 3 == 2:
+                values.sort(reverse=True)
+            yield [_Tagged(value, i) for i, value in enumerate(values)]
+
+
+def is_stable_result(data):
+    """Whether the sorted ``_Tagged`` values keep equal values in input order."""
+    return all(x < y or x.tag < y.tag for x, y in zip(data, data[1:]))
+
+
+def check(name, inputs):
+    """Run ``name`` on every input; return a ``Verdict``."""
+    failures = []
+    observed = True
+    for values in inputs:
+        data = list(values)
+        engine.run(name, data)
+        if sorted(data) != sorted(values) or any(x > y for x, y in zip(data, data[1:])):
+            failures.append(f"did not sort {len(values)} values")
+        elif not is_stable_result(data):
+            observed = False
+            if engine.INFO[name].stable:
+                failures.append(f"reordered equal values of a {len(values)}-value input")
+    return Verdict(name, engine.INFO[name].stable, observed, failures)
+
+
+def check_keyed(name, seeds=DEFAULT_SEEDS, n=200):
+    """Compare ``engine.run`` with ``key`` and ``reverse`` against ``sorted`` on records.
+
+    Returns a list of failure messages.  Algorithms that only sort integers
+    must reject other keys with ValueError instead.
+    """
+    from sorting_visualizer.bench import SIZE_CAPS
+
+    failures = []
+    keys = [("group", lambda record: record["group"]), ("negated", lambda record: -record["group"] * 1000)]
+    if engine.INFO[name].integers:
+        try:
+            engine.run(name, [{"weight": 0.5}, {"weight": 0.25}], key=lambda record: record["weight"])
+        except ValueError:
+            pass
+        else:
+            failures.append("sorted float keys although it sorts integers only")
+    else:
+        keys += [("name", lambda record: record["name"]), ("tuple", lambda record: (record["name"], record["weight"])),
+                 ("mixed", lambda record: (1, 1.0, True)[record["group"] % 3])]
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        records = [{"id": i, "group": rng.randrange(5), "name": rng.choice("abc") * rng.randrange(1, 3),
+                    "weight": rng.random()} for i in range(n)]
+        for label, key in keys:
+            for reverse in (False, True):
+                data = engine.run(name, list(records), key=key, reverse=reverse)
+                if data != sorted(records, key=key, reverse=reverse):
+                    failures.append(f"key={label} reverse={reverse} differs from sorted()")
+
+    if LARGE_N > SIZE_CAPS.get(name, LARGE_N):
+        return failures
+    rng = random.Random(seeds)
+    records = [{"id": i, "group": rng.randrange(LARGE_GROUPS)} for i in range(LARGE_N)]
+    for label, key in keys[:2]:
+        for reverse in (False, True):
+            try:
+                data = engine.run(name, list(records), key=key, reverse=reverse)
+            except ValueError as exc:
+                failures.append(f"key={label} reverse={reverse} on {LARGE_N:,} records: {exc}")
+                continue
+            if data != sorted(records, key=key, reverse=reverse):
+                failures.append(f"key={label} reverse={reverse} on {LARGE_N:,} records differs from sorted()")
+    return failures
+
+
+def main(argv=None):
+    from sorting_visualizer.bench import resolve_algorithms
+
+    parser = argparse.ArgumentParser(description="Verify the stability each algorithm declares.")
+    parser.add_argument("algorithms", nargs="*", help="algorithms to check (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS, help="inputs per size")
+    args = parser.parse_args(argv)
+    inputs = list(tagged_inputs(args.sizes, args.seeds))
+
+    failed = 0
+    for name in resolve_algorithms(args.algorithms):
+        verdict = check(name, inputs)
+        failures = verdict.failures + check_keyed(name, args.seeds)
+        if verdict.declared:
+            status = "stable"
+        elif not verdict.observed:
+            status = "unstable (confirmed)"
+        else:
+            status = "unstable (no reordering found)"
+        print(f"{name:<20} {status:<31} {'FAIL' if failures else 'ok'}")
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        failed += bool(failures)
+    if failed:
+        raise SystemExit(f"{failed} algorithms failed")
+
+
+if __name__ == "__main__":
+    main()
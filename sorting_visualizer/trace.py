@@ -0,0 +1,227 @@
+"""Compact binary sort traces with memory-mapped replay.
+
+A trace file is a fixed header followed by fixed-width step records, with a
+full-array keyframe in front of every ``interval`` records:
+
+    [header][keyframe 0][records 0..K-1][keyframe 1][records K..2K-1]...
+
+Keyframe ``j`` holds the array state before step ``j * K`` as little-endian
+int32 values (int64 if the input does not fit in 32 bits), so the offset of
+any record or keyframe is computed directly and the state after any step ``k``
+is rebuilt from the nearest keyframe by replaying at most ``K - 1`` records.
+Each record is the engine event ``(op, a, b)`` itself, with ``b`` as wide as
+the values because a WRITE's ``b`` is the value written: 9 bytes per step for
+int32 values, 13 for int64.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from sorting_visualizer import engine
+
+MAGIC = b"SVTR"
+VERSION = 2
+HEADER = struct.Struct("<4sHcxQQQ")  # magic, version, value typecode, n, interval, steps
+RECORDS = {"i": struct.Struct("<BIi"), "q": struct.Struct("<BIq")}
+
+# Default keyframe spacing: at least this many steps, and never closer than
+# n steps so keyframes add at most one value per step on large arrays.
+MIN_INTERVAL = 4096
+
+
+def value_typecode(values):
+    """Return the typecode of the records that hold ``values``.
+
+    Raises ValueError for values a trace cannot hold: anything but integers
+    that fit in 64 bits.
+    """
+    if not all(value.__class__ is int for value in values):
+        raise ValueError("traces hold integers only")
+    if values and (min(values) < -2 ** 63 or max(values) >= 2 ** 63):
+        raise ValueError("traces hold integers of at most 64 bits")
+    if values and (min(values) < -2 ** 31 or max(values) >= 2 ** 31):
+        return "q"
+    return "i"
+
+
+def _little_endian(a):
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+class TraceWriter:
+    """Stream step records for a sort of ``data`` (the list being sorted) to ``path``.
+
+    Keyframes come from a copy of ``data`` that replays the written events,
+    because merge and radix sort keep part of the logical array in a scratch
+    buffer while they run.
+    """
+
+    def __init__(self, path, data, interval=None, compares=True):
+        self.interval = interval or max(MIN_INTERVAL, len(data))
+        self.compares = compares
+        self.typecode = value_typecode(data)
+        self.data = array(self.typecode, data)
+        self.pack = RECORDS[self.typecode].pack
+        self.steps = 0
+        self.file = open(path, "wb")
+        self.file.write(self._header())
+        self._keyframe()
+
+    def write(self, op, a, b):
+        if op == engine.COMPARE and not self.compares:
+            return
+        self.file.write(self.pack(op, a, b))
+        if op == engine.WRITE:
+            self.data[a] = b
+        elif op == engine.SWAP:
+            data = self.data
+            data[a], data[b] = data[b], data[a]
+        self.steps += 1
+        if self.steps % self.interval == 0:
+            self._keyframe()
+
+    def close(self):
+        self.file.seek(0)
+        self.file.write(self._header())
+        self.file.close()
+
+    def _header(self):
+        return HEADER.pack(MAGIC, VERSION, self.typecode.encode(), len(self.data), self.interval, self.steps)
+
+    def _keyframe(self):
+        self.file.write(_little_endian(array(self.typecode, self.data)).tobytes())
+
+
+def record_events(events, data, path, interval=None, compares=True):
+    """Pass ``events`` (sorting ``data`` in place) through while recording them."""
+    writer = TraceWriter(path, data, interval, compares)
+    try:
+        for event in events:
+            writer.write(*event)
+            yield event
+    finally:
+        writer.close()
+
+
+def record(name, data, path, interval=None, compares=True):
+    """Sort ``data`` with algorithm ``name`` at full speed, recording a trace."""
+    writer = TraceWriter(path, data, interval, compares)
+    write = writer.write
+    try:
+        for op, a, b in engine.steps(name, data):
+            write(op, a, b)
+    finally:
+        writer.close()
+    return data
+
+
+class Trace:
+    """Read-only, memory-mapped view of a trace file.
+
+    ``Trace.from_bytes`` wraps a trace already in memory the same way.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._open(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
+
+    @classmethod
+    def from_bytes(cls, data):
+        trace = cls.__new__(cls)
+        trace._open(memoryview(data), "buffer")
+        return trace
+
+    def _open(self, mm, name):
+        self.mm = mm
+        magic, version, typecode, self.n, self.interval, self.steps = HEADER.unpack_from(self.mm, 0)
+        self.typecode = typecode.decode("latin-1")
+        if magic != MAGIC or version != VERSION or self.typecode not in RECORDS:
+            self.close()
+            raise ValueError(f"{name} is not a version {VERSION} sort trace")
+        self.record = RECORDS[self.typecode]
+        self.keyframe_size = array(self.typecode).itemsize * self.n
+        self.block_size = self.keyframe_size + self.interval * self.record.size
+
+    def __len__(self):
+        return self.steps
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self.mm, memoryview):
+            self.mm.release()
+        else:
+            self.mm.close()
+
+    def step(self, k):
+        """Return record ``k`` as an engine event ``(op, a, b)``."""
+        if not 0 <= k < self.steps:
+            raise IndexError("trace step out of range")
+        block, offset = divmod(k, self.interval)
+        return self.record.unpack_from(self.mm, self._record_offset(block, offset))
+
+    def events(self, start=0, stop=None):
+        """Yield the events of steps ``start..stop-1``, unpacking a block at a time."""
+        stop = self.steps if stop is None else min(stop, self.steps)
+        size = self.record.size
+        while start < stop:
+            block, offset = divmod(start, self.interval)
+            count = min(stop - start, self.interval - offset)
+            begin = self._record_offset(block, offset)
+            yield from self.record.iter_unpack(self.mm[begin:begin + count * size])
+            start += count
+
+    def keyframe(self, j):
+        offset = HEADER.size + j * self.block_size
+        a = array(self.typecode)
+        a.frombytes(self.mm[offset:offset + self.keyframe_size])
+        return _little_endian(a)
+
+    def _record_offset(self, block, offset):
+        return HEADER.size + block * self.block_size + self.keyframe_size + offset * self.record.size
+
+    def state(self, k):
+        """Return the array after the first ``k`` steps."""
+        k = max(0, min(k, self.steps))
+        j = k // self.interval
+        a = self.keyframe(j)
+        for op, i, b in self.events(j * self.interval, k):
+            engine.apply_step(a, op, i, b)
+        return a
+
+
+class TraceCursor:
+    """Scrub position over a trace, reporting which indices each move touched."""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.position = 0
+        self.data = trace.state(0)
+
+    def seek(self, k):
+        """Move to step ``k``; return the changed indices, or None if all may have."""
+        k = max(0, min(k, len(self.trace)))
+        if self.position <= k < self.position + self.trace.interval:
+            dirty = set()
+            data = self.data
+            for op, i, j in self.trace.events(self.position, k):
+                if op == engine.SWAP:
+                    data[i], data[j] = data[j], data[i]
+                    dirty.add(i)
+                    dirty.add(j)
+                elif op == engine.WRITE:
+                    data[i] = j
+                    dirty.add(i)
+        else:
+            self.data[:] = self.trace.state(k)
+            dirty = None
+        self.position = k
+        return dirty
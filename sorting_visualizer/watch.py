@@ -0,0 +1,136 @@
+"""Terminal subscriber for ``python -m sorting_visualizer serve``.
+
+Connects to the WebSocket stream, keeps a copy of the array up to date from
+its snapshots and deltas, and prints one status line per message (or a final
+summary with ``--quiet``):
+
+    python -m sorting_visualizer watch ws://127.0.0.1:8765/ws
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import struct
+from array import array
+from urllib.parse import urlsplit
+
+from sorting_visualizer.server import (
+    DELTA, DONE, HEADER, SNAPSHOT, WS_BINARY, WS_CLOSE, WS_PING, WS_PONG, WS_TEXT, ws_accept, ws_read)
+
+
+def _masked(opcode, payload):
+    """Encode a masked (client to server) WebSocket frame; ``payload`` is short."""
+    mask = os.urandom(4)
+    return struct.pack("!BB", 0x80 | opcode, 0x80 | len(payload)) + mask + bytes(
+        b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+class Viewer:
+    """Mirror of the broadcast array, updated from stream messages."""
+
+    def __init__(self):
+        self.info = {}
+        self.values = array("d")
+        self.frame = 0
+        self.messages = 0
+        self.changed = 0
+        self.done = False
+
+    def apply(self, opcode, payload):
+        self.messages += 1
+        if opcode == WS_TEXT:
+            self.info = json.loads(payload)
+            self.done = False
+            return
+        kind, self.frame, count, _ = HEADER.unpack_from(payload)
+        if kind == SNAPSHOT:
+            self.values = array("d")
+            self.values.frombytes(payload[HEADER.size:])
+            self.changed = count
+        elif kind == DELTA:
+            indices = array("I")
+            offset = HEADER.size + count * 4
+            indices.frombytes(payload[HEADER.size:offset])
+            updates = array("d")
+            offset += -offset % 8
+            updates.frombytes(payload[offset:offset + count * 8])
+            for i, value in zip(indices, updates):
+                self.values[i] = value
+            self.changed = count
+        elif kind == DONE:
+            self.done = True
+
+    def in_order(self):
+        """Fraction of adjacent pairs already in order."""
+        values = self.values
+        if len(values) < 2:
+            return 1.0
+        return sum(a <= b for a, b in zip(values, values[1:])) / (len(values) - 1)
+
+
+async def connect(url):
+    """Open a WebSocket connection to ``url``; return ``(reader, writer)``."""
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((
+        f"GET {parts.path or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\nUpgrade: websocket\r\n"
+        f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    response = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    if " 101 " not in response.split("\r\n")[0] or ws_accept(key) not in response:
+        writer.close()
+        raise ConnectionError(f"{url} did not accept the WebSocket upgrade")
+    return reader, writer
+
+
+async def watch(url, on_message=None, until_done=True):
+    """Follow the stream at ``url``; return the ``Viewer`` once the run is done."""
+    reader, writer = await connect(url)
+    viewer = Viewer()
+    try:
+        while True:
+            opcode, payload = await ws_read(reader)
+            if opcode == WS_CLOSE:
+                break
+            if opcode == WS_PING:
+                writer.write(_masked(WS_PONG, payload))
+                continue
+            if opcode in (WS_TEXT, WS_BINARY):
+                viewer.apply(opcode, payload)
+                if on_message is not None:
+                    on_message(viewer)
+                if viewer.done and until_done:
+                    writer.write(_masked(WS_CLOSE, struct.pack("!H", 1000)))
+                    break
+    finally:
+        writer.close()
+    return viewer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Follow a broadcast sort in the terminal.")
+    parser.add_argument("url", nargs="?", default="ws://127.0.0.1:8765/ws")
+    parser.add_argument("--quiet", action="store_true", help="only print a summary at the end")
+    parser.add_argument("--follow", action="store_true", help="keep watching the runs that follow")
+    args = parser.parse_args(argv)
+
+    def status(viewer):
+        if viewer.info and viewer.values:
+            state = "done" if viewer.done else f"{viewer.changed} changed"
+            print(f"{viewer.info['algorithm']}: frame {viewer.frame}, {state}, "
+                  f"{viewer.in_order():.1%} of neighbours in order")
+
+    try:
+        viewer = asyncio.run(watch(args.url, None if args.quiet else status, not args.follow))
+    except (OSError, ConnectionError, asyncio.IncompleteReadError) as exc:
+        raise SystemExit(f"cannot follow {args.url}: {exc}")
+    except KeyboardInterrupt:
+        return
+    print(f"{viewer.messages} messages, last frame {viewer.frame}, "
+          f"{'sorted' if viewer.in_order() == 1.0 else 'not sorted'}")
+
+
+if __name__ == "__main__":
+    main()
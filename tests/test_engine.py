@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from sorting_visualizer import engine
+
+ALGORITHMS = list(engine.ALGORITHMS)
+
+INPUTS = {
+    "empty": [],
+    "single": [7],
+    "sorted": list(range(50)),
+    "reversed": list(range(50, 0, -1)),
+    "duplicates": [3, 1, 2] * 20,
+    "negative": [random.Random(1).randrange(-500, 500) for _ in range(300)],
+}
+
+
+@pytest.mark.parametrize("values", INPUTS.values(), ids=INPUTS.keys())
+@pytest.mark.parametrize("name", ALGORITHMS)
+def test_sorts(name, values):
+    data = list(values)
+    assert engine.run(name, data) == sorted(values)
+
+
+@pytest.mark.parametrize("name", ALGORITHMS)
+def test_replaying_the_events_reproduces_the_output(name):
+    values = [random.Random(2).randrange(100) for _ in range(200)]
+    data = list(values)
+    replay = list(values)
+    for op, i, j in engine.steps(name, data):
+        engine.apply_step(replay, op, i, j)
+    assert replay == data == sorted(values)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("name", ALGORITHMS)
+def test_keyed_sort_is_stable_like_sorted(name, reverse):
+    rng = random.Random(3)
+    records = [(rng.randrange(10), i) for i in range(200)]
+    data = list(records)
+    engine.run(name, data, key=lambda record: record[0], reverse=reverse)
+    expected = sorted(records, key=lambda record: record[0], reverse=reverse)
+    if engine.INFO[name].stable:
+        assert data == expected
+    else:
+        assert [record[0] for record in data] == [record[0] for record in expected]
+
+
+def test_decorate_keeps_equal_but_distinct_keys_in_input_order():
+    records = [1.0, True, 1, 0.5]
+    decorated, undecorate = engine.decorate(records, stable=True)
+    decorated.sort()
+    assert undecorate(decorated) == sorted(records)
+    assert [type(r) for r in undecorate(decorated)] == [float, float, bool, int]
+
+
+def test_decorate_rejects_other_keys_for_integer_algorithms():
+    with pytest.raises(ValueError):
+        engine.run("Counting Sort", [2.5, 1.0], key=float)
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from sorting_visualizer import generators
+
+
+@pytest.mark.parametrize("distribution", generators.DISTRIBUTIONS)
+def test_values_stay_in_range(distribution):
+    values = generators.generate(500, distribution, seed=5, low=10, high=90)
+    assert len(values) == 500
+    assert all(10 <= v <= 90 for v in values)
+
+
+def test_same_seed_same_values():
+    assert generators.generate(300, "uniform", seed=6) == generators.generate(300, "uniform", seed=6)
+
+
+@pytest.mark.parametrize("n", range(1, 40))
+def test_quicksort_killer_is_a_permutation(n):
+    values = generators.quicksort_killer(n, random.Random(0), 1, n)
+    assert sorted(values) == list(range(1, n + 1))
+
+
+@pytest.mark.parametrize("n", range(1, 40))
+def test_vectorized_quicksort_killer_matches(n):
+    np = generators.load_numpy()
+    if np is None:
+        pytest.skip("NumPy is not installed")
+    vectorized = generators.quicksort_killer(n, np.random.default_rng(0), 1, n)
+    assert list(vectorized) == generators.quicksort_killer(n, random.Random(0), 1, n)
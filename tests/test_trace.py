@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from sorting_visualizer import cache, engine, trace
+
+
+@pytest.mark.parametrize("name", ["Quick Sort", "Merge Sort", "Radix Sort"])
+def test_trace_round_trip(tmp_path, name):
+    values = [random.Random(4).randrange(-1000, 1000) for _ in range(500)]
+    path = tmp_path / "sort.svtr"
+    data = trace.record(name, list(values), path, interval=64)
+    events = list(engine.steps(name, list(values)))
+    with trace.Trace(path) as recorded:
+        assert len(recorded) == len(events)
+        assert list(recorded.events()) == events
+        assert list(recorded.state(0)) == values
+        assert list(recorded.state(len(recorded))) == data == sorted(values)
+        middle = list(values)
+        for op, i, j in events[:len(events) // 2]:
+            engine.apply_step(middle, op, i, j)
+        assert list(recorded.state(len(events) // 2)) == middle
+
+
+def test_trace_keeps_64_bit_values(tmp_path):
+    values = [2 ** 63 - 1, -2 ** 63, 0, 2 ** 40]
+    path = tmp_path / "wide.svtr"
+    trace.record("Insertion Sort", list(values), path)
+    with trace.Trace(path) as recorded:
+        assert list(recorded.state(len(recorded))) == sorted(values)
+
+
+@pytest.mark.parametrize("values", [[2 ** 64, 1], [1.5, 2.0]])
+def test_value_typecode_rejects_values_a_trace_cannot_hold(values):
+    with pytest.raises(ValueError):
+        trace.value_typecode(values)
+
+
+@pytest.mark.parametrize("values", [
+    [2 ** 63 - 1, -2 ** 63],
+    [2 ** 64, -1],
+    [-2 ** 63 - 1],
+    [1.5, 2.0],
+    [],
+])
+def test_cache_key_handles_any_values(values):
+    key = cache.cache_key("Quick Sort", values)
+    assert key == cache.cache_key("Quick Sort", list(values))
+    assert key != cache.cache_key("Merge Sort", values)
+
+
+def test_cache_key_tells_big_ints_from_their_wrapped_values():
+    assert cache.cache_key("Quick Sort", [2 ** 64]) != cache.cache_key("Quick Sort", [0])
+    assert cache.cache_key("Quick Sort", [1.0]) != cache.cache_key("Quick Sort", [1])